@@ -25,6 +25,10 @@ let locales = new LocalizedStrings({
             verdictTLDesc: "Your program has exceeded the time limit",
             verdictMLShort: "Memory Limit",
             verdictMLDesc: "Your program has exceeded the memory limit",
+            verdictOLEShort: "Output Limit",
+            verdictOLEDesc: "Your program has printed or written to files too much",
+            verdictSKIPPEDShort: "Skipped",
+            verdictSKIPPEDDesc: "Test was not run, because an earlier test of the group has failed",
             verdictTSFShort: "Testing System Failed",
             verdictTSFDesc: "Indicates an internal error in testing system. Report to admin immediately"
         }
@@ -53,6 +57,10 @@ let locales = new LocalizedStrings({
             verdictTLDesc: "Решение выполнялось слишком долго и было прервано",
             verdictMLShort: "Лимит памяти",
             verdictMLDesc: "Решение занимало слишком много памяти и было прервано",
+            verdictOLEShort: "Лимит вывода",
+            verdictOLEDesc: "Решение вывело или записало в файлы слишком много и было прервано",
+            verdictSKIPPEDShort: "Пропущен",
+            verdictSKIPPEDDesc: "Тест не запускался, так как один из предыдущих тестов группы не пройден",
             verdictTSFShort: "Ошибка тестирующей системы",
             verdictTSFDesc: "Сообщает о внутренней ошибке тестирующей смистемы"
         }
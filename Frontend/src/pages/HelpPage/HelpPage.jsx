@@ -100,6 +100,16 @@ function HelpPage(props) {
                                 <TableCell>{locales.helpPage.verdictMLShort}</TableCell>
                                 <TableCell>{locales.helpPage.verdictMLDesc}</TableCell>
                             </TableRow>
+                            <TableRow>
+                                <TableCell component="th" scope="row"><code>OLE</code></TableCell>
+                                <TableCell>{locales.helpPage.verdictOLEShort}</TableCell>
+                                <TableCell>{locales.helpPage.verdictOLEDesc}</TableCell>
+                            </TableRow>
+                            <TableRow>
+                                <TableCell component="th" scope="row"><code>SKIPPED</code></TableCell>
+                                <TableCell>{locales.helpPage.verdictSKIPPEDShort}</TableCell>
+                                <TableCell>{locales.helpPage.verdictSKIPPEDDesc}</TableCell>
+                            </TableRow>
                             <TableRow>
                                 <TableCell component="th" scope="row"><code>TSF</code></TableCell>
                                 <TableCell>{locales.helpPage.verdictTSFShort}</TableCell>
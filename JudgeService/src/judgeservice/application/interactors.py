@@ -1,17 +1,28 @@
+import asyncio
 from dataclasses import dataclass
+from typing import Final
 
 import structlog
 
 from judgeservice.application.interfaces import SolutionGateway
+from judgeservice.config import BusyRetryConfig
 from judgeservice.domain.entities import (
     GroupProtocolSchema,
+    Judgelet,
     JudgeletAnswer,
     Solution,
 )
+from judgeservice.domain.exceptions import (
+    JudgeletIsBusyException,
+    JudgeletsStayBusyException,
+    NoSuitableJudgeletFoundException,
+)
 from judgeservice.domain.pool.pool import JudgeletPool
 
 logger = structlog.get_logger(__name__)
 
+_BACKOFF_FACTOR: Final = 2.0
+
 
 @dataclass(frozen=True, slots=True)
 class ProcessSolutionInteractor:
@@ -19,19 +30,15 @@ class ProcessSolutionInteractor:
 
     judgelet_pool: JudgeletPool
     solution_gateway: SolutionGateway
+    busy_retry: BusyRetryConfig
 
     async def __call__(self, solution: Solution) -> None:
         """Get judgelet and proxy request."""
-        logger.info("Retrieving target judgelet")
-        judgelet = await self.judgelet_pool.get_for_compiler(
-            solution.compiler,
-        )
         logger.info("Retrieving solution file")
         solution.solution_data = await self.solution_gateway.get_solution_file(
             solution.solution_url,
         )
-        logger.info("Communicating with judgelet")
-        judgelet_response = await judgelet.check_solution(solution)
+        judgelet_response = await self._check_on_free_judgelet(solution)
         logger.info("Checking successful")
         solution.score = judgelet_response.score
         solution.group_scores = judgelet_response.group_scores
@@ -39,6 +46,65 @@ class ProcessSolutionInteractor:
         solution.detailed_verdict = _form_detailed_verdict(judgelet_response)
         solution.protocol = judgelet_response.protocol
 
+    async def _check_on_free_judgelet(
+        self, solution: Solution,
+    ) -> JudgeletAnswer:
+        """
+        Route solution away from busy judgelets.
+
+        When every judgelet is busy, wait as long as they ask to,
+        but not less than a backoff doubled every round,
+        then try all of them again.
+
+        Raises:
+            JudgeletsStayBusyException: if judgelets are still busy
+                after ``max_rounds`` rounds.
+
+        """
+        busy: dict[Judgelet, int] = {}
+        rounds = 0
+        while True:
+            try:
+                return await self._check_on_any_judgelet(solution, busy)
+            except NoSuitableJudgeletFoundException:
+                if not busy:
+                    raise
+            rounds += 1
+            await self._wait_for_judgelets(min(busy.values()), rounds)
+            busy.clear()
+
+    async def _wait_for_judgelets(self, requested_s: int, rounds: int) -> None:
+        """Sleep before the next round, give up after the last one."""
+        if rounds >= self.busy_retry.max_rounds:
+            logger.error("Judgelets stay busy, giving up", rounds=rounds)
+            raise JudgeletsStayBusyException
+        growth = _BACKOFF_FACTOR ** (rounds - 1)
+        backoff_s = self.busy_retry.initial_backoff_s * growth
+        retry_after_s = min(
+            max(requested_s, backoff_s), self.busy_retry.max_backoff_s,
+        )
+        logger.warning(
+            "All judgelets are busy, waiting",
+            retry_after_s=retry_after_s,
+        )
+        await asyncio.sleep(retry_after_s)
+
+    async def _check_on_any_judgelet(
+        self, solution: Solution, busy: dict[Judgelet, int],
+    ) -> JudgeletAnswer:
+        """Try judgelets until one accepts, noting busy ones."""
+        while True:
+            logger.info("Retrieving target judgelet")
+            judgelet = await self.judgelet_pool.get_for_compiler(
+                solution.compiler, exclude=busy.keys(),
+            )
+            logger.info("Communicating with judgelet")
+            try:
+                return await judgelet.check_solution(solution)
+            except JudgeletIsBusyException as exc:
+                logger.info("Judgelet is busy", judgelet=judgelet.address)
+                busy[judgelet] = exc.retry_after_s
+
 
 def _form_detailed_verdict(judgelet_response: JudgeletAnswer) -> str:
     if judgelet_response.verdict == "OK":
@@ -2,7 +2,7 @@ from dishka import Provider, Scope, from_context, provide
 
 from judgeservice.application.interactors import ProcessSolutionInteractor
 from judgeservice.application.interfaces import SolutionGateway
-from judgeservice.config import Config
+from judgeservice.config import BusyRetryConfig, Config
 from judgeservice.domain.pool.pool import JudgeletPool
 from judgeservice.infrastructure.solutions import SolutionGatewayImpl
 
@@ -17,6 +17,10 @@ class AppProvider(Provider):
         provides=SolutionGateway,
     )
 
+    @provide(scope=Scope.APP)
+    def busy_retry_config(self, config: Config) -> BusyRetryConfig:
+        return config.busy_retry
+
     process_solution_interactor = provide(
         ProcessSolutionInteractor,
         scope=Scope.REQUEST,
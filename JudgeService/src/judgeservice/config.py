@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass(frozen=True, slots=True)
@@ -36,6 +36,15 @@ class JudgeletPoolConfig:
     consider_dead_after_timeout_s: int = 5
 
 
+@dataclass(frozen=True, slots=True)
+class BusyRetryConfig:
+    """How long a solution waits while all judgelets are busy."""
+
+    max_rounds: int = 6
+    initial_backoff_s: float = 1
+    max_backoff_s: float = 30
+
+
 @dataclass(frozen=True, slots=True)
 class Config:
     """App configuration."""
@@ -43,4 +52,5 @@ class Config:
     rabbitmq: RabbitMQConfig
     s3: S3Config
     pool: JudgeletPoolConfig
+    busy_retry: BusyRetryConfig = field(default_factory=BusyRetryConfig)
     judgelet_endpoint_format: str = "{0}/run"
@@ -19,6 +19,9 @@ class VerdictSchema(BaseModel):
     codename: str
     is_successful: bool
     details: str
+    cpu_time_s: float | None = None
+    wall_time_s: float | None = None
+    peak_memory_mb: float | None = None
 
 
 class GroupProtocolSchema(BaseModel):
@@ -28,6 +31,8 @@ class GroupProtocolSchema(BaseModel):
     verdicts: list[VerdictSchema]
     is_successful: bool
     verdict: VerdictSchema
+    max_cpu_time_s: float | None = None
+    max_peak_memory_mb: float | None = None
 
 
 type GroupName = str
@@ -4,3 +4,15 @@ class NoSuitableJudgeletFoundException(Exception):
 
 class BadJudgeletResponseException(Exception):
     """Raised when judgelet returns non-OK code."""
+
+
+class JudgeletIsBusyException(Exception):
+    """Raised when judgelet is saturated and does not accept solutions."""
+
+    def __init__(self, retry_after_s: int) -> None:
+        super().__init__(f"judgelet is busy, retry after {retry_after_s}s")
+        self.retry_after_s = retry_after_s
+
+
+class JudgeletsStayBusyException(Exception):
+    """Raised when judgelets are still busy after all retries."""
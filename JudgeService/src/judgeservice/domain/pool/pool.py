@@ -1,4 +1,5 @@
 import re
+from collections.abc import Collection
 from dataclasses import dataclass
 
 import structlog
@@ -49,10 +50,15 @@ class JudgeletPool:
         self.balance = balancing_strategy
         self.groups = groups
 
-    async def get_for_compiler(self, compiler_name: str) -> Judgelet:
-        """Get best judgelet for chosen compiler."""
+    async def get_for_compiler(
+        self,
+        compiler_name: str,
+        exclude: Collection[Judgelet] = (),
+    ) -> Judgelet:
+        """Get best judgelet for chosen compiler, except excluded ones."""
         group = self._get_group_for_compiler(compiler_name)
-        node = await self.balance.get_preferred_node(group.nodes)
+        nodes = [node for node in group.nodes if node not in exclude]
+        node = await self.balance.get_preferred_node(nodes) if nodes else None
         if node is None:
             logger.error(
                 "No judgelet found for compiler",
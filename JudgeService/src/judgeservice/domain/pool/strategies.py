@@ -42,6 +42,8 @@ class RoundRobinBalancingStrategy(AbstractBalancingStrategy):
         self, nodes: list[Judgelet],
     ) -> Judgelet | None:
         logger.info("Using round-robin strategy")
+        if self._ptr >= len(nodes):
+            self._ptr = 0
         beginning = self._ptr
         while True:
             node = nodes[self._ptr]
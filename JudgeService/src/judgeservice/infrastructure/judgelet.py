@@ -1,6 +1,8 @@
 import base64
+import hashlib
+import json
 from http import HTTPStatus
-from typing import Any, override
+from typing import Any, Final, override
 
 import aiohttp
 import structlog
@@ -14,10 +16,13 @@ from judgeservice.domain.entities import (
 )
 from judgeservice.domain.exceptions import (
     BadJudgeletResponseException,
+    JudgeletIsBusyException,
 )
 
 logger = structlog.get_logger(__name__)
 
+_DEFAULT_RETRY_AFTER_S: Final = 1
+
 
 class JudgeletImpl(Judgelet):
     """Judgelet implementation that works over HTTP."""
@@ -47,14 +52,49 @@ class JudgeletImpl(Judgelet):
 
     @override
     async def check_solution(self, solution: Solution) -> JudgeletAnswer:
-        async with (
-            aiohttp.ClientSession() as session,
-            session.post(
-                self._endpoint_format.format(self.address),
-                json=_form_check_request(solution),
-            ) as response,
-        ):
+        # suite is only sent if the judgelet does not have it cached
+        request = _form_check_request(solution)
+        async with aiohttp.ClientSession() as session:
+            answer = await self._run(session, request)
+            if answer is None:
+                logger.info(
+                    "Judgelet does not have the suite, sending it",
+                    judgelet=self.address,
+                    suite_hash=request["suite_hash"],
+                )
+                answer = await self._run(
+                    session, {**request, "suite": solution.suite},
+                )
+        if answer is None:
+            logger.error(
+                "Judgelet did not accept the suite", judgelet=self.address,
+            )
+            raise BadJudgeletResponseException
+        return answer
+
+    async def _run(
+        self,
+        session: aiohttp.ClientSession,
+        request: dict[str, Any],
+    ) -> JudgeletAnswer | None:
+        """
+        Send run request, returns None if suite is not cached.
+
+        Raises:
+            JudgeletIsBusyException: if judgelet rejected the solution.
+
+        """
+        async with session.post(
+            self._endpoint_format.format(self.address),
+            json=request,
+        ) as response:
             logger.info("Got response", status=response.status)
+            if response.status == HTTPStatus.CONFLICT:
+                return None
+            if response.status == HTTPStatus.TOO_MANY_REQUESTS:
+                raise JudgeletIsBusyException(
+                    _get_retry_after_s(response.headers.get("Retry-After")),
+                )
             if response.status not in (200, 201):
                 logger.error(
                     "Judgelet answered with an unusual code",
@@ -67,14 +107,26 @@ class JudgeletImpl(Judgelet):
             return JudgeletAnswer(**json_response)
 
 
+def get_suite_hash(suite: dict[str, Any]) -> str:
+    """Hash of the suite contents, judgelets cache suites by it."""
+    canonical = json.dumps(suite, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _get_retry_after_s(header: str | None) -> int:
+    if header is None or not header.isdigit():
+        return _DEFAULT_RETRY_AFTER_S
+    return int(header)
+
+
 def _form_check_request(solution: Solution) -> dict[str, Any]:
     if not solution.solution_data:
         logger.error("Solution does not contain data", solution=solution)
         raise AssertionError("Solution does not contain data")
-    request: dict[str, str | dict[str, str]] = {
+    request: dict[str, Any] = {
         "id": solution.id,
         "compiler": solution.compiler,
-        "suite": solution.suite,
+        "suite_hash": get_suite_hash(solution.suite),
     }
     if solution.submission_type == SubmissionType.STR:
         request["code"] = {
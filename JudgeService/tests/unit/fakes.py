@@ -6,6 +6,7 @@ from judgeservice.domain.entities import (
     Solution,
     VerdictSchema,
 )
+from judgeservice.domain.exceptions import JudgeletIsBusyException
 
 
 class FakeJudgelet(Judgelet):
@@ -17,9 +18,12 @@ class FakeJudgelet(Judgelet):
         *,
         is_alive: bool = True,
         answer: JudgeletAnswer | None = None,
+        busy_times: int = 0,
     ) -> None:
         super().__init__(address)
         self.is_alive_flag = is_alive
+        self.busy_times = busy_times
+        self.checked = 0
         self.answer = answer or JudgeletAnswer(
             score=100,
             verdict="OK",
@@ -47,6 +51,10 @@ class FakeJudgelet(Judgelet):
         return self.is_alive_flag
 
     async def check_solution(self, solution: Solution) -> JudgeletAnswer:
+        if self.busy_times:
+            self.busy_times -= 1
+            raise JudgeletIsBusyException(retry_after_s=0)
+        self.checked += 1
         return self.answer
 
 
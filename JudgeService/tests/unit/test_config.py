@@ -0,0 +1,20 @@
+from pathlib import Path
+
+import pytest
+from fuente import config_loader
+from fuente.sources.yaml import YamlSource
+
+from judgeservice.config import BusyRetryConfig, Config
+
+_PROJECT_ROOT = Path(__file__).parents[2]
+
+
+@pytest.mark.parametrize("filename", ["config.yml", "config.prod.yml"])
+def test_shipped_config_loads(filename: str):
+    loader = config_loader(
+        YamlSource(str(_PROJECT_ROOT / filename)),
+        config=Config,
+    )
+    config = loader.load()
+    assert config.pool.groups
+    assert config.busy_retry == BusyRetryConfig()
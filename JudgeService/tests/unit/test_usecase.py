@@ -1,12 +1,16 @@
 import pytest
 
 from judgeservice.application.interactors import ProcessSolutionInteractor
+from judgeservice.config import BusyRetryConfig
+from judgeservice.domain.exceptions import JudgeletsStayBusyException
 from tests.unit.factory import (
     SolutionFactory,
     create_judgelets,
     create_simple_pool,
 )
-from tests.unit.fakes import FakeSolutionGateway
+from tests.unit.fakes import FakeJudgelet, FakeSolutionGateway
+
+_FAST_RETRY = BusyRetryConfig(max_rounds=3, initial_backoff_s=0)
 
 
 @pytest.mark.asyncio
@@ -16,7 +20,53 @@ async def test_solution_processed():
             create_judgelets([{"address": "a"}]),
         ),
         solution_gateway=FakeSolutionGateway({"/test": b"Test solution"}),
+        busy_retry=_FAST_RETRY,
+    )
+    solution = SolutionFactory().build(solution_url="/test")
+    await interactor(solution)
+    assert solution.short_verdict == "OK"
+
+
+@pytest.mark.asyncio
+async def test_busy_judgelet_is_skipped():
+    busy_judgelet = FakeJudgelet("a", busy_times=1)
+    free_judgelet = FakeJudgelet("b")
+    interactor = ProcessSolutionInteractor(
+        judgelet_pool=create_simple_pool([busy_judgelet, free_judgelet]),
+        solution_gateway=FakeSolutionGateway({"/test": b"Test solution"}),
+        busy_retry=_FAST_RETRY,
+    )
+    solution = SolutionFactory().build(solution_url="/test")
+    await interactor(solution)
+    assert solution.short_verdict == "OK"
+    assert busy_judgelet.checked == 0
+    assert free_judgelet.checked == 1
+
+
+@pytest.mark.asyncio
+async def test_solution_waits_when_all_judgelets_are_busy():
+    judgelet = FakeJudgelet("a", busy_times=2)
+    interactor = ProcessSolutionInteractor(
+        judgelet_pool=create_simple_pool([judgelet]),
+        solution_gateway=FakeSolutionGateway({"/test": b"Test solution"}),
+        busy_retry=_FAST_RETRY,
     )
     solution = SolutionFactory().build(solution_url="/test")
     await interactor(solution)
     assert solution.short_verdict == "OK"
+    assert judgelet.checked == 1
+
+
+@pytest.mark.asyncio
+async def test_solution_fails_when_judgelets_stay_busy():
+    judgelet = FakeJudgelet("a", busy_times=10)
+    interactor = ProcessSolutionInteractor(
+        judgelet_pool=create_simple_pool([judgelet]),
+        solution_gateway=FakeSolutionGateway({"/test": b"Test solution"}),
+        busy_retry=_FAST_RETRY,
+    )
+    solution = SolutionFactory().build(solution_url="/test")
+    with pytest.raises(JudgeletsStayBusyException):
+        await interactor(solution)
+    assert judgelet.busy_times == 7
+    assert judgelet.checked == 0
@@ -1,91 +1,677 @@
+"""
+Limited launcher.
+
+Runs the target command and enforces time and memory limits on it.
+
+The watcher blocks in ``wait4`` while a watchdog thread enforces
+the wall time deadline and kills the target as soon as peak RSS
+of any of its processes (VmHWM, read from procfs on Linux) exceeds
+the memory limit. Kernel rlimits (RLIMIT_CPU and RLIMIT_AS) act as
+a backstop for runaway processes. Consumed CPU time and peak RSS
+are taken from rusage of the finished process.
+
+Usage::
+
+    llaunch.py [--wall-time S] [--output-limit MB] [--report FILE]
+               TIME_LIMIT MEM_LIMIT TARGET
+    llaunch.py --serve
+    llaunch.py --zygote
+
+Options go before limits, everything after them is the target.
+Negative limits mean "no limit".
+
+In serve mode (posix only) llaunch stays alive and launches targets
+one by one. Each line of its stdin is a JSON request::
+
+    {"cmd": str, "cwd": str, "env": {str: str}, "stdin": base64,
+     "time_limit": float, "mem_limit": float, "wall_time": float,
+     "output_limit": float}
+
+where ``"stdin_file": str`` may be given instead of ``stdin``,
+then the target reads its stdin right from that file.
+
+A Python script may be requested instead of a command, by giving
+``"script": str`` and ``"interpreter": [str]`` instead of ``cmd``.
+Such requests are forwarded to a zygote: llaunch run by that interpreter
+with ``--zygote``, which is started on first use and kept alive.
+Zygote forks a child for every script, the child redirects its stdio,
+applies limits and runs the script with ``runpy``, so interpreter
+startup and modules imported by llaunch are not paid for on each test.
+
+and for each of them a JSON line is written to stdout::
+
+    {"return_code": int, "usage": {...}, "stdout": base64,
+     "stderr": base64}
+
+Return code is classified the same way as exit code of one-shot mode.
+Output limit caps files written by the target (RLIMIT_FSIZE) and
+its stdout and stderr: the target is killed as soon as it prints more,
+so nobody buffers unbounded output. In one-shot mode with output limit
+llaunch reads its stdin fully and relays the target output when it ends,
+otherwise the target inherits stdio of llaunch.
+"""
+
+import argparse
+import base64
+import contextlib
+import gc
+import json
+import math
 import os
+import runpy
+import signal
 import subprocess
 import sys
+import threading
 import time
-from threading import Thread
-from typing import Final
-
-import psutil
+import traceback
+from collections.abc import Callable, Iterator
+from typing import IO, Any, Final, NamedTuple, NoReturn, TextIO
 
 MEMORY_LIMIT_EXIT_CODE: Final[int] = 170
 TIMEOUT_EXIT_CODE: Final[int] = 171
+OUTPUT_LIMIT_EXIT_CODE: Final[int] = 172
+
+_MB: Final = 1024 * 1024
+_CPU_LIMIT_GRACE_S: Final = 1
+_ADDRESS_SPACE_FACTOR: Final = 4
+_ADDRESS_SPACE_RESERVE_MB: Final = 256
+_PIPE_CHUNK_SIZE: Final = 65536
+_SHELL_SIGNAL_BASE: Final = 128
+_MEMORY_CHECK_INTERVAL_S: Final = 0.02
+_KB: Final = 1024
+
+
+class _Forked:
+    """Child forked to run a script, watched the same way as a Popen."""
+
+    def __init__(
+        self,
+        pid: int,
+        stdin: IO[bytes] | None,
+        stdout: IO[bytes],
+        stderr: IO[bytes],
+    ) -> None:
+        self.pid = pid
+        self.stdin = stdin
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode: int | None = None
+
+
+_Process = subprocess.Popen[bytes] | _Forked
+_Launch = Callable[
+    [Any, dict[str, Any], "bytes | IO[bytes]"],
+    tuple[int, dict[str, float], tuple[bytes, bytes]],
+]
+
+
+class _Limits(NamedTuple):
+    time_limit: float
+    mem_limit: float
+    wall_time: float
+    output_limit: float = -1
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="llaunch")
+    parser.add_argument("time_limit", type=float, help="CPU time limit, s")
+    parser.add_argument("mem_limit", type=float, help="peak RSS limit, MB")
+    parser.add_argument(
+        "--wall-time",
+        type=float,
+        default=None,
+        help="wall time limit, s (defaults to time limit)",
+    )
+    parser.add_argument(
+        "--output-limit",
+        type=float,
+        default=-1,
+        help="limit of files and of stdout/stderr of target, MB",
+    )
+    parser.add_argument(
+        "--report",
+        default=None,
+        help="file to write JSON report about used resources to",
+    )
+    parser.add_argument("target", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+    if args.wall_time is None:
+        args.wall_time = args.time_limit
+    return args
+
+
+def _set_limits(limits: _Limits) -> None:
+    import resource  # noqa: PLC0415 (posix only)
+
+    if limits.time_limit >= 0:
+        cpu_limit = math.ceil(limits.time_limit) + _CPU_LIMIT_GRACE_S
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit + 1))
+    if limits.output_limit >= 0:
+        file_size = int(limits.output_limit * _MB)
+        resource.setrlimit(resource.RLIMIT_FSIZE, (file_size, file_size))
+    if limits.mem_limit >= 0:
+        # address space is much larger than RSS for most runtimes,
+        # so this only stops processes that would eat the whole host
+        address_space_mb = (
+            limits.mem_limit * _ADDRESS_SPACE_FACTOR
+            + _ADDRESS_SPACE_RESERVE_MB
+        )
+        address_space = int(address_space_mb * _MB)
+        resource.setrlimit(
+            resource.RLIMIT_AS, (address_space, address_space),
+        )
+
+
+def _kill_group(pgid: int, fired: threading.Event) -> None:
+    fired.set()
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        os.killpg(pgid, signal.SIGKILL)
+
+
+def _peak_rss_mb(max_rss: int) -> float:
+    if sys.platform == "darwin":
+        return max_rss / _MB  # bytes on macOS
+    return max_rss / 1024  # kilobytes on Linux
+
+
+class _Watchdog:
+    """
+    Kills group of the target once it is out of wall time or memory.
 
-process: subprocess.Popen | None = None
-_return_code: int | None = None
+    Memory is checked every few milliseconds, until the target exits.
+    """
 
+    def __init__(self, pid: int, limits: _Limits) -> None:
+        self.pid = pid
+        self.limits = limits
+        self.deadline_hit = threading.Event()
+        self.memory_hit = threading.Event()
+        self.peak_memory_mb = 0.0
+        self._finished = threading.Event()
+        self._deadline = math.inf
+        if limits.wall_time >= 0:
+            self._deadline = time.monotonic() + limits.wall_time
+        self._checks_memory = limits.mem_limit >= 0 and os.path.isdir("/proc")
+        self._thread = threading.Thread(target=self._watch, daemon=True)
 
-def _will_terminate_by_timeout(time_limit_s: float) -> bool:
-    if time_limit_s < 0:
-        return False
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._finished.set()
+        self._thread.join()
+
+    def _watch(self) -> None:
+        while not self._finished.wait(self._get_wait_s()):
+            if time.monotonic() >= self._deadline:
+                _kill_group(self.pid, self.deadline_hit)
+                return
+            if self._is_memory_exceeded():
+                _kill_group(self.pid, self.memory_hit)
+                return
+
+    def _get_wait_s(self) -> float | None:
+        wait_s = max(self._deadline - time.monotonic(), 0)
+        if self._checks_memory:
+            wait_s = min(wait_s, _MEMORY_CHECK_INTERVAL_S)
+        return None if math.isinf(wait_s) else wait_s
+
+    def _is_memory_exceeded(self) -> bool:
+        if not self._checks_memory:
+            return False
+        self.peak_memory_mb = max(
+            self.peak_memory_mb, _read_peak_rss_mb(self.pid),
+        )
+        return self.peak_memory_mb > self.limits.mem_limit
+
+
+def _read_peak_rss_mb(pid: int) -> float:
+    """Largest peak RSS among the process and its descendants."""
+    peak_kb = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        with (
+            contextlib.suppress(OSError, ValueError),
+            open(f"/proc/{current}/status") as status,
+        ):
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    peak_kb = max(peak_kb, int(line.split()[1]))
+        pending.extend(_read_children(current))
+    return peak_kb / _KB
+
+
+def _read_children(pid: int) -> list[int]:
+    """Children of all threads of the process, any thread may fork."""
+    children: list[int] = []
     try:
-        proc = psutil.Process(process.pid)
-    except psutil.NoSuchProcess:
-        return False
-    elapsed = time.time() - proc.create_time()
-    return elapsed > time_limit_s
+        tasks = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return children
+    for task in tasks:
+        with (
+            contextlib.suppress(OSError, ValueError),
+            open(f"/proc/{pid}/task/{task}/children") as task_children,
+        ):
+            children.extend(map(int, task_children.read().split()))
+    return children
+
+
+class _Pipes:
+    """
+    Drains stdout/stderr of a process (and feeds its stdin) in threads.
+
+    Each output keeps at most ``limit`` bytes, if the process prints
+    more, its group is killed and ``overflow`` is set.
+    """
+
+    def __init__(
+        self,
+        process: _Process,
+        payload: bytes | None,
+        limit: float,
+    ) -> None:
+        self.pid = process.pid
+        self.limit = int(limit * _MB) if limit >= 0 else None
+        self.overflow = threading.Event()
+        self.stdout: list[bytes] = []
+        self.stderr: list[bytes] = []
+        self.threads = [
+            threading.Thread(
+                target=self._drain, args=(process.stdout, self.stdout),
+            ),
+            threading.Thread(
+                target=self._drain, args=(process.stderr, self.stderr),
+            ),
+        ]
+        if payload is not None:
+            self.threads.append(
+                threading.Thread(target=_feed, args=(process.stdin, payload)),
+            )
+        for thread in self.threads:
+            thread.daemon = True
+            thread.start()
 
+    def join(self) -> tuple[bytes, bytes]:
+        for thread in self.threads:
+            thread.join()
+        return b"".join(self.stdout), b"".join(self.stderr)
 
-def _will_terminate_by_memory_limit(mem_limit_bytes: int) -> bool:
-    if mem_limit_bytes < 0:
-        return False
+    def _drain(self, stream: IO[bytes], chunks: list[bytes]) -> None:
+        size = 0
+        while chunk := stream.read(_PIPE_CHUNK_SIZE):
+            size += len(chunk)
+            if self.limit is None or size <= self.limit:
+                chunks.append(chunk)
+            elif not self.overflow.is_set():
+                _kill_group(self.pid, self.overflow)
+        stream.close()
+
+
+def _feed(stream: IO[bytes], payload: bytes) -> None:
+    with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+        stream.write(payload)
+    with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+        stream.close()
+
+
+def _run_posix(
+    limits: _Limits,
+    command: str,
+    proc_input: bytes | IO[bytes] | None = None,
+    **popen_options: Any,
+) -> tuple[int, dict[str, float], tuple[bytes, bytes]]:
+    """
+    Run command and wait for it, enforcing limits.
+
+    Target inherits stdio of llaunch, unless ``proc_input`` is given:
+    then it is fed to the target (or the target reads it, if it is
+    a file), and stdout and stderr of the target are returned.
+    """
+    payload = proc_input if isinstance(proc_input, bytes) else None
+    if proc_input is not None:
+        popen_options.update(
+            stdin=subprocess.PIPE if payload is not None else proc_input,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    start = time.monotonic()
+    process = subprocess.Popen(  # noqa: S602
+        command,
+        shell=True,
+        process_group=0,
+        preexec_fn=lambda: _set_limits(limits),  # noqa: PLW1509 (no threads)
+        **popen_options,
+    )
+    return _watch(limits, process, payload, start)
+
+
+def _watch(
+    limits: _Limits,
+    process: _Process,
+    payload: bytes | None,
+    start: float,
+) -> tuple[int, dict[str, float], tuple[bytes, bytes]]:
+    """Wait for a started target, enforcing limits."""
+    pipes = None
+    if process.stdout is not None:
+        pipes = _Pipes(process, payload, limits.output_limit)
+    watchdog = _Watchdog(process.pid, limits)
+    watchdog.start()
+    _, status, rusage = os.wait4(process.pid, 0)
+    wall_time = time.monotonic() - start
+    # zygote must not fork while other threads are alive
+    watchdog.stop()
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # reap anything the target has left behind
+    _kill_group(process.pid, threading.Event())
+    usage = {
+        "cpu_time_s": rusage.ru_utime + rusage.ru_stime,
+        "wall_time_s": wall_time,
+        # descendants killed before they are reaped are not in rusage
+        "peak_memory_mb": max(
+            _peak_rss_mb(rusage.ru_maxrss), watchdog.peak_memory_mb,
+        ),
+    }
+    outputs = (b"", b"")
+    if pipes is not None:
+        outputs = pipes.join()
+        if pipes.overflow.is_set():
+            return OUTPUT_LIMIT_EXIT_CODE, usage, outputs
+    return_code = _classify(limits, process.returncode, usage, watchdog)
+    return return_code, usage, outputs
+
+
+def _run_script(
+    limits: _Limits,
+    request: dict[str, Any],
+    proc_input: bytes | IO[bytes],
+) -> tuple[int, dict[str, float], tuple[bytes, bytes]]:
+    """Fork a child that runs the script and wait for it."""
+    payload = None
+    if isinstance(proc_input, bytes):
+        payload = proc_input
+        stdin_read, stdin_write = os.pipe()
+    else:
+        stdin_read, stdin_write = proc_input.fileno(), -1
+    stdout_read, stdout_write = os.pipe()
+    stderr_read, stderr_write = os.pipe()
+    start = time.monotonic()
+    pid = os.fork()
+    if pid == 0:
+        _exec_script(limits, request, (stdin_read, stdout_write, stderr_write))
+    # child does the same, so the group exists whoever is first
+    with contextlib.suppress(OSError):
+        os.setpgid(pid, 0)
+    os.close(stdout_write)
+    os.close(stderr_write)
+    stdin = None
+    if payload is not None:
+        os.close(stdin_read)
+        stdin = os.fdopen(stdin_write, "wb")
+    process = _Forked(
+        pid, stdin, os.fdopen(stdout_read, "rb"), os.fdopen(stderr_read, "rb"),
+    )
+    return _watch(limits, process, payload, start)
+
+
+def _exec_script(
+    limits: _Limits,
+    request: dict[str, Any],
+    stdio: tuple[int, int, int],
+) -> NoReturn:
+    """Run the script in a forked child, never returns."""
+    exit_code = 1
     try:
-        proc = psutil.Process(process.pid)
-    except psutil.NoSuchProcess:
-        return False
-    mem_bytes = proc.memory_info().rss
-    return mem_bytes > mem_limit_bytes
-
-
-def _kill_process() -> None:
-    process.kill()
-
-
-def _checker(
-    target: tuple[str, ...],
-    time_limit_s: float,
-    mem_limit_mb: float,
-) -> None:
-    global _return_code, process
-    mem_limit_bytes = int(mem_limit_mb * 1024 * 1024)
-    process = subprocess.Popen(
-        target,
-        stdin=sys.stdin,
-        stdout=sys.stdout,
-        stderr=sys.stderr,
-        shell=sys.platform != "win32",  # to make it work on linux
+        os.setpgid(0, 0)
+        for target_fd, source_fd in enumerate(stdio):
+            os.dup2(source_fd, target_fd)
+        # pipes of the zygote must not be held open by the child
+        os.closerange(3, os.sysconf("SC_OPEN_MAX"))
+        os.chdir(request["cwd"])
+        os.environ.update(request["env"])
+        _set_limits(limits)
+        _reopen_stdio()
+        script = request["script"]
+        sys.argv = [script]
+        sys.path[0] = os.path.dirname(os.path.abspath(script))
+        runpy.run_path(script, run_name="__main__")
+        exit_code = 0
+    except SystemExit as exc:
+        exit_code = _get_exit_code(exc.code)
+    except BaseException:  # noqa: BLE001 (reported like interpreter does)
+        traceback.print_exc()
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            with contextlib.suppress(OSError, ValueError):
+                stream.flush()
+        os._exit(exit_code)  # noqa: WPS437
+
+
+def _reopen_stdio() -> None:
+    """Replace stdio objects, so nothing buffered by zygote leaks."""
+    sys.stdin = _reopen(0, "r", sys.stdin)
+    sys.stdout = _reopen(1, "w", sys.stdout)
+    # stderr is line buffered, as it is in a fresh interpreter
+    sys.stderr = _reopen(2, "w", sys.stderr, buffering=1)
+
+
+def _reopen(
+    fd: int, mode: str, stream: TextIO, buffering: int = -1,
+) -> TextIO:
+    return open(  # type: ignore[return-value]
+        fd,
+        mode,
+        buffering=buffering,
+        encoding=stream.encoding,
+        errors=stream.errors,
+        closefd=False,
     )
-    while process.poll() is None:
-        if _will_terminate_by_timeout(time_limit_s):
-            _kill_process()
-            _return_code = TIMEOUT_EXIT_CODE
-            if os.getenv("LLAUNCH_MESSAGES") == "1":
-                print("TL")
-            return
-        if _will_terminate_by_memory_limit(mem_limit_bytes):
-            _kill_process()
-            _return_code = MEMORY_LIMIT_EXIT_CODE
-            if os.getenv("LLAUNCH_MESSAGES") == "1":
-                print("ML")
-            return
-    _return_code = process.returncode
-
-
-def _get_args() -> tuple[float, float, tuple[str, ...]]:
-    time_limit, mem_limit, *target = sys.argv[1:]
-    return float(time_limit), float(mem_limit), target
+
+
+def _get_exit_code(code: object) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)  # noqa: WPS421
+    return 1
+
+
+def _classify(
+    limits: _Limits,
+    return_code: int,
+    usage: dict[str, float],
+    watchdog: "_Watchdog",
+) -> int:
+    if watchdog.deadline_hit.is_set():
+        return TIMEOUT_EXIT_CODE
+    if watchdog.memory_hit.is_set():
+        return MEMORY_LIMIT_EXIT_CODE
+    if 0 <= limits.mem_limit < usage["peak_memory_mb"]:
+        return MEMORY_LIMIT_EXIT_CODE
+    if 0 <= limits.time_limit < usage["cpu_time_s"]:
+        return TIMEOUT_EXIT_CODE
+    if return_code == -signal.SIGXCPU:
+        return TIMEOUT_EXIT_CODE
+    # shell reports a child killed by a signal as 128 + signal number
+    if return_code in {-signal.SIGXFSZ, _SHELL_SIGNAL_BASE + signal.SIGXFSZ}:
+        return OUTPUT_LIMIT_EXIT_CODE
+    return return_code
+
+
+def _run_windows(args: argparse.Namespace) -> tuple[int, dict[str, float]]:
+    start = time.monotonic()
+    process = subprocess.Popen(args.target)
+    timeout = args.wall_time if args.wall_time >= 0 else None
+    try:
+        return_code = process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        return_code = TIMEOUT_EXIT_CODE
+    wall_time = time.monotonic() - start
+    usage = {
+        "cpu_time_s": wall_time,
+        "wall_time_s": wall_time,
+        "peak_memory_mb": 0,
+    }
+    return return_code, usage
+
+
+def _write_report(path: str, usage: dict[str, float]) -> None:
+    with open(path, "w") as report_file:
+        json.dump(usage, report_file)
+
+
+@contextlib.contextmanager
+def _open_stdin(request: dict[str, Any]) -> Iterator[bytes | IO[bytes]]:
+    if "stdin_file" in request:
+        with open(request["stdin_file"], "rb") as stdin_file:
+            yield stdin_file
+    else:
+        yield base64.b64decode(request["stdin"])
+
+
+class _Zygotes:
+    """Zygotes of the agent, one per interpreter, started on demand."""
+
+    def __init__(self) -> None:
+        self.processes: dict[tuple[str, ...], subprocess.Popen[bytes]] = {}
+
+    def forward(self, request: dict[str, Any], line: str) -> str:
+        """Pass the request to the zygote and return its reply."""
+        interpreter = tuple(request["interpreter"])
+        try:
+            reply = self._exchange(interpreter, line.encode())
+        except OSError as exc:
+            reply = str(exc).encode()
+        if reply.startswith(b"{"):
+            return reply.decode()
+        zygote = self.processes.pop(interpreter, None)
+        if zygote is not None:
+            zygote.kill()
+            zygote.wait()
+        return json.dumps({"error": f"zygote has failed: {reply!r}"}) + "\n"
+
+    def _exchange(self, interpreter: tuple[str, ...], request: bytes) -> bytes:
+        if interpreter not in self.processes:
+            self.processes[interpreter] = subprocess.Popen(
+                [*interpreter, os.path.abspath(__file__), "--zygote"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        zygote = self.processes[interpreter]
+        if zygote.stdin is None or zygote.stdout is None:
+            raise OSError("zygote pipes are not open")
+        zygote.stdin.write(request)
+        zygote.stdin.flush()
+        return zygote.stdout.readline()
+
+
+def _run_command(
+    limits: _Limits,
+    request: dict[str, Any],
+    proc_input: bytes | IO[bytes],
+) -> tuple[int, dict[str, float], tuple[bytes, bytes]]:
+    return _run_posix(
+        limits,
+        request["cmd"],
+        proc_input,
+        cwd=request["cwd"],
+        env=os.environ | request["env"],
+    )
+
+
+def _launch(request: dict[str, Any], launch: _Launch) -> str:
+    limits = _Limits(
+        request["time_limit"],
+        request["mem_limit"],
+        request["wall_time"],
+        request.get("output_limit", -1),
+    )
+    with _open_stdin(request) as proc_input:
+        return_code, usage, (stdout, stderr) = launch(
+            limits, request, proc_input,
+        )
+    reply = {
+        "return_code": return_code,
+        "usage": usage,
+        "stdout": base64.b64encode(stdout).decode(),
+        "stderr": base64.b64encode(stderr).decode(),
+    }
+    return json.dumps(reply) + "\n"
+
+
+def _serve() -> int:
+    """Launch targets requested over stdin until it is closed."""
+    zygotes = _Zygotes()
+    for line in sys.stdin:
+        request = json.loads(line)
+        if "script" in request:
+            reply = zygotes.forward(request, line)
+        else:
+            reply = _launch(request, _run_command)
+        sys.stdout.write(reply)
+        sys.stdout.flush()
+    return 0
+
+
+def _serve_scripts() -> int:
+    """Run scripts requested over stdin in forked children."""
+    # runpy imports pkgutil and the compiler initialises itself lazily,
+    # done once here, this is not repeated by every child
+    import pkgutil  # noqa: F401, PLC0415
+    compile("", "<zygote>", "exec")
+    # collector of children skips objects of zygote,
+    # so it does not make children copy pages they are in
+    gc.freeze()
+    for line in sys.stdin:
+        sys.stdout.write(_launch(json.loads(line), _run_script))
+        sys.stdout.flush()
+    return 0
+
+
+def _run_once(limits: _Limits, command: str) -> tuple[int, dict[str, float]]:
+    if limits.output_limit < 0:
+        return_code, usage, _ = _run_posix(limits, command)
+        return return_code, usage
+    return_code, usage, (stdout, stderr) = _run_posix(
+        limits, command, sys.stdin.buffer.read(),
+    )
+    sys.stdout.buffer.write(stdout)
+    sys.stdout.flush()
+    sys.stderr.buffer.write(stderr)
+    sys.stderr.flush()
+    return return_code, usage
 
 
 def main() -> int:
     """Entrypoint."""
-    time_limit, mem_limit, target = _get_args()
-    watch_thread = Thread(
-        name="Watcher thread",
-        target=_checker,
-        args=(target, time_limit, mem_limit),
-    )
-    watch_thread.start()
-    watch_thread.join()
-    return int(_return_code)
+    if sys.argv[1:] == ["--serve"]:
+        return _serve()
+    if sys.argv[1:] == ["--zygote"]:
+        return _serve_scripts()
+    args = _parse_args(sys.argv[1:])
+    if sys.platform == "win32":
+        return_code, usage = _run_windows(args)
+    else:
+        limits = _Limits(
+            args.time_limit, args.mem_limit, args.wall_time, args.output_limit,
+        )
+        return_code, usage = _run_once(limits, " ".join(args.target))
+    if args.report is not None:
+        _write_report(args.report, usage)
+    if os.getenv("LLAUNCH_MESSAGES") == "1":
+        if return_code == TIMEOUT_EXIT_CODE:
+            print("TL")  # noqa: WPS421
+        elif return_code == MEMORY_LIMIT_EXIT_CODE:
+            print("ML")  # noqa: WPS421
+        elif return_code == OUTPUT_LIMIT_EXIT_CODE:
+            print("OLE")  # noqa: WPS421
+    return return_code
 
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+import time
+from collections import deque
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Final
+
+_RECENT_DURATIONS: Final = 32
+
+
+class SolutionActivity:
+    """Tracks solutions being checked and how long checking takes."""
+
+    def __init__(self) -> None:
+        self._running: list[str] = []
+        self._durations: deque[float] = deque(maxlen=_RECENT_DURATIONS)
+
+    @contextmanager
+    def track(self, solution_id: str) -> Iterator[None]:
+        """
+        Consider the solution running for the duration of the context.
+
+        Duration is only recorded if checking has not failed.
+        """
+        self._running.append(solution_id)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._running.remove(solution_id)
+        self._durations.append(time.monotonic() - start)
+
+    @property
+    def running(self) -> Sequence[str]:
+        """Ids of solutions being checked."""
+        return tuple(self._running)
+
+    @property
+    def average_duration_s(self) -> float | None:
+        """Average duration of recent checks, None if there were none."""
+        if not self._durations:
+            return None
+        return sum(self._durations) / len(self._durations)
@@ -0,0 +1,46 @@
+import math
+from typing import Final
+
+from attrs import frozen
+
+from judgelet.application.activity import SolutionActivity
+from judgelet.application.interfaces import SlotQueueIsFull, SlotScheduler
+
+_DEFAULT_DURATION_S: Final = 1.0
+
+
+@frozen
+class AdmissionController:
+    """
+    Admits solutions only while they get a slot or a place in the queue.
+
+    Solutions beyond that are rejected instead of being checked
+    on an overcommitted host, where their timings would degrade.
+    """
+
+    scheduler: SlotScheduler
+    activity: SolutionActivity
+
+    def admit(self) -> None:
+        """
+        Check that a new solution can be accepted.
+
+        Should be called before any work is done for the solution.
+
+        Raises:
+            SlotQueueIsFull: if there is no free slot and the queue is full.
+
+        """
+        if self.scheduler.is_saturated:
+            raise SlotQueueIsFull
+
+    def get_retry_after_s(self) -> int:
+        """
+        Estimate in how many seconds a solution would be accepted.
+
+        Assumes that the queue and the running solutions are drained
+        at the average speed of recent checks.
+        """
+        duration = self.activity.average_duration_s or _DEFAULT_DURATION_S
+        waves = 1 + self.scheduler.queue_depth / self.scheduler.total_slots
+        return max(math.ceil(duration * waves), 1)
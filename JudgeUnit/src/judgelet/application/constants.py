@@ -1,6 +1,10 @@
+import re
 from types import MappingProxyType
 from typing import Final
 
 NO_IMPORT_PATTERNS: Final = MappingProxyType({
-    "py": ("^import .*$", "^from .*? import .*$"),
+    "py": (
+        re.compile("^import .*$", re.MULTILINE),
+        re.compile("^from .*? import .*$", re.MULTILINE),
+    ),
 })
@@ -1,18 +1,29 @@
 import asyncio
+import hashlib
+from collections.abc import AsyncIterator, Iterable, Sequence
+from contextlib import closing
 
 from attrs import frozen
 from structlog import get_logger
 
+from judgelet.application.activity import SolutionActivity
 from judgelet.application.interfaces import (
     LanguageBackendFactory,
+    ResultCache,
     SandboxFactory,
+    SlotQueueIsFull,
+    SlotScheduler,
+)
+from judgelet.application.replicas import SlotRunnerReplicator
+from judgelet.domain.caching import CompileCache
+from judgelet.domain.execution import LanguageBackend, SolutionRunner
+from judgelet.domain.files import File, FileSystem, Solution, Workspace
+from judgelet.domain.slots import ExecutionSlot
+from judgelet.domain.test_suite import (
+    ProgressListener,
+    SuiteResult,
+    TestSuite,
 )
-from judgelet.config import Config
-from judgelet.domain.execution import SolutionRunner
-from judgelet.domain.files import File, FileSystem, Solution
-from judgelet.domain.test_suite import SuiteResult, TestSuite
-
-lock = asyncio.Lock()
 
 
 class LanguageNotFound(Exception):
@@ -26,46 +37,307 @@ class CheckSolutionInteractor:
     backend_factory: LanguageBackendFactory
     fs: FileSystem
     sandbox_factory: SandboxFactory
-    config: Config
+    scheduler: SlotScheduler
+    compile_cache: CompileCache
+    result_cache: ResultCache
+    activity: SolutionActivity
 
     async def __call__(
         self,
         backend_name: str,
         solution: Solution,
         test_suite: TestSuite,
+        suite_hash: str | None = None,
+        listener: ProgressListener | None = None,
     ) -> SuiteResult:
-        """Run the interactor."""
-        if self.config.enable_lock:
-            async with lock:
-                return await self._action(backend_name, solution, test_suite)
-        else:
-            return await self._action(backend_name, solution, test_suite)
+        """
+        Run the interactor.
 
-    async def _action(
+        If the hash of the suite is given and the suite allows it,
+        result is cached, so the same solution is not checked twice.
+        Results that may change on another run (e.g. TL) are not.
+        Cached result is returned without notifying the listener.
+        """
+        backend = self.backend_factory.create_backend(backend_name, solution)
+        if backend is None:
+            raise LanguageNotFound
+        cache_key = None
+        if suite_hash is not None and test_suite.cache_results:
+            cache_key = _get_result_cache_key(
+                backend_name, backend, solution, suite_hash,
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        async with self.scheduler.acquire() as slot:
+            with self.activity.track(solution.uid):
+                result = await self._action(
+                    backend, solution, test_suite, slot, listener,
+                )
+        if cache_key is not None and result.is_reproducible:
+            self.result_cache.put(cache_key, result)
+        return result
+
+    def is_cached(
         self,
         backend_name: str,
         solution: Solution,
-        test_suite: TestSuite,
-    ) -> SuiteResult:
-        log = get_logger().bind(solution_id=solution.uid)
-        solution_root = self.fs.place_solution(solution)
-        log.info("Solution placed in filesystem at %s", solution_root)
+        suite_hash: str | None,
+    ) -> bool:
+        """
+        Whether the solution would get its result from the cache.
+
+        Lets a solution skip admission, since it does not need a slot.
+        Only suites that allow caching ever have results stored,
+        so the suite itself is not needed.
+        """
+        if suite_hash is None:
+            return False
         backend = self.backend_factory.create_backend(backend_name, solution)
         if backend is None:
-            raise LanguageNotFound
+            return False
+        return _get_result_cache_key(
+            backend_name, backend, solution, suite_hash,
+        ) in self.result_cache
+
+    async def _action(  # noqa: WPS211 (too many args)
+        self,
+        backend: LanguageBackend,
+        solution: Solution,
+        test_suite: TestSuite,
+        slot: ExecutionSlot,
+        listener: ProgressListener | None,
+    ) -> SuiteResult:
+        log = get_logger().bind(solution_id=solution.uid, slot=slot.index)
         log.info("Instantiated language backend %s", backend)
+        with self.fs.open_workspace(solution, slot.workdir) as workspace:
+            log.info("Solution placed in filesystem at %s", workspace.path)
+            return await self._run_in_workspace(
+                backend, solution, test_suite, slot, workspace, listener,
+            )
+
+    async def _run_in_workspace(  # noqa: WPS211 (too many args)
+        self,
+        backend: LanguageBackend,
+        solution: Solution,
+        test_suite: TestSuite,
+        slot: ExecutionSlot,
+        workspace: Workspace,
+        listener: ProgressListener | None,
+    ) -> SuiteResult:
+        log = get_logger().bind(solution_id=solution.uid, slot=slot.index)
         sandbox = self.sandbox_factory(
-            self.fs,
-            str(solution_root),
+            workspace,
             environment=test_suite.envs,
+            slot=slot,
         )
         log.info("Created sandbox, saving additional files")
         for filename, contents in test_suite.additional_files.items():
-            self.fs.save_file(File(filename, contents))
+            workspace.save_file(File(filename, contents))
         log.info("Saved %s additionals", len(test_suite.additional_files))
-        runner = SolutionRunner(backend, solution, self.fs, sandbox)
-        log.info("Running solution")
-        result = await test_suite.run(runner)
-        self.fs.cleanup(solution)
-        log.info("Cleaned up")
-        return result
+        # sandbox is closed before the slot is released, so nothing
+        # the solution has left running meets the next one
+        with closing(sandbox), SlotRunnerReplicator(
+            self.scheduler,
+            self.fs,
+            self.sandbox_factory,
+            test_suite.envs,
+        ) as replicator:
+            runner = SolutionRunner(
+                backend,
+                solution,
+                workspace,
+                sandbox,
+                self.compile_cache,
+                replicator,
+            )
+            log.info("Running solution")
+            return await test_suite.run(runner, listener)
+
+
+@frozen
+class Submission:
+    """Solution with the name of its language backend."""
+
+    backend_name: str
+    solution: Solution
+
+
+@frozen
+class BatchOutcome:
+    """Result of a solution from batch, or why it has none."""
+
+    solution_id: str
+    result: SuiteResult | None = None
+    error: str | None = None
+
+
+@frozen
+class CheckBatchInteractor:
+    """Checks many solutions against the same suite."""
+
+    check_solution: CheckSolutionInteractor
+    scheduler: SlotScheduler
+
+    async def __call__(
+        self,
+        submissions: Sequence[Submission],
+        test_suite: TestSuite,
+        suite_hash: str | None = None,
+    ) -> AsyncIterator[BatchOutcome]:
+        """
+        Check solutions, yield outcomes as soon as they are ready.
+
+        No more solutions than there are slots are checked at once,
+        so that the batch does not overflow the queue of slots.
+        Tests of a solution still spread over slots left free.
+        If the queue is full anyway, e.g. because of other requests,
+        solutions wait until it has room instead of being dropped.
+        A solution that fails gets an error outcome,
+        the rest of the batch is still checked.
+        """
+        limit = asyncio.Semaphore(self.scheduler.total_slots)
+        checks = [
+            asyncio.create_task(
+                self._check(limit, submission, test_suite, suite_hash),
+            )
+            for submission in submissions
+        ]
+        try:
+            for finished in asyncio.as_completed(checks):
+                yield await finished  # noqa: WPS476
+        except BaseException:
+            for check in checks:
+                check.cancel()
+            await asyncio.gather(*checks, return_exceptions=True)
+            raise
+
+    def is_cached(
+        self,
+        submissions: Sequence[Submission],
+        suite_hash: str | None,
+    ) -> bool:
+        """Whether all solutions would get their results from the cache."""
+        return all(
+            self.check_solution.is_cached(
+                submission.backend_name, submission.solution, suite_hash,
+            )
+            for submission in submissions
+        )
+
+    async def _check(
+        self,
+        limit: asyncio.Semaphore,
+        submission: Submission,
+        test_suite: TestSuite,
+        suite_hash: str | None,
+    ) -> BatchOutcome:
+        solution_id = submission.solution.uid
+        async with limit:
+            try:
+                result = await self._check_when_queued(
+                    submission, test_suite, suite_hash,
+                )
+            except LanguageNotFound:
+                return BatchOutcome(solution_id, error="unknown compiler")
+            except Exception:  # noqa: BLE001 (other solutions go on)
+                get_logger().exception(
+                    "Checking has failed", solution_id=solution_id,
+                )
+                return BatchOutcome(solution_id, error="internal error")
+        return BatchOutcome(solution_id, result)
+
+    async def _check_when_queued(
+        self,
+        submission: Submission,
+        test_suite: TestSuite,
+        suite_hash: str | None,
+    ) -> SuiteResult:
+        while True:
+            try:
+                return await self.check_solution(
+                    submission.backend_name,
+                    submission.solution,
+                    test_suite,
+                    suite_hash,
+                )
+            except SlotQueueIsFull:
+                await self.scheduler.wait_for_room()
+
+
+@frozen
+class JudgeletStatus:
+    """Load and capacity of the judgelet."""
+
+    total_slots: int
+    free_slots: int
+    queue_depth: int
+    running: Sequence[str]
+    average_duration_s: float | None
+    compile_cache_hit_ratio: float | None
+    result_cache_hit_ratio: float | None
+
+
+@frozen
+class GetStatusInteractor:
+    """Reports load of the judgelet, cheap enough to be polled often."""
+
+    scheduler: SlotScheduler
+    activity: SolutionActivity
+    compile_cache: CompileCache
+    result_cache: ResultCache
+
+    def __call__(self) -> JudgeletStatus:
+        """Run the interactor."""
+        return JudgeletStatus(
+            total_slots=self.scheduler.total_slots,
+            free_slots=self.scheduler.free_slots,
+            queue_depth=self.scheduler.queue_depth,
+            running=self.activity.running,
+            average_duration_s=self.activity.average_duration_s,
+            compile_cache_hit_ratio=_get_hit_ratio(
+                self.compile_cache.hits, self.compile_cache.misses,
+            ),
+            result_cache_hit_ratio=_get_hit_ratio(
+                self.result_cache.hits, self.result_cache.misses,
+            ),
+        )
+
+
+def _get_hit_ratio(hits: int, misses: int) -> float | None:
+    lookups = hits + misses
+    if not lookups:
+        return None
+    return hits / lookups
+
+
+def _get_result_cache_key(
+    backend_name: str,
+    backend: LanguageBackend,
+    solution: Solution,
+    suite_hash: str,
+) -> str:
+    digest = hashlib.sha256()
+    for part in _get_result_cache_key_parts(
+        backend_name, backend, solution, suite_hash,
+    ):
+        encoded = part.encode()
+        # length prefix, so that parts can not be shifted into each other
+        digest.update(f"{len(encoded)}:".encode())
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def _get_result_cache_key_parts(
+    backend_name: str,
+    backend: LanguageBackend,
+    solution: Solution,
+    suite_hash: str,
+) -> Iterable[str]:
+    yield backend_name
+    yield backend.describe_toolchain()
+    yield suite_hash
+    yield solution.main_file.name
+    for file in solution.files:
+        yield file.name
+        yield file.contents
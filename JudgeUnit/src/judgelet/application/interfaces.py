@@ -1,14 +1,27 @@
 from abc import ABC, abstractmethod
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
 
 from judgelet.domain.execution import LanguageBackend
-from judgelet.domain.files import FileSystem, Solution
+from judgelet.domain.files import Blob, Solution, Workspace
 from judgelet.domain.sandbox import Sandbox
+from judgelet.domain.slots import ExecutionSlot
+from judgelet.domain.test_suite import SuiteResult, TestSuite
+
+
+class SlotQueueIsFull(Exception):
+    """Raised when no more solutions can wait for a free slot."""
 
 
 class LanguageBackendFactory(ABC):
     """Language backend creator."""
 
+    @property
+    @abstractmethod
+    def languages(self) -> Mapping[str, str]:
+        """Names of available languages and extensions of their sources."""
+        raise NotImplementedError
+
     @abstractmethod
     def create_backend(
             self, name: str, solution: Solution,
@@ -16,6 +29,9 @@ class LanguageBackendFactory(ABC):
         """Create backend or return None if none found by name."""
         raise NotImplementedError
 
+    async def prepare_toolchains(self) -> None:  # noqa: B027
+        """Prepare toolchains once at startup, does nothing by default."""
+
 
 class SandboxFactory(ABC):
     """Sandbox creator."""
@@ -23,10 +39,149 @@ class SandboxFactory(ABC):
     @abstractmethod
     def __call__(
             self,
-            fs: FileSystem,
-            sandbox_dir: str,
+            workspace: Workspace,
             encoding: str | None = None,
             environment: Mapping[str, str] | None = None,
+            slot: ExecutionSlot | None = None,
     ) -> Sandbox:
         """Create sandbox."""
         raise NotImplementedError
+
+
+class BlobSpool(ABC):
+    """Keeps test data of a suite out of memory."""
+
+    @abstractmethod
+    def put(self, contents: bytes) -> Blob:
+        """Store data, caller should drop its own copy afterwards."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self) -> None:
+        """Remove all stored data, blobs become unusable."""
+        raise NotImplementedError
+
+
+class SuiteCache(ABC):
+    """Keeps loaded suites by hash, so callers may send only the hash."""
+
+    @abstractmethod
+    def get(self, suite_hash: str) -> AbstractContextManager[TestSuite] | None:
+        """
+        Use cached suite for the duration of the context.
+
+        Returned context manager must be entered right away,
+        data of the suite is not removed while it is in use.
+
+        Returns:
+            suite context or None on miss
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def put(
+        self,
+        suite_hash: str,
+        load: Callable[[BlobSpool], TestSuite],
+    ) -> AbstractContextManager[TestSuite]:
+        """
+        Load suite into cache and use it for the duration of the context.
+
+        Suite is loaded with a spool owned by the cache, in a thread,
+        since spooling writes test data to disk. If the hash
+        is already cached, the cached suite is used instead.
+        Returned context manager must be entered right away.
+        """
+        raise NotImplementedError
+
+
+class ResultCache(ABC):
+    """Stores results of checking to skip checking of known solutions."""
+
+    @abstractmethod
+    def get(self, key: str) -> SuiteResult | None:
+        """Get stored result, None on miss."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(self, key: str, result: SuiteResult) -> None:
+        """Store result of checking."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def __contains__(self, key: str) -> bool:
+        """Whether result is stored, such lookup is not counted."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def hits(self) -> int:
+        """Count of lookups that found a result."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def misses(self) -> int:
+        """Count of lookups that found nothing."""
+        raise NotImplementedError
+
+
+class SlotScheduler(ABC):
+    """Distributes execution slots between solutions."""
+
+    @abstractmethod
+    def acquire(self) -> AbstractAsyncContextManager[ExecutionSlot]:
+        """
+        Occupy a slot for the duration of the context.
+
+        If no slot is free, wait in FIFO order.
+
+        Raises:
+            SlotQueueIsFull: if the waiting queue is full.
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def try_acquire(self) -> AbstractContextManager[ExecutionSlot] | None:
+        """
+        Occupy a slot only if it is free and nobody waits for it.
+
+        Returned context manager must be entered right away,
+        the slot is freed on its exit.
+
+        Returns:
+            slot context or None if no slot is free
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def wait_for_room(self) -> None:
+        """Wait until a new solution would not be rejected right away."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def total_slots(self) -> int:
+        """Count of all slots."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def free_slots(self) -> int:
+        """Count of currently unoccupied slots."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def queue_depth(self) -> int:
+        """Count of solutions waiting for a slot."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def is_saturated(self) -> bool:
+        """Whether a new solution would be rejected right away."""
+        raise NotImplementedError
@@ -7,18 +7,19 @@ from pydantic import BaseModel
 
 from judgelet.application.constants import NO_IMPORT_PATTERNS
 from judgelet.domain.checking import NoArgs, PrecompileChecker
-from judgelet.domain.files import FileSystem
+from judgelet.domain.files import Workspace
 from judgelet.domain.results import Verdict
 
 type LanguageName = str
-type RegexPattern = str
+type RegexPattern = re.Pattern[str]
 type AssociatedLanguagePatterns = Mapping[
     LanguageName, Collection[RegexPattern],
 ]
 
 
 class _PatternCheckerArgs(BaseModel):
-    patterns: dict[str, list[str]]
+    # compiled once, when the suite is loaded
+    patterns: dict[str, list[re.Pattern[str]]]
 
 
 class HasPatternChecker(PrecompileChecker[_PatternCheckerArgs]):
@@ -27,9 +28,9 @@ class HasPatternChecker(PrecompileChecker[_PatternCheckerArgs]):
     args_cls = _PatternCheckerArgs
 
     @override
-    def check(self, filesystem: FileSystem, path: str) -> Verdict:
+    def check(self, workspace: Workspace, path: str) -> Verdict:
         return _perform_pattern_check(
-            filesystem, path, self.args.patterns, is_positive=True,
+            workspace, path, self.args.patterns, is_positive=True,
         )
 
 
@@ -39,9 +40,9 @@ class NoPatternChecker(PrecompileChecker[_PatternCheckerArgs]):
     args_cls = _PatternCheckerArgs
 
     @override
-    def check(self, filesystem: FileSystem, path: str) -> Verdict:
+    def check(self, workspace: Workspace, path: str) -> Verdict:
         return _perform_pattern_check(
-            filesystem, path, self.args.patterns, is_positive=False,
+            workspace, path, self.args.patterns, is_positive=False,
         )
 
 
@@ -51,20 +52,20 @@ class NoImportChecker(PrecompileChecker[NoArgs]):
     args_cls = NoArgs
 
     @override
-    def check(self, filesystem: FileSystem, path: str) -> Verdict:
+    def check(self, workspace: Workspace, path: str) -> Verdict:
         return _perform_pattern_check(
-            filesystem, path, NO_IMPORT_PATTERNS, is_positive=False,
+            workspace, path, NO_IMPORT_PATTERNS, is_positive=False,
         )
 
 
 def _perform_pattern_check(
-    filesystem: FileSystem,
+    workspace: Workspace,
     path: str,
     patterns: AssociatedLanguagePatterns,
     *,
     is_positive: bool,
 ) -> Verdict:
-    checker = _RegexChecker(filesystem, patterns, is_positive=is_positive)
+    checker = _RegexChecker(workspace, patterns, is_positive=is_positive)
     if checker.perform_check(path):
         return Verdict.OK()
     return Verdict.PCF(f"pattern check failed on {path}")
@@ -73,7 +74,7 @@ def _perform_pattern_check(
 class _RegexChecker:
     def __init__(
         self,
-        fs: FileSystem,
+        workspace: Workspace,
         patterns: AssociatedLanguagePatterns,
         *,
         is_positive: bool,
@@ -88,24 +89,24 @@ class _RegexChecker:
                 one occurrence of one of aforementioned patterns.
                 if negative, enforces the file to not have any
                 defined pattern.
-            fs: desired filesystem.
+            workspace: workspace with files to check.
 
         """
         self._patterns = patterns
         self._is_positive = is_positive
-        self._fs = fs
+        self._workspace = workspace
 
     def perform_check(self, filename: str) -> bool:
         """Check single file."""
-        extension = filename.split(".")[-1]
+        extension = filename.rsplit(".", maxsplit=1)[-1]
         if extension not in self._patterns:
             return True
         patterns = self._patterns[extension]
-        target_file = self._fs.get_file(filename)
+        target_file = self._workspace.get_file(filename)
         if not target_file:
             return not self._is_positive
         for pattern in patterns:
-            if re.search(pattern, target_file.contents):
+            if pattern.search(target_file.contents):
                 return self._is_positive
         return not self._is_positive
 
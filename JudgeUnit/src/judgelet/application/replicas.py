@@ -0,0 +1,140 @@
+import asyncio
+from collections.abc import Collection, Iterator, Mapping
+from contextlib import AbstractContextManager, ExitStack, contextmanager
+from typing import Any, Self, override
+
+from judgelet.application.interfaces import SandboxFactory, SlotScheduler
+from judgelet.domain.execution import RunnerReplicator, SolutionRunner
+from judgelet.domain.files import FileSystem, Workspace
+from judgelet.domain.slots import ExecutionSlot
+
+
+class SlotRunnerReplicator(RunnerReplicator):
+    """
+    Replicates runners onto slots that are currently free.
+
+    Capturing only remembers which files the workspace has,
+    they are copied to a template once the first replica is needed.
+    Files are copied in a thread, so the event loop is not blocked.
+    Template is kept until the replicator is closed.
+    Sandboxes of replicas are closed before their slots are released.
+    """
+
+    def __init__(
+        self,
+        scheduler: SlotScheduler,
+        fs: FileSystem,
+        sandbox_factory: SandboxFactory,
+        environment: Mapping[str, str],
+    ) -> None:
+        self.scheduler = scheduler
+        self.fs = fs
+        self.sandbox_factory = sandbox_factory
+        self.environment = environment
+        self._origin: Workspace | None = None
+        self._origin_files: list[str] = []
+        self._template: Workspace | None = None
+        self._template_lock = asyncio.Lock()
+
+    @override
+    def capture(self, runner: SolutionRunner) -> None:
+        self.close()
+        if self.scheduler.total_slots > 1:
+            self._origin = runner.workspace
+            self._origin_files = runner.workspace.list_files()
+
+    @override
+    async def try_replicate(
+        self, runner: SolutionRunner,
+    ) -> AbstractContextManager[SolutionRunner] | None:
+        if self._origin is None:
+            return None
+        lease = self.scheduler.try_acquire()
+        if lease is None:
+            return None
+        with ExitStack() as cleanup:
+            slot = cleanup.enter_context(lease)
+            template = await self._get_template(self._origin)
+            workspace = await _clone_in_thread(
+                self.fs, template, slot.workdir,
+            )
+            cleanup.callback(workspace.close)
+            replica_cleanup = cleanup.pop_all()
+        return self._replicate(runner, slot, workspace, replica_cleanup)
+
+    @override
+    @property
+    def is_contended(self) -> bool:
+        return self.scheduler.queue_depth > 0
+
+    def close(self) -> None:
+        """Remove the template and forget the captured workspace."""
+        self._origin = None
+        self._origin_files = []
+        if self._template is not None:
+            self._template.close()
+            self._template = None
+
+    def __enter__(self) -> Self:
+        """Use replicator until the end of the block."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[Exception] | None,
+        exc_val: Exception | None,
+        exc_tb: Any,
+    ) -> None:
+        """Remove the template."""
+        self.close()
+
+    async def _get_template(self, origin: Workspace) -> Workspace:
+        async with self._template_lock:
+            if self._template is None:
+                self._template = await _clone_in_thread(
+                    self.fs, origin, paths=self._origin_files,
+                )
+            return self._template
+
+    @contextmanager
+    def _replicate(
+        self,
+        runner: SolutionRunner,
+        slot: ExecutionSlot,
+        workspace: Workspace,
+        cleanup: ExitStack,
+    ) -> Iterator[SolutionRunner]:
+        with cleanup:
+            sandbox = self.sandbox_factory(
+                workspace, environment=self.environment, slot=slot,
+            )
+            cleanup.callback(sandbox.close)
+            yield SolutionRunner(
+                runner.backend,
+                runner.solution,
+                workspace,
+                sandbox,
+                runner.compile_cache,
+            )
+
+
+async def _clone_in_thread(
+    fs: FileSystem,
+    workspace: Workspace,
+    workdir: str | None = None,
+    paths: Collection[str] | None = None,
+) -> Workspace:
+    cloning = asyncio.ensure_future(asyncio.to_thread(
+        fs.clone_workspace, workspace, workdir, paths,
+    ))
+    try:
+        return await asyncio.shield(cloning)
+    except asyncio.CancelledError:
+        # thread keeps copying, its result must not be left behind
+        cloning.add_done_callback(_close_clone)
+        raise
+
+
+def _close_clone(cloning: "asyncio.Future[Workspace]") -> None:
+    if not cloning.cancelled() and cloning.exception() is None:
+        cloning.result().close()
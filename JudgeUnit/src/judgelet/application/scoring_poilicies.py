@@ -34,10 +34,13 @@ class PolarScoringPolicy(ScoringPolicy):
     Score is either 0 or full.
 
     If at least one verdict is not successful, then score is 0,
-    otherwise -- full.
+    otherwise -- full. So the rest of the group is skipped
+    after the first failed test.
 
     """
 
+    is_fail_fast = True
+
     @override
     def get_score(self, full_score: int, verdicts: Sequence[Verdict]) -> int:
         if all(map(attrgetter("is_successful"), verdicts)):
@@ -1,18 +1,52 @@
+import string
 from collections.abc import Mapping
 from types import MappingProxyType
 from typing import Any, Final, override
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, ValidationInfo, field_validator
 
+from judgelet.application.interfaces import BlobSpool
 from judgelet.domain.checking import Validator
+from judgelet.domain.files import Blob, MemoryBlob
 from judgelet.domain.results import RunResult, Verdict
 from judgelet.domain.test_case import TestCase
 
+SPOOL_CONTEXT_KEY: Final = "spool"
 
-class _StdoutValidatorArgs(BaseModel):
-    expected: str
+_WHITESPACE: Final = frozenset(string.whitespace.encode())
+_CHUNK_SIZE: Final = 1024 * 1024
+
+
+class _ExpectedAnswerArgs(BaseModel):
+    """
+    Args with an expected answer.
+
+    Answer is put to the spool from validation context, if there is one.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    expected: Blob
     strip: bool = True
 
+    @field_validator("expected", mode="before")
+    @classmethod
+    def spool_expected(
+        cls, expected: Any, validation_info: ValidationInfo,
+    ) -> Any:
+        """Turn answer into a blob."""
+        if not isinstance(expected, str):
+            return expected
+        context = validation_info.context or {}
+        spool: BlobSpool | None = context.get(SPOOL_CONTEXT_KEY)
+        if spool is None:
+            return MemoryBlob(expected.encode())
+        return spool.put(expected.encode())
+
+
+class _StdoutValidatorArgs(_ExpectedAnswerArgs):
+    """Args of stdout validator."""
+
 
 class StdoutValidator(Validator[_StdoutValidatorArgs]):
     """Validates stdout."""
@@ -24,22 +58,16 @@ class StdoutValidator(Validator[_StdoutValidatorArgs]):
         self,
         result: RunResult,
         test_case: TestCase,
-        output_files: Mapping[str, str],
+        output_files: Mapping[str, bytes],
     ) -> Verdict:
         actual = result.stdout
-        expected = self.args.expected
-        if self.args.strip:
-            actual = actual.strip()
-            expected = expected.strip()
-        if actual != expected:
+        if not _matches(actual, self.args.expected, strip=self.args.strip):
             return Verdict.WA()
         return Verdict.OK()
 
 
-class _FileValidatorArgs(BaseModel):
+class _FileValidatorArgs(_ExpectedAnswerArgs):
     filename: str
-    expected: str
-    strip: bool = True
 
 
 class FileValidator(Validator[_FileValidatorArgs]):
@@ -52,22 +80,59 @@ class FileValidator(Validator[_FileValidatorArgs]):
         self,
         result: RunResult,
         test_case: TestCase,
-        output_files: Mapping[str, str],
+        output_files: Mapping[str, bytes],
     ) -> Verdict:
         if self.args.filename not in output_files:
             return Verdict.PE(
                 f"file {self.args.filename} not found",  # noqa: WPS237
             )
         actual = output_files[self.args.filename]
-        expected = self.args.expected
-        if self.args.strip:
-            actual = actual.strip()
-            expected = expected.strip()
-        if actual != expected:
+        if not _matches(actual, self.args.expected, strip=self.args.strip):
             return Verdict.WA()
         return Verdict.OK()
 
 
+def _matches(actual: bytes, expected: Blob, *, strip: bool) -> bool:
+    with expected.view() as expected_view:
+        return _views_are_equal(
+            memoryview(actual), expected_view, strip=strip,
+        )
+
+
+def _views_are_equal(
+    actual: memoryview,
+    expected: memoryview,
+    *,
+    strip: bool,
+) -> bool:
+    if strip:
+        actual = _strip(actual)
+        expected = _strip(expected)
+    if len(actual) != len(expected):
+        return False
+    return all(
+        _get_chunk(actual, start) == _get_chunk(expected, start)
+        for start in range(0, len(actual), _CHUNK_SIZE)
+    )
+
+
+def _get_chunk(data: memoryview, start: int) -> bytes:
+    # comparing bytes is much faster than comparing views,
+    # and copying by chunks never copies a huge answer at once
+    return data[start:start + _CHUNK_SIZE].tobytes()
+
+
+def _strip(data: memoryview) -> memoryview:
+    """Strip ASCII whitespace, but view the data instead of copying it."""
+    start = 0
+    end = len(data)
+    while start < end and data[start] in _WHITESPACE:
+        start += 1
+    while end > start and data[end - 1] in _WHITESPACE:
+        end -= 1
+    return data[start:end]
+
+
 VALIDATORS: Final[Mapping[str, type[Validator[Any]]]] = MappingProxyType({
     "stdout": StdoutValidator,
     "file": FileValidator,
@@ -1,5 +1,4 @@
-import asyncio
-import sys
+import functools
 
 from dishka import AsyncContainer, make_async_container
 from dishka.integrations import litestar as litestar_integration
@@ -7,6 +6,7 @@ from litestar import Litestar
 from litestar.openapi import OpenAPIConfig
 from litestar.openapi.plugins import SwaggerRenderPlugin
 
+from judgelet.application.interfaces import LanguageBackendFactory
 from judgelet.bootstrap.config import judgelet_config_loader
 from judgelet.bootstrap.di import AppProvider
 from judgelet.bootstrap.logging import get_structlog_plugin_def
@@ -23,9 +23,15 @@ def _create_container(config: Config) -> AsyncContainer:
     )
 
 
+async def _prepare_toolchains(container: AsyncContainer) -> None:
+    backend_factory = await container.get(LanguageBackendFactory)
+    await backend_factory.prepare_toolchains()
+
+
 def _create_litestar(container: AsyncContainer, config: Config) -> Litestar:
     litestar_app = Litestar(
         debug=config.debug_mode,
+        on_startup=[functools.partial(_prepare_toolchains, container)],
         route_handlers=[
             SolutionsController,
         ],
@@ -46,10 +52,6 @@ def _create_litestar(container: AsyncContainer, config: Config) -> Litestar:
 
 def get_app() -> Litestar:
     """Bootstrap the application."""
-    if sys.platform == "win32":
-        asyncio.set_event_loop_policy(
-            asyncio.WindowsSelectorEventLoopPolicy(),
-        )
     config = judgelet_config_loader.load()
     container = _create_container(config)
     return _create_litestar(container, config)
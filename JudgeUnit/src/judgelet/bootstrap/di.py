@@ -1,37 +1,108 @@
+from collections.abc import Iterator
+from typing import Final
+
 from dishka import Provider, Scope, from_context, provide
 
-from judgelet.application.interactors import CheckSolutionInteractor
+from judgelet.application.activity import SolutionActivity
+from judgelet.application.admission import AdmissionController
+from judgelet.application.interactors import (
+    CheckBatchInteractor,
+    CheckSolutionInteractor,
+    GetStatusInteractor,
+)
 from judgelet.application.interfaces import (
+    BlobSpool,
     LanguageBackendFactory,
+    ResultCache,
     SandboxFactory,
+    SlotScheduler,
+    SuiteCache,
 )
 from judgelet.config import Config
+from judgelet.domain.caching import CompileCache
 from judgelet.domain.files import FileSystem
+from judgelet.infrastructure.compile_cache import DiskCompileCache
 from judgelet.infrastructure.filesystem import RealFileSystem
+from judgelet.infrastructure.languages.cpp import create_cpp17_headers
 from judgelet.infrastructure.languages.factory import (
     DefaultLanguageBackendFactory,
 )
+from judgelet.infrastructure.result_cache import LruResultCache
 from judgelet.infrastructure.sandboxes.types import get_sandbox_factory
+from judgelet.infrastructure.scheduler import create_slot_scheduler
+from judgelet.infrastructure.spool import DiskBlobSpool
+from judgelet.infrastructure.suite_cache import LruSuiteCache
+
+_MB: Final = 1024 * 1024
 
 
 class AppProvider(Provider):
     config = from_context(provides=Config, scope=Scope.APP)
 
-    lbr = provide(
-        DefaultLanguageBackendFactory,
-        provides=LanguageBackendFactory,
-        scope=Scope.APP,
-    )
+    activity = provide(SolutionActivity, scope=Scope.APP)
+
+    @provide(scope=Scope.APP)
+    def provide_backend_factory(
+        self, config: Config,
+    ) -> LanguageBackendFactory:
+        return DefaultLanguageBackendFactory(
+            create_cpp17_headers(config.pch_dir, config.precompiled_headers),
+            config.python_interpreters,
+            python_zygote=config.python_zygote,
+        )
 
     @provide(scope=Scope.APP)
     def provide_sandbox_factory(self, config: Config) -> SandboxFactory:
-        return get_sandbox_factory(config.sandbox)
+        return get_sandbox_factory(
+            config.sandbox,
+            int(config.output_limit_mb * _MB),
+            read_only_dirs=(config.pch_dir,),
+        )
+
+    @provide(scope=Scope.APP)
+    def provide_fs(self, config: Config) -> FileSystem:
+        return RealFileSystem(config.workdir)
+
+    @provide(scope=Scope.APP)
+    def provide_compile_cache(self, config: Config) -> CompileCache:
+        return DiskCompileCache(
+            config.compile_cache_dir, config.compile_cache_mb,
+        )
+
+    @provide(scope=Scope.APP)
+    def provide_scheduler(self, config: Config) -> SlotScheduler:
+        return create_slot_scheduler(config)
 
     @provide(scope=Scope.APP)
-    def provide_fs(self) -> FileSystem:
-        return RealFileSystem()
+    def provide_suite_cache(self, config: Config) -> SuiteCache:
+        return LruSuiteCache(config.spool_dir, config.suite_cache_size)
+
+    @provide(scope=Scope.APP)
+    def provide_result_cache(self, config: Config) -> ResultCache:
+        return LruResultCache(config.result_cache_size)
+
+    @provide(scope=Scope.REQUEST)
+    def provide_spool(self, config: Config) -> Iterator[BlobSpool]:
+        spool = DiskBlobSpool(config.spool_dir)
+        yield spool
+        spool.close()
 
     interactor = provide(
         CheckSolutionInteractor,
         scope=Scope.REQUEST,
     )
+
+    batch_interactor = provide(
+        CheckBatchInteractor,
+        scope=Scope.REQUEST,
+    )
+
+    admission = provide(
+        AdmissionController,
+        scope=Scope.REQUEST,
+    )
+
+    status_interactor = provide(
+        GetStatusInteractor,
+        scope=Scope.REQUEST,
+    )
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import StrEnum
 
 
@@ -7,6 +7,7 @@ class SandboxType(StrEnum):
 
     SIMPLE = "simple"
     BUBBLEWRAP = "bubblewrap"
+    CGROUP = "cgroup"
 
 
 @dataclass
@@ -17,11 +18,64 @@ class Config:
     Args:
         debug_mode: run in debug or release mode.
         enable_lock: if set to True, then only one solution at a time
-            could be executed on this judgelet.
+            could be executed on this judgelet (same as ``slots: 1``).
         sandbox: what sandbox type to use.
+        slots: how many solutions could be executed simultaneously.
+            Defaults to the number of physical cores minus one.
+        max_queue_size: how many solutions could wait for a free slot.
+            Solutions beyond that are rejected.
+            Defaults to the number of slots, so a queued solution
+            waits for about one check at most.
+        pin_cpus: if set to True, processes of each slot are pinned
+            to their own set of CPUs.
+        workdir: directory where solutions are placed.
+        compile_cache_dir: directory where compiled artifacts are cached.
+        compile_cache_mb: disk quota of compile cache.
+            Least recently used artifacts are evicted beyond it.
+            Set to 0 to disable the cache.
+        spool_dir: directory where large test data of suites is kept
+            while they are checked.
+        suite_cache_size: how many suites are kept loaded, so that
+            callers may send only the hash of a suite.
+            Set to 0 to disable the cache.
+        result_cache_size: how many results of checking are kept,
+            so that the same solution is not checked against the same
+            suite twice. Set to 0 to disable the cache.
+        output_limit_mb: how much stdout, stderr and files each process
+            may write. Beyond that it is killed with OLE, so the judgelet
+            memory does not depend on what solutions print.
+        python_interpreters: names under which Python is offered
+            and interpreters they are run with, so that one judgelet
+            could offer several versions, e.g.
+            ``{"python": "python3.13", "python3.12": "/usr/bin/python3.12"}``.
+        python_zygote: whether Python tests are forked from a warm
+            interpreter, that the sandbox agent keeps, instead of
+            starting one per test. Interpreter startup is then neither
+            waited for nor counted to CPU time. Needs Python 3.11+.
+        pch_dir: directory where precompiled headers are kept.
+        precompiled_headers: headers that are precompiled at startup
+            for every C++ flag set, e.g. ``bits/stdc++.h``.
+            Solutions that include them first are compiled faster.
+            Set to empty list to disable.
 
     """
 
     debug_mode: bool = True
-    enable_lock: bool = True
+    enable_lock: bool = False
     sandbox: SandboxType = SandboxType.SIMPLE
+    slots: int | None = None
+    max_queue_size: int | None = None
+    pin_cpus: bool = True
+    workdir: str = "solutions"
+    compile_cache_dir: str = "compile_cache"
+    compile_cache_mb: float = 512
+    output_limit_mb: float = 64
+    spool_dir: str = "spool"
+    suite_cache_size: int = 32
+    result_cache_size: int = 1024
+    python_interpreters: dict[str, str] = field(
+        default_factory=lambda: {"python": "python"},
+    )
+    python_zygote: bool = False
+    pch_dir: str = "pch"
+    precompiled_headers: tuple[str, ...] = ("bits/stdc++.h",)
@@ -1,15 +1,43 @@
+import functools
+from collections.abc import AsyncIterator, Sequence
+from contextlib import AbstractContextManager
+
 from dishka import FromDishka
 from dishka.integrations.litestar import inject
 from litestar import Controller, HttpMethod, route
-from litestar.exceptions import ValidationException
+from litestar.exceptions import TooManyRequestsException
+from litestar.response import Stream
 from structlog import get_logger
 
-from judgelet.application.interactors import CheckSolutionInteractor
-from judgelet.controllers.schemas.dumping import dump_run_response
-from judgelet.controllers.schemas.loading import load_solution, load_suite
-from judgelet.controllers.schemas.request import RunRequest
-from judgelet.controllers.schemas.response import RunResponse
-from judgelet.infrastructure.languages.lang_list import LANGUAGES
+from judgelet.application.admission import AdmissionController
+from judgelet.application.interactors import (
+    CheckBatchInteractor,
+    CheckSolutionInteractor,
+    GetStatusInteractor,
+    Submission,
+)
+from judgelet.application.interfaces import (
+    BlobSpool,
+    LanguageBackendFactory,
+    SlotQueueIsFull,
+    SuiteCache,
+)
+from judgelet.controllers.progress import stream_progress
+from judgelet.controllers.schemas.dumping import (
+    dump_batch_item,
+    dump_run_response,
+    dump_status,
+)
+from judgelet.controllers.schemas.loading import load_solution, open_suite
+from judgelet.controllers.schemas.request import RunBatchRequest, RunRequest
+from judgelet.controllers.schemas.response import (
+    RunResponse,
+    StatusResponse,
+)
+from judgelet.domain.files import Solution
+from judgelet.domain.test_suite import TestSuite
+
+_NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
 
 class SolutionsController(Controller):
@@ -23,24 +51,173 @@ class SolutionsController(Controller):
         """Healthcheck."""
         return "ok"
 
+    @route(
+        http_method=HttpMethod.GET,
+        path="/status",
+    )
+    @inject
+    async def status(
+        self,
+        interactor: FromDishka[GetStatusInteractor],
+        backend_factory: FromDishka[LanguageBackendFactory],
+    ) -> StatusResponse:
+        """Load and capacity of the judgelet."""
+        return dump_status(interactor(), backend_factory.languages.keys())
+
     @route(
         http_method=HttpMethod.POST,
         path="/run",
     )
     @inject
-    async def run_solution(
+    async def run_solution(  # noqa: WPS211 (too many args)
         self,
         data: RunRequest,
         interactor: FromDishka[CheckSolutionInteractor],
+        spool: FromDishka[BlobSpool],
+        suite_cache: FromDishka[SuiteCache],
+        admission: FromDishka[AdmissionController],
+        backend_factory: FromDishka[LanguageBackendFactory],
     ) -> RunResponse:
-        """Run solution against specified tests."""
+        """
+        Run solution against specified tests.
+
+        If the judgelet is saturated, solution is rejected with 429,
+        unless its result is cached.
+        """
         log = get_logger().bind(solution_id=data.id)
-        if data.compiler not in LANGUAGES:
-            raise ValidationException(
-                f"bad compiler, avaliable: {LANGUAGES.keys()}",
-            )
-        test_suite = load_suite(data)
-        solution = load_solution(data)
-        log.info("Begin processing soluton")
-        result = await interactor(data.compiler, solution, test_suite)
+        solution = load_solution(data, backend_factory.languages)
+        if not interactor.is_cached(data.compiler, solution, data.suite_hash):
+            _admit(admission)
+        with await open_suite(data, suite_cache, spool) as test_suite:
+            log.info("Begin processing soluton")
+            try:
+                result = await interactor(
+                    data.compiler, solution, test_suite, data.suite_hash,
+                )
+            except SlotQueueIsFull as exc:
+                raise _reject(admission) from exc
         return dump_run_response(result)
+
+    @route(
+        http_method=HttpMethod.POST,
+        path="/run-stream",
+    )
+    @inject
+    async def run_solution_streaming(  # noqa: WPS211 (too many args)
+        self,
+        data: RunRequest,
+        interactor: FromDishka[CheckSolutionInteractor],
+        spool: FromDishka[BlobSpool],
+        suite_cache: FromDishka[SuiteCache],
+        admission: FromDishka[AdmissionController],
+        backend_factory: FromDishka[LanguageBackendFactory],
+    ) -> Stream:
+        """
+        Run solution against specified tests, streaming progress.
+
+        Events are streamed as NDJSON: compilation, every test and
+        every group as soon as they finish, then the result or error.
+        If the judgelet is saturated, solution is rejected with 429,
+        unless its result is cached.
+        """
+        solution = load_solution(data, backend_factory.languages)
+        if not interactor.is_cached(data.compiler, solution, data.suite_hash):
+            _admit(admission)
+        get_logger().info("Begin streaming soluton", solution_id=data.id)
+        return Stream(
+            _stream_solution(
+                interactor,
+                data,
+                solution,
+                await open_suite(data, suite_cache, spool),
+            ),
+            media_type=_NDJSON_MEDIA_TYPE,
+        )
+
+    @route(
+        http_method=HttpMethod.POST,
+        path="/run-batch",
+    )
+    @inject
+    async def run_batch(  # noqa: WPS211 (too many args)
+        self,
+        data: RunBatchRequest,
+        interactor: FromDishka[CheckBatchInteractor],
+        spool: FromDishka[BlobSpool],
+        suite_cache: FromDishka[SuiteCache],
+        admission: FromDishka[AdmissionController],
+        backend_factory: FromDishka[LanguageBackendFactory],
+    ) -> Stream:
+        """
+        Run many solutions against the same suite.
+
+        Suite is loaded once. Results are streamed as NDJSON,
+        one line per solution in order of finishing.
+        Batch is rejected with 429 only if the judgelet is saturated
+        before it starts and some of its results are not cached,
+        later solutions wait for their turn.
+        """
+        submissions = [
+            Submission(
+                submission.compiler,
+                load_solution(submission, backend_factory.languages),
+            )
+            for submission in data.solutions
+        ]
+        if not interactor.is_cached(submissions, data.suite_hash):
+            _admit(admission)
+        get_logger().info("Begin processing batch of %s", len(submissions))
+        return Stream(
+            _stream_batch(
+                interactor,
+                submissions,
+                await open_suite(data, suite_cache, spool),
+                data.suite_hash,
+            ),
+            media_type=_NDJSON_MEDIA_TYPE,
+        )
+
+
+def _admit(admission: AdmissionController) -> None:
+    try:
+        admission.admit()
+    except SlotQueueIsFull as exc:
+        raise _reject(admission) from exc
+
+
+def _reject(admission: AdmissionController) -> TooManyRequestsException:
+    retry_after_s = admission.get_retry_after_s()
+    get_logger().warning(
+        "Rejected solution, judgelet is saturated",
+        retry_after_s=retry_after_s,
+    )
+    return TooManyRequestsException(
+        "judgelet is busy",
+        headers={"Retry-After": str(retry_after_s)},
+    )
+
+
+async def _stream_batch(
+    interactor: CheckBatchInteractor,
+    submissions: Sequence[Submission],
+    suite_context: AbstractContextManager[TestSuite],
+    suite_hash: str | None,
+) -> AsyncIterator[bytes]:
+    with suite_context as test_suite:
+        async for outcome in interactor(submissions, test_suite, suite_hash):
+            dumped = dump_batch_item(outcome).model_dump_json()
+            yield f"{dumped}\n".encode()
+
+
+async def _stream_solution(
+    interactor: CheckSolutionInteractor,
+    data: RunRequest,
+    solution: Solution,
+    suite_context: AbstractContextManager[TestSuite],
+) -> AsyncIterator[bytes]:
+    with suite_context as test_suite:
+        check = functools.partial(
+            interactor, data.compiler, solution, test_suite, data.suite_hash,
+        )
+        async for chunk in stream_progress(check):
+            yield chunk
@@ -0,0 +1,111 @@
+"""Progress of checking a solution, streamed as NDJSON."""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Coroutine
+from typing import Any, override
+
+from structlog import get_logger
+
+from judgelet.application.interactors import LanguageNotFound
+from judgelet.application.interfaces import SlotQueueIsFull
+from judgelet.controllers.schemas.dumping import (
+    dump_group_protocol,
+    dump_run_response,
+    dump_verdict,
+)
+from judgelet.controllers.schemas.response import (
+    ProgressEventSchema,
+    ProgressEventType,
+)
+from judgelet.domain.results import RunResult, Verdict
+from judgelet.domain.test_group import GroupProtocol
+from judgelet.domain.test_suite import ProgressListener, SuiteResult
+
+type Check = Callable[[ProgressListener], Coroutine[Any, Any, SuiteResult]]
+
+
+class QueueProgressListener(ProgressListener):
+    """Puts progress events to a queue, ``None`` marks the end."""
+
+    def __init__(self) -> None:
+        self.events: asyncio.Queue[ProgressEventSchema | None] = (
+            asyncio.Queue()
+        )
+
+    @override
+    def on_compiled(self, result: RunResult) -> None:
+        self.events.put_nowait(ProgressEventSchema(
+            event=ProgressEventType.COMPILED,
+            is_successful=result.is_successful,
+        ))
+
+    @override
+    def on_test_finished(
+        self, group_name: str, test_index: int, verdict: Verdict,
+    ) -> None:
+        self.events.put_nowait(ProgressEventSchema(
+            event=ProgressEventType.TEST,
+            group=group_name,
+            test=test_index,
+            verdict=dump_verdict(verdict),
+        ))
+
+    @override
+    def on_group_finished(
+        self, group_name: str, protocol: GroupProtocol,
+    ) -> None:
+        self.events.put_nowait(ProgressEventSchema(
+            event=ProgressEventType.GROUP,
+            group=group_name,
+            protocol=dump_group_protocol(protocol),
+        ))
+
+
+async def stream_progress(check: Check) -> AsyncIterator[bytes]:
+    """
+    Run the check, stream its progress and then its result.
+
+    If the check fails, the stream ends with an error event instead,
+    so it is never cut off after some events are sent.
+    If the stream is closed early, the check is cancelled.
+    """
+    listener = QueueProgressListener()
+    checking = asyncio.create_task(check(listener))
+    checking.add_done_callback(lambda _: listener.events.put_nowait(None))
+    try:
+        while True:
+            event = await listener.events.get()
+            if event is None:
+                break
+            yield _encode(event)
+    except BaseException:
+        checking.cancel()
+        await asyncio.gather(checking, return_exceptions=True)
+        raise
+    yield _encode(_get_final_event(checking))
+
+
+def _get_final_event(
+    checking: "asyncio.Task[SuiteResult]",
+) -> ProgressEventSchema:
+    try:
+        result = checking.result()
+    except SlotQueueIsFull:
+        return _create_error_event("judgelet is busy")
+    except LanguageNotFound:
+        return _create_error_event("unknown compiler")
+    except Exception:  # noqa: BLE001 (stream must end with an event)
+        get_logger().exception("Checking has failed")
+        return _create_error_event("internal error")
+    return ProgressEventSchema(
+        event=ProgressEventType.RESULT, result=dump_run_response(result),
+    )
+
+
+def _create_error_event(detail: str) -> ProgressEventSchema:
+    return ProgressEventSchema(event=ProgressEventType.ERROR, detail=detail)
+
+
+def _encode(event: ProgressEventSchema) -> bytes:
+    dumped = event.model_dump_json(exclude_none=True)
+    return f"{dumped}\n".encode()
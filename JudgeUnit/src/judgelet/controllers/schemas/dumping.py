@@ -1,6 +1,13 @@
+from collections.abc import Iterable
+
+from attrs import asdict
+
+from judgelet.application.interactors import BatchOutcome, JudgeletStatus
 from judgelet.controllers.schemas.response import (
+    BatchItemResponse,
     GroupProtocolSchema,
     RunResponse,
+    StatusResponse,
     VerdictSchema,
 )
 from judgelet.domain.results import Verdict
@@ -14,25 +21,54 @@ def dump_run_response(result: SuiteResult) -> RunResponse:
         score=result.score,
         verdict=result.verdict.codename,
         protocol={
-            group_name: _transform_protocol(protocol)
+            group_name: dump_group_protocol(protocol)
             for group_name, protocol in result.protocol.items()
         },
         group_scores=result.group_scores,
+        compilation_error=result.compilation_error,
+    )
+
+
+def dump_batch_item(outcome: BatchOutcome) -> BatchItemResponse:
+    """Transform outcome of a solution from batch to pydantic response."""
+    return BatchItemResponse(
+        id=outcome.solution_id,
+        result=(
+            None if outcome.result is None
+            else dump_run_response(outcome.result)
+        ),
+        error=outcome.error,
     )
 
 
-def _transform_protocol(protocol: GroupProtocol) -> GroupProtocolSchema:
+def dump_group_protocol(protocol: GroupProtocol) -> GroupProtocolSchema:
+    """Transform group protocol DM to pydantic response."""
     return GroupProtocolSchema(
         score=protocol.score,
-        verdict=_transform_verdict(protocol.verdict),
-        verdicts=list(map(_transform_verdict, protocol.verdicts)),
+        verdict=dump_verdict(protocol.verdict),
+        verdicts=list(map(dump_verdict, protocol.verdicts)),
         is_successful=protocol.is_successful,
+        max_cpu_time_s=protocol.max_cpu_time_s,
+        max_peak_memory_mb=protocol.max_peak_memory_mb,
     )
 
 
-def _transform_verdict(verdict: Verdict) -> VerdictSchema:
+def dump_verdict(verdict: Verdict) -> VerdictSchema:
+    """Transform verdict DM to pydantic response."""
+    usage = {} if verdict.usage is None else asdict(verdict.usage)
     return VerdictSchema(
         codename=verdict.codename,
         is_successful=verdict.is_successful,
         details=verdict.details,
+        **usage,
+    )
+
+
+def dump_status(
+    status: JudgeletStatus, compilers: Iterable[str],
+) -> StatusResponse:
+    """Transform judgelet status to pydantic response."""
+    return StatusResponse(
+        **asdict(status),
+        compilers=list(compilers),
     )
@@ -1,53 +1,116 @@
+import asyncio
 import base64
+import contextlib
+import functools
+from collections.abc import Mapping
+from http import HTTPStatus
 from typing import Any
 
-from litestar.exceptions import ValidationException
+from litestar.exceptions import ClientException, ValidationException
+from pydantic import ValidationError as PydanticValidationError
 
+from judgelet.application.interfaces import BlobSpool, SuiteCache
 from judgelet.application.precompile_checkers import CHECKERS
 from judgelet.application.scoring_poilicies import POLICIES
-from judgelet.application.validators import VALIDATORS
+from judgelet.application.validators import SPOOL_CONTEXT_KEY, VALIDATORS
 from judgelet.controllers.schemas.request import (
     PrecompileCheckerSchema,
-    RunRequest,
+    SubmissionSchema,
+    SuiteReference,
     ValidatorSchema,
 )
+from judgelet.controllers.schemas.request import TestCase as TestCaseSchema
+from judgelet.controllers.schemas.request import TestSuite as TestSuiteSchema
 from judgelet.domain.checking import PrecompileChecker, Validator
 from judgelet.domain.files import Solution
 from judgelet.domain.test_case import TestCase
 from judgelet.domain.test_group import ScoringPolicy, TestGroup
 from judgelet.domain.test_suite import TestSuite
-from judgelet.infrastructure.languages.lang_list import DEFAULT_FILENAMES
 from judgelet.infrastructure.solutions.str_solution import StringSolution
 from judgelet.infrastructure.solutions.zip_solution import ZipSolution
 
 
-def load_suite(data: RunRequest) -> TestSuite:
-    """Transform pydantic request into test suite DM."""
+async def open_suite(
+    data: SuiteReference,
+    suite_cache: SuiteCache,
+    spool: BlobSpool,
+) -> contextlib.AbstractContextManager[TestSuite]:
+    """
+    Get suite of the request for the duration of the context.
+
+    Suite sent with a hash is cached, so later requests may send
+    only the hash. Suite sent without a hash is loaded into
+    the request spool and is not cached. Suites are loaded
+    in a thread, so spooling does not block the event loop.
+
+    Raises:
+        ClientException: with 409 if only the hash is sent,
+            but the suite is not cached
+        ValidationException: if neither suite nor hash is sent
+
+    """
+    match (data.suite, data.suite_hash):
+        case (None, str() as suite_hash):
+            cached = suite_cache.get(suite_hash)
+            if cached is None:
+                raise ClientException(
+                    "suite is not cached, send it with the hash",
+                    status_code=HTTPStatus.CONFLICT,
+                )
+            return cached
+        case (TestSuiteSchema() as suite, None):
+            return contextlib.nullcontext(
+                await asyncio.to_thread(load_suite, suite, spool),
+            )
+        case (TestSuiteSchema() as suite, str() as suite_hash):
+            return await suite_cache.put(
+                suite_hash, functools.partial(load_suite, suite),
+            )
+    raise ValidationException("either suite or suite_hash should be given")
+
+
+def load_suite(suite: TestSuiteSchema, spool: BlobSpool) -> TestSuite:
+    """
+    Transform pydantic request into test suite DM.
+
+    Test data (stdin, input files and answers) is put to the spool,
+    so that the suite does not keep it in memory.
+    """
     return TestSuite(
         [
             TestGroup(
                 group.name,
-                [
-                    TestCase(
-                        case.stdin,
-                        case.time_limit or data.suite.time_limit,
-                        case.mem_limit_mb or data.suite.mem_limit_mb,
-                        case.files_in,
-                        case.files_out,
-                        list(map(_get_validator, case.validators)),
-                    )
-                    for case in group.cases
-                ],
+                [_load_case(case, suite, spool) for case in group.cases],
                 group.points,
                 _get_scoring_policy(group.scoring_rule.value),
             )
-            for group in data.suite.groups
+            for group in suite.groups
         ],
-        list(map(_get_precompile_checker, data.suite.precompile)),
-        data.suite.compile_timeout,
-        {group.name: group.depends_on for group in data.suite.groups},
-        data.suite.place_files,
-        data.suite.envs,
+        list(map(_get_precompile_checker, suite.precompile)),
+        suite.compile_timeout,
+        {group.name: group.depends_on for group in suite.groups},
+        suite.place_files,
+        suite.envs,
+        suite.cache_results,
+    )
+
+
+def _load_case(
+    case: TestCaseSchema,
+    suite: TestSuiteSchema,
+    spool: BlobSpool,
+) -> TestCase:
+    return TestCase(
+        spool.put(case.stdin.encode()),
+        case.time_limit or suite.time_limit,
+        case.mem_limit_mb or suite.mem_limit_mb,
+        {
+            filename: spool.put(contents.encode())
+            for filename, contents in case.files_in.items()
+        },
+        case.files_out,
+        [_get_validator(validator, spool) for validator in case.validators],
+        case.wall_time_limit or suite.wall_time_limit,
     )
 
 
@@ -57,11 +120,18 @@ def _get_scoring_policy(policy: str) -> ScoringPolicy:
     return POLICIES[policy]()
 
 
-def _get_validator(validator: ValidatorSchema) -> Validator[Any]:
+def _get_validator(
+    validator: ValidatorSchema,
+    spool: BlobSpool,
+) -> Validator[Any]:
     if validator.type not in VALIDATORS:
         raise ValidationException(f"bad validator {validator.type}")
     validator_cls = VALIDATORS[validator.type]
-    return validator_cls(validator_cls.args_cls(**validator.args))
+    return validator_cls(
+        validator_cls.args_cls.model_validate(
+            validator.args, context={SPOOL_CONTEXT_KEY: spool},
+        ),
+    )
 
 
 def _get_precompile_checker(
@@ -70,16 +140,39 @@ def _get_precompile_checker(
     if checker.type not in CHECKERS:
         raise ValidationException(f"bad precompile checker {checker.type}")
     checker_cls = CHECKERS[checker.type]
-    return checker_cls(checker_cls.args_cls(**checker.args))
+    try:
+        checker_args = checker_cls.args_cls(**checker.args)
+    except PydanticValidationError as exc:
+        raise ValidationException(
+            f"bad args of precompile checker {checker.type}",
+        ) from exc
+    return checker_cls(checker_args)
 
 
-def load_solution(data: RunRequest) -> Solution:
-    """Transform pydantic solution model into solution DM."""
+def load_solution(
+    data: SubmissionSchema, languages: Mapping[str, str],
+) -> Solution:
+    """
+    Transform pydantic solution model into solution DM.
+
+    Args:
+        data: submitted solution
+        languages: available languages and extensions of their sources
+
+    Raises:
+        ValidationException: if compiler is unknown
+
+    """
+    if data.compiler not in languages:
+        raise ValidationException(
+            f"bad compiler, avaliable: {languages.keys()}",
+        )
     # TODO: maybe refactor this using match
     if data.code.type == "str":
+        extension = languages[data.compiler]
         return StringSolution(
             data.id,
-            DEFAULT_FILENAMES[data.compiler],
+            f"main.{extension}",
             data.code.code,  # type: ignore[arg-type]
         )
     if data.code.type == "zip":
@@ -27,6 +27,7 @@ class TestCase(BaseModel):
     files_out: list[str] = []
     time_limit: float | None = None
     mem_limit_mb: float | None = None
+    wall_time_limit: float | None = None
 
 
 class TestGroupSchema(BaseModel):
@@ -53,10 +54,12 @@ class TestSuite(BaseModel):
     precompile: list[PrecompileCheckerSchema]
     time_limit: float
     mem_limit_mb: float
+    wall_time_limit: float | None = None
     compile_timeout: int = 5
     place_files: dict[str, str] = {}
     public_cases: list[dict[str, str]] = []
     envs: dict[str, str] = {}
+    cache_results: bool = True
 
 
 class SolutionSchema(BaseModel):
@@ -90,10 +93,32 @@ class SolutionSchema(BaseModel):
         return self
 
 
-class RunRequest(BaseModel):
-    """Request model."""
+class SuiteReference(BaseModel):
+    """
+    Suite or its hash.
+
+    Suite may be omitted if its hash is given and the suite was sent
+    with that hash before. If the judgelet does not have it (anymore),
+    it answers 409 and the request should be repeated with the suite.
+    """
+
+    suite: TestSuite | None = None
+    suite_hash: str | None = None
+
+
+class SubmissionSchema(BaseModel):
+    """Solution with the compiler to check it with."""
 
     id: str
     code: SolutionSchema
     compiler: str
-    suite: TestSuite
+
+
+class RunRequest(SubmissionSchema, SuiteReference):
+    """Request model."""
+
+
+class RunBatchRequest(SuiteReference):
+    """Request to check many solutions against the same suite."""
+
+    solutions: list[SubmissionSchema]
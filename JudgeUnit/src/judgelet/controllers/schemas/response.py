@@ -1,3 +1,5 @@
+from enum import StrEnum
+
 from pydantic import BaseModel
 
 
@@ -17,6 +19,9 @@ class VerdictSchema(BaseModel):
     codename: str
     is_successful: bool
     details: str
+    cpu_time_s: float | None = None
+    wall_time_s: float | None = None
+    peak_memory_mb: float | None = None
 
 
 class GroupProtocolSchema(BaseModel):
@@ -26,6 +31,8 @@ class GroupProtocolSchema(BaseModel):
     verdicts: list[VerdictSchema]
     is_successful: bool
     verdict: VerdictSchema
+    max_cpu_time_s: float | None = None
+    max_peak_memory_mb: float | None = None
 
 
 class RunResponse(BaseModel):
@@ -36,3 +43,51 @@ class RunResponse(BaseModel):
     group_scores: dict[str, int]
     protocol: dict[str, GroupProtocolSchema]
     compilation_error: str | None = None
+
+
+class BatchItemResponse(BaseModel):
+    """Result of a solution from batch, or why it has none."""
+
+    id: str
+    result: RunResponse | None = None
+    error: str | None = None
+
+
+class ProgressEventType(StrEnum):
+    """What has happened while checking a solution."""
+
+    COMPILED = "compiled"
+    TEST = "test"
+    GROUP = "group"
+    RESULT = "result"
+    ERROR = "error"
+
+
+class ProgressEventSchema(BaseModel):
+    """
+    Progress of checking a solution.
+
+    Only fields related to the event type are set.
+    """
+
+    event: ProgressEventType
+    is_successful: bool | None = None
+    group: str | None = None
+    test: int | None = None
+    verdict: VerdictSchema | None = None
+    protocol: GroupProtocolSchema | None = None
+    result: RunResponse | None = None
+    detail: str | None = None
+
+
+class StatusResponse(BaseModel):
+    """Load and capacity of the judgelet."""
+
+    total_slots: int
+    free_slots: int
+    queue_depth: int
+    running: list[str]
+    average_duration_s: float | None
+    compile_cache_hit_ratio: float | None
+    result_cache_hit_ratio: float | None
+    compilers: list[str]
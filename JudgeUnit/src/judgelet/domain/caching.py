@@ -0,0 +1,51 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from judgelet.domain.files import Workspace
+
+
+class CompileCache(ABC):
+    """Stores compiled artifacts to skip compilation of known code."""
+
+    @abstractmethod
+    async def restore(
+        self,
+        key: str,
+        workspace: Workspace,
+        artifacts: Sequence[str],
+    ) -> bool:
+        """
+        Place cached artifacts into the workspace.
+
+        Args:
+            key: cache key of compilation
+            workspace: where to place artifacts
+            artifacts: names of artifact files
+
+        Returns:
+            True on cache hit, False on miss
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def store(
+        self,
+        key: str,
+        workspace: Workspace,
+        artifacts: Sequence[str],
+    ) -> None:
+        """Save compiled artifacts from the workspace to cache."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def hits(self) -> int:
+        """Count of restores that found artifacts."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def misses(self) -> int:
+        """Count of restores that found nothing."""
+        raise NotImplementedError
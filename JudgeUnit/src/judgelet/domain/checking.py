@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Mapping
 from typing import TYPE_CHECKING, Any
 
-from judgelet.domain.files import FileSystem
+from judgelet.domain.files import Workspace
 from judgelet.domain.results import RunResult, Verdict
 
 if TYPE_CHECKING:
@@ -23,7 +23,7 @@ class Validator[ArgsT](ABC):
         self,
         result: RunResult,
         test_case: "TestCase",
-        output_files: Mapping[str, str],
+        output_files: Mapping[str, bytes],
     ) -> Verdict:
         """Perform checking of the result."""
         raise NotImplementedError
@@ -39,7 +39,7 @@ class PrecompileChecker[ArgsT](ABC):
         self.args = args
 
     @abstractmethod
-    def check(self, filesystem: FileSystem, path: str) -> Verdict:
+    def check(self, workspace: Workspace, path: str) -> Verdict:
         """Perform checking of single file."""
         raise NotImplementedError
 
@@ -1,9 +1,24 @@
-from abc import abstractmethod
-from typing import ClassVar, Protocol, final
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+    Sequence,
+)
+from contextlib import (
+    AbstractContextManager,
+    ExitStack,
+    asynccontextmanager,
+)
+from typing import Any, ClassVar, Protocol, final
 
 from structlog import get_logger
 
-from judgelet.domain.files import FileSystem, Solution
+from judgelet.domain.caching import CompileCache
+from judgelet.domain.files import Blob, Solution, Workspace
 from judgelet.domain.results import RunResult
 from judgelet.domain.sandbox import Sandbox
 
@@ -12,10 +27,33 @@ class LanguageBackend(Protocol):
     """ABC for a language implementation."""
 
     file_ext: ClassVar[str]
+    compile_artifacts: ClassVar[Sequence[str]] = ()
+
+    async def get_compile_cache_key(  # noqa: WPS324
+        self, workspace: Workspace, target_file: str,
+    ) -> str | None:
+        """
+        Get key identifying the result of compilation.
+
+        Key should depend on sources, compiler, its flags and version.
+        Backends that do not produce ``compile_artifacts``
+        return None, so their compilation is never cached.
+        """
+        return None  # noqa: WPS324 (not cacheable by default)
+
+    def describe_toolchain(self) -> str:
+        """
+        Describe compiler or interpreter, its flags and version.
+
+        Results of checking are only reused with the same toolchain.
+        It is called on the event loop, so anything slow should be
+        done once by ``prepare_toolchains`` of the backend factory.
+        """
+        return ""
 
     @abstractmethod
     async def prepare(
-        self, fs: FileSystem, target_file: str, sandbox: Sandbox,
+        self, workspace: Workspace, target_file: str, sandbox: Sandbox,
     ) -> RunResult:
         """Prepare environment."""
         raise NotImplementedError
@@ -23,7 +61,7 @@ class LanguageBackend(Protocol):
     @abstractmethod
     async def compile(
         self,
-        fs: FileSystem,
+        workspace: Workspace,
         target_file: str,
         compile_timeout_s: float,
         sandbox: Sandbox,
@@ -34,31 +72,80 @@ class LanguageBackend(Protocol):
     @abstractmethod
     async def run(
         self,
-        stdin: str,
+        stdin: Blob,
         timeout_s: float,
         mem_limit_mb: float,
         sandbox: Sandbox,
+        wall_timeout_s: float | None = None,
     ) -> RunResult:
         """Run the solution."""
         raise NotImplementedError
 
 
+type RunnerJob[JobResult] = Callable[["SolutionRunner"], Awaitable[JobResult]]
+
+
+class RunnerReplicator(ABC):
+    """Provides extra runners of a solution on free execution slots."""
+
+    @abstractmethod
+    def capture(self, runner: "SolutionRunner") -> None:
+        """
+        Remember the workspace of the runner to create replicas from.
+
+        Called once the solution is compiled and before any test runs,
+        so replicas never inherit files of a test that is in progress.
+        Must be cheap: most solutions never get a replica.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def try_replicate(
+        self, runner: "SolutionRunner",
+    ) -> AbstractContextManager["SolutionRunner"] | None:
+        """
+        Occupy a free slot and create a replica of the runner there.
+
+        Replica has its own copy of the captured workspace and its own
+        sandbox, so it can run tests concurrently with the original runner.
+        Returned context manager
+        must be entered right away, the slot is freed on its exit.
+
+        Returns:
+            replica context or None if there is no free slot
+            or nothing is captured yet
+
+        """
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def is_contended(self) -> bool:
+        """Whether other solutions are waiting for a slot."""
+        raise NotImplementedError
+
+
 @final
 class SolutionRunner:
     """Wrapper for LanguageBackend."""
 
-    def __init__(
+    def __init__(  # noqa: WPS211 (too many args)
         self,
         backend: LanguageBackend,
         solution: Solution,
-        fs: FileSystem,
+        workspace: Workspace,
         sandbox: Sandbox,
+        compile_cache: CompileCache | None = None,
+        replicator: RunnerReplicator | None = None,
     ) -> None:
         """Create wrapper."""
         self.backend = backend
         self.solution = solution
-        self.fs = fs
+        self.workspace = workspace
         self.sandbox = sandbox
+        self.compile_cache = compile_cache
+        self._replicator = replicator
+        self._pool = _RunnerPool(self, replicator)
         self.log = get_logger().bind(solution_id=solution.uid)
 
     async def compile(self, compilation_timeout_s: float) -> RunResult:
@@ -66,26 +153,186 @@ class SolutionRunner:
         self.log.info("Preparing solution")
         main_file_name = self.solution.main_file.name
         result = await self.backend.prepare(
-            self.fs, main_file_name, self.sandbox,
+            self.workspace, main_file_name, self.sandbox,
         )
         if not result.is_successful:
             self.log.info("Preparing failed")
             return result
+        cache_key = await self._get_cache_key(main_file_name)
+        if cache_key is not None and await self._restore(cache_key):
+            self.log.info("Compilation cache hit", key=cache_key)
+            self._capture()
+            return RunResult.blank_ok()
         compile_result = await self.backend.compile(
-            self.fs, main_file_name, compilation_timeout_s, self.sandbox,
+            self.workspace,
+            main_file_name,
+            compilation_timeout_s,
+            self.sandbox,
         )
         if not compile_result.is_successful:
             self.log.info("Compilation failed")
+            return compile_result
+        if cache_key is not None:
+            await self._store(cache_key)
+        self._capture()
         return compile_result
 
     async def run(
         self,
-        stdin: str,
+        stdin: Blob,
         timeout_s: float,
         mem_limit_mb: float,
+        wall_timeout_s: float | None = None,
     ) -> RunResult:
         """Run the solution."""
-        self.log.info("Running for %s", stdin[:32])  # noqa: WPS432
+        self.log.info("Running solution")
         return await self.backend.run(
-            stdin, timeout_s, mem_limit_mb, self.sandbox,
+            stdin, timeout_s, mem_limit_mb, self.sandbox, wall_timeout_s,
+        )
+
+    async def run_concurrently[JobResult](
+        self, jobs: Sequence[RunnerJob[JobResult]],
+    ) -> list[JobResult]:
+        """
+        Run jobs on this runner and on its replicas, if slots are free.
+
+        Runners are shared between all concurrent calls: each job
+        borrows an idle runner, or a new replica if there is none,
+        or waits until some runner is given back. Replicas are dropped
+        as soon as nobody waits for them or another solution waits
+        for a slot, the rest is finished by this runner.
+
+        Returns:
+            results in order of jobs
+
+        """
+        self.log.info("Running %s jobs", len(jobs))
+        return await gather_or_cancel(
+            self._pool.run_job(job) for job in jobs
         )
+
+    def _capture(self) -> None:
+        if self._replicator is not None:
+            self._replicator.capture(self)
+
+    async def _get_cache_key(self, main_file_name: str) -> str | None:
+        if self.compile_cache is None:
+            return None
+        return await self.backend.get_compile_cache_key(
+            self.workspace, main_file_name,
+        )
+
+    async def _restore(self, cache_key: str) -> bool:
+        if self.compile_cache is None:
+            return False
+        return await self.compile_cache.restore(
+            cache_key, self.workspace, self.backend.compile_artifacts,
+        )
+
+    async def _store(self, cache_key: str) -> None:
+        if self.compile_cache is None:
+            return
+        await self.compile_cache.store(
+            cache_key, self.workspace, self.backend.compile_artifacts,
+        )
+
+
+@final
+class _RunnerPool:
+    """Idle runners of a solution shared between concurrent jobs."""
+
+    def __init__(
+        self,
+        origin: SolutionRunner,
+        replicator: RunnerReplicator | None,
+    ) -> None:
+        self.origin = origin
+        self.replicator = replicator
+        self.replicas: dict[SolutionRunner, ExitStack] = {}
+        self.idle_runners: asyncio.Queue[SolutionRunner] = asyncio.Queue()
+        self.idle_runners.put_nowait(origin)
+        self.waiting_jobs = 0
+
+    async def run_job[JobResult](self, job: RunnerJob[JobResult]) -> JobResult:
+        async with self._borrow_runner() as runner:
+            return await job(runner)
+
+    @asynccontextmanager
+    async def _borrow_runner(self) -> AsyncIterator[SolutionRunner]:
+        runner = self._take_idle_runner() or await self._replicate()
+        if runner is None:
+            runner = await self._wait_for_runner()
+        try:
+            yield runner
+        finally:
+            self.idle_runners.put_nowait(runner)
+            self._drop_unneeded_replicas()
+
+    async def _wait_for_runner(self) -> SolutionRunner:
+        self.waiting_jobs += 1
+        try:
+            runner = await self.idle_runners.get()
+        except asyncio.CancelledError:
+            self._stop_waiting()
+            raise
+        self._stop_waiting()
+        return runner
+
+    def _stop_waiting(self) -> None:
+        self.waiting_jobs -= 1
+        self._drop_unneeded_replicas()
+
+    def _take_idle_runner(self) -> SolutionRunner | None:
+        if self.idle_runners.empty():
+            return None
+        return self.idle_runners.get_nowait()
+
+    async def _replicate(self) -> SolutionRunner | None:
+        if self.replicator is None:
+            return None
+        replica_context = await self.replicator.try_replicate(self.origin)
+        if replica_context is None:
+            return None
+        replica_stack = ExitStack()
+        replica = replica_stack.enter_context(replica_context)
+        self.replicas[replica] = replica_stack
+        self.origin.log.info("Replicated runner, %s now", len(self.replicas))
+        return replica
+
+    def _drop_unneeded_replicas(self) -> None:
+        if self.waiting_jobs > 0 and not self._should_yield_slots():
+            return
+        for _ in range(self.idle_runners.qsize()):
+            runner = self.idle_runners.get_nowait()
+            if runner is self.origin:
+                self.idle_runners.put_nowait(runner)
+            else:
+                self.replicas.pop(runner).close()
+
+    def _should_yield_slots(self) -> bool:
+        if self.replicator is None:
+            return False
+        return self.replicator.is_contended
+
+
+async def gather_or_cancel[JobResult](
+    coroutines: Iterable[Coroutine[Any, Any, JobResult]],
+) -> list[JobResult]:
+    """
+    Run coroutines as tasks and wait for all of them.
+
+    If any of them fails or the waiting is cancelled,
+    the rest are cancelled too.
+
+    Returns:
+        results in order of coroutines
+
+    """
+    tasks = [asyncio.create_task(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
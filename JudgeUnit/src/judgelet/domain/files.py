@@ -1,9 +1,10 @@
 """Contains classes related to files and file system."""
 
+import contextlib
 from abc import ABC, abstractmethod
-from collections.abc import Collection, Mapping, Sequence
+from collections.abc import Collection, Iterator, Mapping, Sequence
 from pathlib import Path
-from typing import Any
+from typing import Any, Self, override
 
 from attrs import frozen
 
@@ -16,6 +17,47 @@ class File:
     contents: str
 
 
+class Blob(ABC):
+    """
+    Piece of test data: stdin, input file or expected answer.
+
+    Blob may be kept on disk, in a file at ``path``. Whoever can work
+    with the file directly should prefer it over reading it to memory.
+    """
+
+    @property
+    def path(self) -> Path | None:  # noqa: WPS324
+        """File that holds the data, None if it is kept in memory."""
+        return None  # noqa: WPS324 (kept in memory by default)
+
+    @abstractmethod
+    def read(self) -> bytes:
+        """Read whole data to memory."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def view(self) -> contextlib.AbstractContextManager[memoryview]:
+        """View data without copying it, until the end of the block."""
+        raise NotImplementedError
+
+
+class MemoryBlob(Blob):
+    """Blob that is kept in memory."""
+
+    def __init__(self, contents: bytes) -> None:
+        self.contents = contents
+
+    @override
+    def read(self) -> bytes:
+        return self.contents
+
+    @override
+    @contextlib.contextmanager
+    def view(self) -> Iterator[memoryview]:
+        with memoryview(self.contents) as contents_view:
+            yield contents_view
+
+
 class Solution(ABC):
     """Represents a solution."""
 
@@ -49,17 +91,19 @@ class Solution(ABC):
         return next(file for file in self.files if file.name == filename)
 
 
-class FileSystem(ABC):
-    """File system abstraction."""
+class Workspace(ABC):
+    """
+    Directory that holds files of a single solution.
 
-    @abstractmethod
-    def place_solution(self, solution: Solution) -> Path:
-        """Place all solution files."""
-        raise NotImplementedError
+    Every solution gets its own workspace, so concurrently checked
+    solutions never see each other's files.
 
+    """
+
+    @property
     @abstractmethod
-    def cleanup(self, solution: Solution) -> None:
-        """Remove all solution files and cleanup root."""
+    def path(self) -> Path:
+        """Workspace root directory."""
         raise NotImplementedError
 
     @abstractmethod
@@ -72,6 +116,16 @@ class FileSystem(ABC):
         """Save file (overwrite if needed)."""
         raise NotImplementedError
 
+    @abstractmethod
+    def read_bytes(self, path: str) -> bytes | None:
+        """Get raw contents of file by path, None if it does not exist."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def place_blob(self, path: str, blob: Blob) -> None:
+        """Save blob as file (overwrite if needed)."""
+        raise NotImplementedError
+
     @abstractmethod
     def delete_file(self, filename: str) -> None:
         """
@@ -82,25 +136,90 @@ class FileSystem(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def list_files(self) -> list[str]:
+        """Get paths of all files in workspace, relative to its root."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self) -> None:
+        """Remove all workspace files."""
+        raise NotImplementedError
+
+    def __enter__(self) -> Self:
+        """Use workspace until the end of the block."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[Exception] | None,
+        exc_val: Exception | None,
+        exc_tb: Any,
+    ) -> None:
+        """Remove all workspace files."""
+        self.close()
+
+
+class FileSystem(ABC):
+    """File system abstraction."""
+
+    @abstractmethod
+    def open_workspace(
+        self, solution: Solution, workdir: str | None = None,
+    ) -> Workspace:
+        """
+        Create a workspace and place all solution files into it.
+
+        Args:
+            solution: solution to place.
+            workdir: directory to create workspace in.
+                If not set, file system root is used.
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def clone_workspace(
+        self,
+        workspace: Workspace,
+        workdir: str | None = None,
+        paths: Collection[str] | None = None,
+    ) -> Workspace:
+        """
+        Create a new workspace with a copy of files of another one.
+
+        Args:
+            workspace: workspace to copy.
+            workdir: directory to create workspace in.
+                If not set, file system root is used.
+            paths: files to copy. If not set, all files are copied.
+
+        """
+        raise NotImplementedError
+
 
 class FileIO:
-    """Context manager to safely handle file IO within solution test."""
+    """
+    Context manager to safely handle file IO within solution test.
+
+    Files are moved as raw bytes both ways, nothing is decoded.
+    """
 
     def __init__(
         self,
-        fs: FileSystem,
-        input_files: Mapping[str, str],
+        workspace: Workspace,
+        input_files: Mapping[str, Blob],
         output_files: Collection[str],
     ) -> None:
-        self.fs = fs
+        self.workspace = workspace
         self.input_files = input_files
         self.output_files = output_files
-        self.output_files_data: Mapping[str, str] = {}
+        self.output_files_data: Mapping[str, bytes] = {}
 
     def __enter__(self) -> None:
         """Place input files into solution dir."""
-        for filename, contents in self.input_files.items():
-            self.fs.save_file(File(filename, contents))
+        for filename, blob in self.input_files.items():
+            self.workspace.place_blob(filename, blob)
 
     def __exit__(
         self,
@@ -111,9 +230,8 @@ class FileIO:
         """Load required answer files from solution dir."""
         files = {}
         for filename in self.output_files:
-            file = self.fs.get_file(filename)
-            files[filename] = file.contents if file else ""
-            self.fs.delete_file(filename)
+            files[filename] = self.workspace.read_bytes(filename) or b""
+            self.workspace.delete_file(filename)
         self.output_files_data = files
         for filename in self.input_files:
-            self.fs.delete_file(filename)
+            self.workspace.delete_file(filename)
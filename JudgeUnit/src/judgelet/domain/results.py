@@ -1,6 +1,6 @@
 from enum import Enum
 
-from attrs import frozen
+from attrs import evolve, field, frozen
 
 
 class ExitState(Enum):
@@ -10,21 +10,32 @@ class ExitState(Enum):
     ERROR = 1
     TIME_LIMIT = 2
     MEM_LIMIT = 3
+    OUTPUT_LIMIT = 4
+
+
+@frozen
+class ResourceUsage:
+    """Resources consumed by a single run."""
+
+    cpu_time_s: float
+    wall_time_s: float
+    peak_memory_mb: float
 
 
 @frozen
 class RunResult:
-    """Report about a single run."""
+    """Report about a single run, outputs are raw bytes."""
 
-    stdout: str
-    stderr: str
+    stdout: bytes
+    stderr: bytes
     return_code: int
     state: ExitState
+    usage: ResourceUsage | None = None
 
     @classmethod
     def blank_ok(cls) -> "RunResult":
         """Return default blank successful result."""
-        return RunResult("", "", 0, ExitState.FINISHED)
+        return RunResult(b"", b"", 0, ExitState.FINISHED)
 
     @property
     def is_successful(self) -> bool:
@@ -39,6 +50,11 @@ class Verdict:  # noqa: WPS214
     codename: str
     is_successful: bool
     details: str
+    usage: ResourceUsage | None = field(default=None, eq=False)
+
+    def with_usage(self, usage: ResourceUsage | None) -> "Verdict":
+        """Attach resources used by the run this verdict was given to."""
+        return evolve(self, usage=usage)
 
     @classmethod
     def OK(cls) -> "Verdict":
@@ -60,6 +76,11 @@ class Verdict:  # noqa: WPS214
         """Shorthand for Memory Limit."""
         return Verdict("ML", is_successful=False, details="ML")
 
+    @classmethod
+    def OLE(cls) -> "Verdict":
+        """Shorthand for Output Limit Exceeded."""
+        return Verdict("OLE", is_successful=False, details="OLE")
+
     @classmethod
     def RE(cls, detail: str | None = None) -> "Verdict":
         """Shorthand for Runtime Error."""
@@ -75,6 +96,11 @@ class Verdict:  # noqa: WPS214
         """Shorthand for Precompile Check Fail."""
         return Verdict("PCF", is_successful=False, details=detail or "PCF")
 
+    @classmethod
+    def SKIPPED(cls) -> "Verdict":
+        """Shorthand for a test that was not run."""
+        return Verdict("SKIPPED", is_successful=False, details="SKIPPED")
+
     @classmethod
     def CE(cls, detail: str | None = None) -> "Verdict":
         """Shorthand for Compilation Error."""
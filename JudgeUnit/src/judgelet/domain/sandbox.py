@@ -1,10 +1,12 @@
 import enum
 from abc import ABC, abstractmethod
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 
 from attrs import frozen
 
-from judgelet.domain.files import FileSystem
+from judgelet.domain.files import Blob, Workspace
+from judgelet.domain.results import ResourceUsage
+from judgelet.domain.slots import ExecutionSlot
 
 
 class SandboxExitCause(enum.Enum):
@@ -13,6 +15,7 @@ class SandboxExitCause(enum.Enum):
     PROCESS_EXITED = enum.auto()
     MEMORY_LIMIT_EXCEEDED = enum.auto()
     TIME_LIMIT_EXCEEDED = enum.auto()
+    OUTPUT_LIMIT_EXCEEDED = enum.auto()
 
 
 @frozen
@@ -21,33 +24,51 @@ class SandboxResult:
 
     return_code: int
     cause: SandboxExitCause
-    stdout: str | None = None
-    stderr: str | None = None
+    stdout: bytes | None = None
+    stderr: bytes | None = None
+    usage: ResourceUsage | None = None
 
 
 class Sandbox(ABC):
     """Base sandbox class."""
 
-    def __init__(
+    def __init__(  # noqa: WPS211 (too many args)
         self,
-        fs: FileSystem,
-        sandbox_dir: str,
+        workspace: Workspace,
         encoding: str | None = None,
         environment: Mapping[str, str] | None = None,
+        slot: ExecutionSlot | None = None,
+        output_limit_bytes: int | None = None,
     ) -> None:
-        """Create sandbox at directory."""
-        self.sandbox_dir = sandbox_dir
+        """
+        Create sandbox at workspace directory.
+
+        Output limit caps stdout and stderr of each run, as well as
+        files it writes. Process is interrupted with OLE beyond it,
+        so the judgelet never holds more output than that.
+        """
+        self.workspace = workspace
+        self.sandbox_dir = str(workspace.path)
         self.encoding = encoding
         self.environment = environment
-        self.fs = fs
+        self.slot = slot
+        self.output_limit_bytes = output_limit_bytes
+
+    @property
+    def cpus(self) -> frozenset[int]:
+        """CPUs sandboxed processes should be pinned to."""
+        if self.slot is None:
+            return frozenset()
+        return self.slot.cpus
 
     @abstractmethod
     async def run(
         self,
         cmd: str,
-        proc_input: str,
+        proc_input: Blob,
         timeout_s: float,
         memory_limit_mb: float,
+        wall_timeout_s: float | None = None,
     ) -> SandboxResult:
         """
         Run command in sandbox.
@@ -55,8 +76,10 @@ class Sandbox(ABC):
         Args:
             cmd: target command
             proc_input: process stdin
-            timeout_s: when to interrupt process with TL
+            timeout_s: CPU time after which process gets TL
             memory_limit_mb: when to interrupt process with ML
+            wall_timeout_s: wall time after which an idle process
+                is interrupted with TL, defaults to timeout_s
 
         Returns:
             result of running the command
@@ -64,6 +87,28 @@ class Sandbox(ABC):
         """
         raise NotImplementedError
 
+    async def run_script(  # noqa: WPS211, WPS324
+        self,
+        interpreter: Sequence[str],
+        script: str,
+        proc_input: Blob,
+        timeout_s: float,
+        memory_limit_mb: float,
+        wall_timeout_s: float | None = None,
+    ) -> SandboxResult | None:
+        """
+        Run Python script in a child forked from a warm interpreter.
+
+        Only sandboxes with a zygote of the interpreter support this.
+        Arguments are the same as of :meth:`run`.
+
+        Returns:
+            result of running the script, or None if the sandbox
+            could not fork it, then it should be run as a command
+
+        """
+        return None  # noqa: WPS324 (no zygote by default)
+
     @abstractmethod
     def close(self) -> None:
         """Destroy the sandbox, but preserve temp files."""
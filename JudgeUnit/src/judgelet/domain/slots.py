@@ -0,0 +1,21 @@
+from attrs import frozen
+
+
+@frozen
+class ExecutionSlot:
+    """
+    A single unit of judgelet capacity.
+
+    Only one solution at a time is executed in a slot.
+
+    Args:
+        index: slot number, unique within a judgelet.
+        cpus: CPUs processes of this slot are pinned to.
+            Empty set means no pinning.
+        workdir: directory where solutions of this slot are placed.
+
+    """
+
+    index: int
+    cpus: frozenset[int]
+    workdir: str
@@ -1,48 +1,86 @@
 from collections.abc import Collection, Mapping, Sequence
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Final
 
 from attrs import frozen
 
 from judgelet.domain.execution import SolutionRunner
-from judgelet.domain.files import FileIO
+from judgelet.domain.files import Blob, FileIO
 from judgelet.domain.results import ExitState, RunResult, Verdict
 
 if TYPE_CHECKING:
     from judgelet.domain.checking import Validator
 
+_WALL_TIME_FACTOR: Final = 2
+_WALL_TIME_MIN_SLACK_S: Final = 1
+_PREVIEW_BYTES: Final = 1024
+
 
 @frozen
 class TestCase:
-    """Represents a single test case."""
+    """
+    Represents a single test case.
+
+    Stdin and files are blobs, they reach the solution as they are.
+    """
 
-    stdin: str
+    stdin: Blob
     time_limit_s: float
     memory_limit_mb: float
-    input_files: Mapping[str, str]
+    input_files: Mapping[str, Blob]
     output_files: Collection[str]
     validators: Sequence["Validator[Any]"]
+    wall_time_limit_s: float | None = None
+
+    @property
+    def effective_wall_time_limit_s(self) -> float:
+        """
+        Wall time limit of the case.
+
+        If not set explicitly, it is looser than the CPU time limit,
+        so that a busy host does not turn correct solutions into TL.
+        """
+        if self.wall_time_limit_s is not None:
+            return self.wall_time_limit_s
+        return max(
+            self.time_limit_s * _WALL_TIME_FACTOR,
+            self.time_limit_s + _WALL_TIME_MIN_SLACK_S,
+        )
 
     async def run(self, runner: SolutionRunner) -> Verdict:
         """Run the solution and check the answer."""
-        file_io = FileIO(runner.fs, self.input_files, self.output_files)
+        file_io = FileIO(
+            runner.workspace, self.input_files, self.output_files,
+        )
         with file_io:
             result = await runner.run(
                 self.stdin,
                 self.time_limit_s,
                 self.memory_limit_mb,
+                self.effective_wall_time_limit_s,
             )
+        return self._judge(
+            result, file_io.output_files_data,
+        ).with_usage(result.usage)
+
+    def _judge(
+        self,
+        result: RunResult,
+        output_files: Mapping[str, bytes],
+    ) -> Verdict:
         if result.state == ExitState.MEM_LIMIT:
             return Verdict.ML()
         if result.state == ExitState.TIME_LIMIT:
             return Verdict.TL()
+        if result.state == ExitState.OUTPUT_LIMIT:
+            return Verdict.OLE()
         if not result.is_successful:
             return Verdict.RE(_get_error_message(result))
-        return self._perform_validation(result, file_io.output_files_data)
+        return self._perform_validation(result, output_files)
 
     def _perform_validation(
         self,
         result: RunResult,
-        output_files: Mapping[str, str],
+        output_files: Mapping[str, bytes],
     ) -> Verdict:
         """Get first validator error or OK."""
         verdicts = (
@@ -62,7 +100,15 @@ def _get_error_message(result: RunResult) -> str:
     return (
         f"-- code {result.return_code} --\n"
         f"-- stdout --\n"
-        f"{result.stdout}\n\n"
+        f"{_preview(result.stdout)}\n\n"
         f"-- stderr --\n"
-        f"{result.stderr}\n\n"
+        f"{_preview(result.stderr)}\n\n"
     )
+
+
+def _preview(output: bytes) -> str:
+    head = output[:_PREVIEW_BYTES].decode(errors="replace")
+    if len(output) <= _PREVIEW_BYTES:
+        return head
+    omitted = len(output) - _PREVIEW_BYTES
+    return f"{head}\n... ({omitted} more bytes)"
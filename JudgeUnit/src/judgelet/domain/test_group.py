@@ -1,14 +1,19 @@
+import asyncio
+import functools
 from abc import abstractmethod
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from operator import attrgetter
-from typing import Protocol
+from typing import ClassVar, Protocol, final
 
 from attrs import frozen
 
-from judgelet.domain.execution import SolutionRunner
+from judgelet.domain.execution import RunnerJob, SolutionRunner
 from judgelet.domain.results import Verdict
 from judgelet.domain.test_case import TestCase
 
+type VerdictListener = Callable[[int, Verdict], None]
+"""Gets index of a test in its group and verdict as soon as it is run."""
+
 
 @frozen
 class GroupProtocol:
@@ -27,6 +32,30 @@ class GroupProtocol:
         """
         return all(map(attrgetter("is_successful"), self.verdicts))
 
+    @property
+    def max_cpu_time_s(self) -> float | None:
+        """Maximum CPU time used by a test of the group."""
+        return max(
+            (
+                verdict.usage.cpu_time_s
+                for verdict in self.verdicts
+                if verdict.usage is not None
+            ),
+            default=None,
+        )
+
+    @property
+    def max_peak_memory_mb(self) -> float | None:
+        """Maximum peak memory used by a test of the group."""
+        return max(
+            (
+                verdict.usage.peak_memory_mb
+                for verdict in self.verdicts
+                if verdict.usage is not None
+            ),
+            default=None,
+        )
+
     @property
     def verdict(self) -> Verdict:
         """
@@ -44,6 +73,9 @@ class GroupProtocol:
 class ScoringPolicy(Protocol):
     """Determines how many points should a solution get."""
 
+    is_fail_fast: ClassVar[bool] = False
+    """Whether tests after the first failed one cannot change the score."""
+
     @abstractmethod
     def get_score(self, full_score: int, verdicts: Sequence[Verdict]) -> int:
         """Get a score based on how many tests of a group passed."""
@@ -59,15 +91,97 @@ class TestGroup:
     full_score: int
     scoring_policy: ScoringPolicy
 
-    async def run(self, runner: SolutionRunner) -> GroupProtocol:
-        """Run test group."""
-        verdicts: list[Verdict] = []
-        passed_count = 0
-        for case in self.test_cases:
-            case_verdict = await case.run(runner)  # noqa: WPS476
-            verdicts.append(case_verdict)
-            passed_count += case_verdict.is_successful
+    async def run(
+        self,
+        runner: SolutionRunner,
+        on_verdict: VerdictListener | None = None,
+    ) -> GroupProtocol:
+        """
+        Run test group.
+
+        If the scoring policy is fail-fast, tests after the first failed
+        one are not run (or cancelled, if already running) and get
+        SKIPPED verdict, so the protocol still has a verdict per test.
+        Skipped tests are not reported to ``on_verdict``.
+        """
+        jobs = [
+            case.run if on_verdict is None
+            else functools.partial(
+                _run_case, case, functools.partial(on_verdict, index),
+            )
+            for index, case in enumerate(self.test_cases)
+        ]
+        if self.scoring_policy.is_fail_fast:
+            verdicts = await _FailFastRun(jobs).run(runner)
+        else:
+            verdicts = await runner.run_concurrently(jobs)
         return GroupProtocol(
             self.scoring_policy.get_score(self.full_score, verdicts),
             verdicts,
         )
+
+
+@final
+class _FailFastRun:
+    """Runs cases of a group until the first failure."""
+
+    def __init__(self, jobs: Sequence[RunnerJob[Verdict]]) -> None:
+        self.jobs = jobs
+        self.first_failure: int | None = None
+        self.running: dict[int, asyncio.Future[Verdict]] = {}
+
+    async def run(self, runner: SolutionRunner) -> list[Verdict]:
+        verdicts = await runner.run_concurrently([
+            functools.partial(self._run_case, index)
+            for index in range(len(self.jobs))
+        ])
+        # cases after the failure might have finished before it,
+        # skip them anyway, so the protocol does not depend on timing
+        return [
+            Verdict.SKIPPED() if self._is_skipped(index) else verdict
+            for index, verdict in enumerate(verdicts)
+        ]
+
+    async def _run_case(
+        self, index: int, runner: SolutionRunner,
+    ) -> Verdict:
+        if self._is_skipped(index):
+            return Verdict.SKIPPED()
+        case_run = asyncio.ensure_future(self.jobs[index](runner))
+        self.running[index] = case_run
+        try:
+            verdict = await case_run
+        except asyncio.CancelledError:
+            if _is_cancelled_from_outside():
+                raise
+            return Verdict.SKIPPED()
+        finally:
+            del self.running[index]  # noqa: WPS420 (forget finished run)
+        if not verdict.is_successful:
+            self._fail(index)
+        return verdict
+
+    def _is_skipped(self, index: int) -> bool:
+        return self.first_failure is not None and index > self.first_failure
+
+    def _fail(self, index: int) -> None:
+        if self.first_failure is None or index < self.first_failure:
+            self.first_failure = index
+        for running_index, case_run in self.running.items():
+            if self._is_skipped(running_index):
+                case_run.cancel()
+
+
+async def _run_case(
+    case: TestCase,
+    report: Callable[[Verdict], None],
+    runner: SolutionRunner,
+) -> Verdict:
+    verdict = await case.run(runner)
+    report(verdict)
+    return verdict
+
+
+def _is_cancelled_from_outside() -> bool:
+    current_task = asyncio.current_task()
+    return current_task is not None and current_task.cancelling() > 0
@@ -1,13 +1,23 @@
+import asyncio
+import functools
 from collections.abc import Mapping, Sequence
-from typing import Any
+from typing import Any, Final
 
 from attrs import frozen
 
 from judgelet.domain.checking import PrecompileChecker
-from judgelet.domain.execution import SolutionRunner
+from judgelet.domain.execution import SolutionRunner, gather_or_cancel
+from judgelet.domain.files import Solution, Workspace
 from judgelet.domain.results import ExitState, RunResult, Verdict
 from judgelet.domain.test_group import GroupProtocol, TestGroup
 
+_COMPILER_MEMORY_LIMIT: Final = "compiler memory limit"
+_COMPILER_TIME_LIMIT: Final = "compiler time limit"
+_LOAD_DEPENDENT_ERRORS: Final = frozenset((
+    _COMPILER_MEMORY_LIMIT, _COMPILER_TIME_LIMIT,
+))
+_LOAD_DEPENDENT_VERDICTS: Final = frozenset(("TL", "ML"))
+
 
 @frozen
 class SuiteResult:
@@ -27,6 +37,41 @@ class SuiteResult:
             for group_name, protocol in self.protocol.items()
         }
 
+    @property
+    def is_reproducible(self) -> bool:
+        """
+        Whether checking the solution again surely gives the same result.
+
+        Time and memory limits are not, as they are hit depending on
+        the load of the machine, the same goes for the compiler.
+        """
+        if self.compilation_error in _LOAD_DEPENDENT_ERRORS:
+            return False
+        verdicts = [self.verdict]
+        for protocol in self.protocol.values():
+            verdicts.extend(protocol.verdicts)
+        return all(
+            verdict.codename not in _LOAD_DEPENDENT_VERDICTS
+            for verdict in verdicts
+        )
+
+
+class ProgressListener:
+    """Gets notified as checking of a solution goes on, ignores it all."""
+
+    def on_compiled(self, result: RunResult) -> None:
+        """Solution is compiled, successfully or not."""
+
+    def on_test_finished(
+        self, group_name: str, test_index: int, verdict: Verdict,
+    ) -> None:
+        """Test of a group is run."""
+
+    def on_group_finished(
+        self, group_name: str, protocol: GroupProtocol,
+    ) -> None:
+        """All tests of a group are run."""
+
 
 @frozen
 class TestSuite:
@@ -38,26 +83,70 @@ class TestSuite:
     test_group_dependencies: Mapping[str, Sequence[str]]
     additional_files: Mapping[str, str]
     envs: Mapping[str, str]
+    cache_results: bool = True
+
+    async def run(
+        self,
+        runner: SolutionRunner,
+        listener: ProgressListener | None = None,
+    ) -> SuiteResult:
+        """
+        Compile the solution and run groups.
 
-    async def run(self, runner: SolutionRunner) -> SuiteResult:
-        """Run groups sequentially."""
-        result = await runner.compile(self.compilation_timeout_s)
+        Groups form a dependency graph: each group starts as soon
+        as all groups it depends on have passed, independent groups
+        run concurrently. A group is not run at all if any of its
+        dependencies failed, is unknown or is part of a cycle.
+        Listener, if given, is notified of progress as it happens.
+
+        Precompile checks run in a thread while the solution compiles,
+        if any of them fails, compilation is cancelled and PCF is given.
+        """
+        listener = listener or ProgressListener()
+        compilation = asyncio.create_task(
+            runner.compile(self.compilation_timeout_s),
+        )
+        try:
+            verdict = await self._check_sources(runner)
+        except BaseException:
+            await _cancel(compilation)
+            raise
+        if not verdict.is_successful:
+            await _cancel(compilation)
+            return _get_pcf_result(verdict)
+        result = await compilation
+        listener.on_compiled(result)
         if not result.is_successful:
             return _get_suite_result_on_compilation_error(result)
+        return self._summarize(await self._run_groups(runner, listener))
+
+    async def _check_sources(self, runner: SolutionRunner) -> Verdict:
+        if not self.precompile_checks:
+            return Verdict.OK()
+        return await asyncio.to_thread(
+            _run_precompile_checks,
+            self.precompile_checks,
+            runner.solution,
+            runner.workspace,
+        )
+
+    def _summarize(
+        self, outcomes: Mapping[str, GroupProtocol | None],
+    ) -> SuiteResult:
         protocol: dict[str, GroupProtocol] = {}
         total_score: int = 0
         is_successful: bool = True
         verdict = Verdict.OK()
         for group in self.test_groups:
-            if self._have_dependencies_passed(group.name, protocol):
-                group_protocol = await group.run(runner)  # noqa: WPS476
-                protocol[group.name] = group_protocol
-                total_score += group_protocol.score
-                is_successful = is_successful and group_protocol.is_successful
-                if not group_protocol.is_successful:
-                    verdict = group_protocol.verdict
-            else:
+            group_protocol = outcomes.get(group.name)
+            if group_protocol is None:
                 is_successful = False
+                continue
+            protocol[group.name] = group_protocol
+            total_score += group_protocol.score
+            is_successful = is_successful and group_protocol.is_successful
+            if not group_protocol.is_successful:
+                verdict = group_protocol.verdict
         return SuiteResult(
             is_successful=is_successful,
             score=total_score,
@@ -65,27 +154,106 @@ class TestSuite:
             verdict=verdict,
         )
 
-    def _have_dependencies_passed(
-        self, group_name: str, protocol: dict[str, GroupProtocol],
-    ) -> bool:
-        if group_name not in self.test_group_dependencies:
-            return True
-        group_deps = self.test_group_dependencies[group_name]
-        return all(
-            dep_name in protocol and protocol[dep_name].is_successful
-            for dep_name in group_deps
+    async def _run_groups(
+        self, runner: SolutionRunner, listener: ProgressListener,
+    ) -> dict[str, GroupProtocol | None]:
+        runnable = self._find_runnable_groups()
+        loop = asyncio.get_running_loop()
+        outcomes: dict[str, asyncio.Future[GroupProtocol | None]] = {
+            group_name: loop.create_future() for group_name in runnable
+        }
+        await gather_or_cancel(
+            self._run_group_after_dependencies(
+                group, runner, listener, outcomes,
+            )
+            for group in self.test_groups
+            if group.name in runnable
+        )
+        return {
+            group_name: outcome.result()
+            for group_name, outcome in outcomes.items()
+        }
+
+    async def _run_group_after_dependencies(
+        self,
+        group: TestGroup,
+        runner: SolutionRunner,
+        listener: ProgressListener,
+        outcomes: Mapping[str, "asyncio.Future[GroupProtocol | None]"],
+    ) -> None:
+        outcome = outcomes[group.name]
+        dependencies = [
+            outcomes[dep_name]
+            for dep_name in self.test_group_dependencies.get(group.name, ())
+        ]
+        for finished in asyncio.as_completed(dependencies):
+            dep_protocol = await finished  # noqa: WPS476
+            if dep_protocol is None or not dep_protocol.is_successful:
+                outcome.set_result(None)
+                return
+        protocol = await group.run(
+            runner, functools.partial(listener.on_test_finished, group.name),
         )
+        listener.on_group_finished(group.name, protocol)
+        outcome.set_result(protocol)
+
+    def _find_runnable_groups(self) -> set[str]:
+        pending = {group.name for group in self.test_groups}
+        runnable: set[str] = set()
+        is_changed = True
+        while is_changed:
+            ready = {
+                group_name
+                for group_name in pending
+                if all(
+                    dep_name in runnable
+                    for dep_name in self.test_group_dependencies.get(
+                        group_name, (),
+                    )
+                )
+            }
+            runnable |= ready
+            pending -= ready
+            is_changed = bool(ready)
+        return runnable
+
+
+def _run_precompile_checks(
+    checks: Sequence[PrecompileChecker[Any]],
+    solution: Solution,
+    workspace: Workspace,
+) -> Verdict:
+    for checker in checks:
+        for solution_file in solution.files:
+            verdict = checker.check(workspace, solution_file.name)
+            if not verdict.is_successful:
+                return verdict
+    return Verdict.OK()
+
+
+async def _cancel(task: "asyncio.Task[Any]") -> None:
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def _get_pcf_result(verdict: Verdict) -> SuiteResult:
+    return SuiteResult(
+        is_successful=False,
+        score=0,
+        protocol={},
+        verdict=verdict,
+    )
 
 
 def _get_suite_result_on_compilation_error(error: RunResult) -> SuiteResult:
     if error.state == ExitState.MEM_LIMIT:
-        return _get_err_result("compiler memory limit")
+        return _get_err_result(_COMPILER_MEMORY_LIMIT)
     if error.state == ExitState.TIME_LIMIT:
-        return _get_err_result("compiler time limit")
-    return _get_err_result(
-        f"-- compilation error --\n\n"
-        f"{error.stderr}",
-    )
+        return _get_err_result(_COMPILER_TIME_LIMIT)
+    if error.state == ExitState.OUTPUT_LIMIT:
+        return _get_err_result("compiler output limit")
+    stderr = error.stderr.decode(errors="replace")
+    return _get_err_result(f"-- compilation error --\n\n{stderr}")
 
 
 def _get_err_result(err: str) -> SuiteResult:
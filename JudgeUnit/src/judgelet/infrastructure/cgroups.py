@@ -0,0 +1,161 @@
+"""Helpers to work with cgroup v2 hierarchy."""
+
+import asyncio
+import contextlib
+import os
+import sys
+import uuid
+from pathlib import Path
+from typing import Final
+
+from attrs import frozen
+from structlog import get_logger
+
+_CGROUP_MOUNT: Final = Path("/sys/fs/cgroup")
+_CONTROLLERS: Final = ("memory", "pids", "cpu")
+_ENABLE_CONTROLLERS: Final = "+memory +pids +cpu"
+_SUPERVISOR_GROUP: Final = "judgelet"
+_CPU_PERIOD_US: Final = 100000
+_USEC_IN_S: Final = 1000000
+_MB: Final = 1024 * 1024
+_RMDIR_ATTEMPTS: Final = 50
+_RMDIR_DELAY_S: Final = 0.01
+_CPU_CHECK_MIN_INTERVAL_S: Final = 0.01
+
+log = get_logger()
+
+
+@frozen
+class GroupUsage:
+    """Resources consumed by all processes of a group."""
+
+    cpu_time_s: float
+    peak_memory_bytes: int
+    oom_killed: bool
+
+
+class CgroupTree:
+    """Delegated cgroup v2 subtree where transient run groups live."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    @classmethod
+    def discover(cls) -> "CgroupTree | None":
+        """
+        Find and prepare a cgroup subtree writable by judgelet.
+
+        Judgelet process is moved into a leaf group, because cgroup v2
+        does not allow to delegate controllers from a group that has
+        processes in it.
+
+        Returns:
+            cgroup tree or None if cgroups are not delegated to judgelet
+
+        """
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            root = _prepare_delegated_root()
+        except OSError as exc:
+            log.warning("Cgroups are not delegated", error=str(exc))
+            return None
+        return cls(root)
+
+    def create_group(self, memory_limit_mb: float, pids_limit: int) -> Path:
+        """Create new transient group limited to a single CPU."""
+        run_id = uuid.uuid4().hex
+        group = self.root / f"run_{run_id}"
+        group.mkdir()
+        try:
+            _limit_group(group, memory_limit_mb, pids_limit)
+        except OSError:
+            group.rmdir()
+            raise
+        return group
+
+
+def read_usage(group: Path) -> GroupUsage:
+    """Read resource usage of a group."""
+    cpu_stat = _read_flat_keyed(group / "cpu.stat")
+    events = _read_flat_keyed(group / "memory.events")
+    peak_file = group / "memory.peak"
+    peak = int(peak_file.read_text()) if peak_file.exists() else 0
+    return GroupUsage(
+        cpu_time_s=cpu_stat.get("usage_usec", 0) / _USEC_IN_S,
+        peak_memory_bytes=peak,
+        oom_killed=events.get("oom_kill", 0) > 0,
+    )
+
+
+async def kill_on_cpu_limit(group: Path, cpu_limit_s: float) -> None:
+    """
+    Kill every process of a group as soon as it exceeds CPU time limit.
+
+    Group uses at most one CPU, so its CPU time grows no faster than
+    wall time, and it is enough to check it again after the rest
+    of the limit passes. Runs until the group is killed or cancelled.
+    """
+    while True:
+        cpu_stat = _read_flat_keyed(group / "cpu.stat")
+        remaining_s = cpu_limit_s - cpu_stat.get("usage_usec", 0) / _USEC_IN_S
+        if remaining_s < 0:
+            with contextlib.suppress(OSError):
+                (group / "cgroup.kill").write_text("1")
+            return
+        await asyncio.sleep(max(remaining_s, _CPU_CHECK_MIN_INTERVAL_S))
+
+
+async def destroy_group(group: Path) -> None:
+    """Kill every process of a group and remove it."""
+    with contextlib.suppress(OSError):
+        (group / "cgroup.kill").write_text("1")
+    for _ in range(_RMDIR_ATTEMPTS):
+        try:
+            os.rmdir(group)
+        except OSError:
+            await asyncio.sleep(_RMDIR_DELAY_S)  # noqa: WPS476
+        else:
+            return
+    log.warning("Could not remove cgroup", group=str(group))
+
+
+def _prepare_delegated_root() -> Path:
+    root = _own_cgroup()
+    available = (root / "cgroup.controllers").read_text().split()
+    if not all(name in available for name in _CONTROLLERS):
+        raise OSError(f"some of {_CONTROLLERS} controllers are missing")
+    _move_processes_to_leaf(root)
+    (root / "cgroup.subtree_control").write_text(_ENABLE_CONTROLLERS)
+    return root
+
+
+def _own_cgroup() -> Path:
+    for line in Path("/proc/self/cgroup").read_text().splitlines():
+        hierarchy, _, path = line.split(":", maxsplit=2)
+        if hierarchy == "0":
+            return _CGROUP_MOUNT / path.lstrip("/")
+    raise OSError("cgroup v2 hierarchy is not mounted")
+
+
+def _move_processes_to_leaf(root: Path) -> None:
+    leaf = root / _SUPERVISOR_GROUP
+    leaf.mkdir(exist_ok=True)
+    for pid in (root / "cgroup.procs").read_text().split():
+        with contextlib.suppress(ProcessLookupError):
+            (leaf / "cgroup.procs").write_text(pid)
+
+
+def _limit_group(group: Path, memory_limit_mb: float, pids_limit: int) -> None:
+    memory_limit = int(memory_limit_mb * _MB)
+    (group / "memory.max").write_text(str(memory_limit))
+    swap_max = group / "memory.swap.max"
+    if swap_max.exists():
+        swap_max.write_text("0")
+    (group / "pids.max").write_text(str(pids_limit))
+    (group / "cpu.max").write_text(f"{_CPU_PERIOD_US} {_CPU_PERIOD_US}")
+
+
+def _read_flat_keyed(path: Path) -> dict[str, int]:
+    pairs = (line.split() for line in path.read_text().splitlines())
+    return {key: int(amount) for key, amount in pairs}
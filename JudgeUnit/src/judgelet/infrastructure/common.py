@@ -1,16 +1,34 @@
 from types import MappingProxyType
 
-from judgelet.domain.results import ExitState
-from judgelet.domain.sandbox import SandboxExitCause
+from judgelet.domain.results import ExitState, RunResult
+from judgelet.domain.sandbox import SandboxExitCause, SandboxResult
+from judgelet.infrastructure.encoding import try_to_decode
 
 _CAUSE_TO_STATE = MappingProxyType({
     0: ExitState.FINISHED,
     SandboxExitCause.PROCESS_EXITED: ExitState.FINISHED,
     SandboxExitCause.TIME_LIMIT_EXCEEDED: ExitState.TIME_LIMIT,
     SandboxExitCause.MEMORY_LIMIT_EXCEEDED: ExitState.MEM_LIMIT,
+    SandboxExitCause.OUTPUT_LIMIT_EXCEEDED: ExitState.OUTPUT_LIMIT,
 })
 
 
 def map_sandbox_cause_to_exit_state(cause: SandboxExitCause) -> ExitState:
     """Get exit state cause."""
     return _CAUSE_TO_STATE.get(cause, ExitState.ERROR)
+
+
+def create_compilation_error(result: SandboxResult) -> RunResult:
+    """Report both outputs of a failed compiler."""
+    stdout = try_to_decode(result.stdout)
+    stderr = try_to_decode(result.stderr)
+    report = (
+        f"stdout >>>>>\n{stdout}\n\n"
+        f"stderr >>>>>\n{stderr}"
+    ).encode()
+    return RunResult(
+        stdout=report,
+        stderr=report,
+        return_code=result.return_code,
+        state=ExitState.ERROR,
+    )
@@ -0,0 +1,167 @@
+"""Content-addressed cache of compiled artifacts."""
+
+import asyncio
+import json
+import os
+import shutil
+import uuid
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Final, override
+
+from structlog import get_logger
+
+from judgelet.domain.caching import CompileCache
+from judgelet.domain.files import Workspace
+from judgelet.infrastructure.toolchain import hash_file
+
+_CHECKSUMS_FILE: Final = "checksums.json"
+_TMP_PREFIX: Final = ".tmp_"
+_MB: Final = 1024 * 1024
+
+
+class DiskCompileCache(CompileCache):
+    """
+    Compile cache on the local disk.
+
+    Entries are evicted in LRU order once the quota is exceeded.
+    Artifacts are copied into workspaces, never linked: sandboxed code
+    could otherwise rewrite the cached file itself. Each entry is still
+    checked against its checksums before it is handed out.
+    Zero quota disables the cache.
+    """
+
+    def __init__(self, root: str, quota_mb: float) -> None:
+        self.root = Path(root)
+        self.quota_bytes = int(quota_mb * _MB)
+        self.log = get_logger()
+        self._hits = 0
+        self._misses = 0
+        if self.is_enabled:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._remove_unfinished_entries()
+
+    @property
+    def is_enabled(self) -> bool:
+        """Whether the cache stores anything."""
+        return self.quota_bytes > 0
+
+    @property
+    @override
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    @override
+    def misses(self) -> int:
+        return self._misses
+
+    @override
+    async def restore(
+        self,
+        key: str,
+        workspace: Workspace,
+        artifacts: Sequence[str],
+    ) -> bool:
+        if not self.is_enabled:
+            return False
+        try:
+            is_restored = await asyncio.to_thread(
+                self._restore, key, workspace.path, artifacts,
+            )
+        except OSError as exc:
+            self.log.warning("Could not restore from cache", error=str(exc))
+            is_restored = False
+        if is_restored:
+            self._hits += 1
+        else:
+            self._misses += 1
+        return is_restored
+
+    @override
+    async def store(
+        self,
+        key: str,
+        workspace: Workspace,
+        artifacts: Sequence[str],
+    ) -> None:
+        if not self.is_enabled:
+            return
+        try:
+            await asyncio.to_thread(
+                self._store, key, workspace.path, artifacts,
+            )
+        except OSError as exc:
+            self.log.warning("Could not store to cache", error=str(exc))
+
+    def _restore(
+        self, key: str, target: Path, artifacts: Sequence[str],
+    ) -> bool:
+        entry = self.root / key
+        checksums_file = entry / _CHECKSUMS_FILE
+        if not checksums_file.exists():
+            return False
+        checksums = json.loads(checksums_file.read_text())
+        if set(checksums) != set(artifacts):
+            return False
+        is_intact = all(
+            hash_file(entry / name) == checksum
+            for name, checksum in checksums.items()
+        )
+        if not is_intact:
+            self.log.warning("Dropping corrupted cache entry", key=key)
+            shutil.rmtree(entry, ignore_errors=True)
+            return False
+        for name in artifacts:
+            (target / name).unlink(missing_ok=True)
+            shutil.copy2(entry / name, target / name)
+        os.utime(entry)
+        return True
+
+    def _store(
+        self, key: str, source: Path, artifacts: Sequence[str],
+    ) -> None:
+        entry = self.root / key
+        if entry.exists():
+            return
+        entry_id = uuid.uuid4().hex
+        unfinished = self.root / f"{_TMP_PREFIX}{entry_id}"
+        unfinished.mkdir()
+        checksums = {}
+        for name in artifacts:
+            shutil.copy2(source / name, unfinished / name)
+            checksums[name] = hash_file(unfinished / name)
+        (unfinished / _CHECKSUMS_FILE).write_text(json.dumps(checksums))
+        try:
+            unfinished.rename(entry)
+        except OSError:
+            # same code was compiled and stored concurrently
+            shutil.rmtree(unfinished, ignore_errors=True)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(
+            (
+                path for path in self.root.iterdir()
+                if not path.name.startswith(_TMP_PREFIX)
+            ),
+            key=lambda path: path.stat().st_mtime,
+        )
+        sizes = [_get_dir_size(entry) for entry in entries]
+        total_size = sum(sizes)
+        for entry, size in zip(entries, sizes, strict=True):
+            if total_size <= self.quota_bytes:
+                return
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+            self.log.info("Evicted cache entry", key=entry.name)
+
+    def _remove_unfinished_entries(self) -> None:
+        for path in self.root.glob(f"{_TMP_PREFIX}*"):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _get_dir_size(path: Path) -> int:
+    return sum(
+        child.stat().st_size for child in path.iterdir() if child.is_file()
+    )
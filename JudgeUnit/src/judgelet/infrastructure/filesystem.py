@@ -1,9 +1,17 @@
 import os
 import shutil
+import uuid
+from collections.abc import Collection
 from pathlib import Path
 from typing import override
 
-from judgelet.domain.files import File, FileSystem, Solution
+from judgelet.domain.files import (
+    Blob,
+    File,
+    FileSystem,
+    Solution,
+    Workspace,
+)
 
 
 class RealFileSystem(FileSystem):
@@ -11,55 +19,99 @@ class RealFileSystem(FileSystem):
 
     def __init__(self, root: str = "solutions") -> None:
         self.root = root
-        self.solution: Solution | None = None
         self._ensure_root_exists()
 
     @override
-    def place_solution(self, solution: Solution) -> Path:
-        root = self._solution_root(solution.uid)
+    def open_workspace(
+        self, solution: Solution, workdir: str | None = None,
+    ) -> Workspace:
+        root = Path(workdir or self.root, f"s_{solution.uid}")
         if root.exists():
             _delete(root)
         root.mkdir(parents=True)
-        self.solution = solution
+        workspace = RealWorkspace(root)
         for solution_file in solution.files:
-            self.save_file(solution_file)
-        return root
+            workspace.save_file(solution_file)
+        return workspace
 
     @override
-    def cleanup(self, solution: Solution) -> None:
-        if not self.solution:
-            return
-        _delete(self._solution_root(solution.uid))
-        self.solution = None
+    def clone_workspace(
+        self,
+        workspace: Workspace,
+        workdir: str | None = None,
+        paths: Collection[str] | None = None,
+    ) -> Workspace:
+        origin_name = workspace.path.name
+        clone_id = uuid.uuid4().hex
+        root = Path(workdir or self.root, f"{origin_name}_{clone_id}")
+        root.parent.mkdir(parents=True, exist_ok=True)
+        if paths is None:
+            shutil.copytree(workspace.path, root)
+        else:
+            root.mkdir()
+            for path in paths:
+                target = Path(root, path)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(Path(workspace.path, path), target)
+        return RealWorkspace(root)
+
+    def _ensure_root_exists(self) -> None:
+        Path(self.root).mkdir(exist_ok=True, parents=True)
+
+
+class RealWorkspace(Workspace):
+    """Workspace backed by a real directory."""
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+
+    @override
+    @property
+    def path(self) -> Path:
+        return self._root
 
     @override
     def get_file(self, path: str) -> File | None:
-        if not self.solution:
-            return None
-        file_path = Path(self._solution_root(self.solution.uid), path)
+        file_path = Path(self._root, path)
         if not file_path.exists():
             return None
         return File(path, file_path.read_text())
 
     @override
     def save_file(self, file: File) -> None:
-        if not self.solution:
-            return
-        file_path = Path(self._solution_root(self.solution.uid), file.name)
+        file_path = Path(self._root, file.name)
         file_path.write_text(file.contents)
 
+    @override
+    def read_bytes(self, path: str) -> bytes | None:
+        file_path = Path(self._root, path)
+        if not file_path.exists():
+            return None
+        return file_path.read_bytes()
+
+    @override
+    def place_blob(self, path: str, blob: Blob) -> None:
+        target = Path(self._root, path)
+        if blob.path is None:
+            target.write_bytes(blob.read())
+        else:
+            shutil.copyfile(blob.path, target)
+
     @override
     def delete_file(self, filename: str) -> None:
-        if not self.solution:
-            return
-        file_path = Path(self._solution_root(self.solution.uid), filename)
-        _delete(file_path)
+        _delete(Path(self._root, filename))
 
-    def _ensure_root_exists(self) -> None:
-        Path(self.root).mkdir(exist_ok=True, parents=True)
+    @override
+    def list_files(self) -> list[str]:
+        return [
+            str(path.relative_to(self._root))
+            for path in self._root.rglob("*")
+            if path.is_file()
+        ]
 
-    def _solution_root(self, uid: str) -> Path:
-        return Path(self.root, f"s_{uid}")
+    @override
+    def close(self) -> None:
+        _delete(self._root)
 
 
 def _delete(path: Path) -> None:
@@ -1,74 +1,117 @@
-from typing import Final, override
+import asyncio
+from collections.abc import Sequence
+from typing import ClassVar, Final, override
 
 from judgelet.domain.execution import LanguageBackend
-from judgelet.domain.files import FileSystem
-from judgelet.domain.results import ExitState, RunResult
+from judgelet.domain.files import Blob, MemoryBlob, Workspace
+from judgelet.domain.results import RunResult
 from judgelet.domain.sandbox import Sandbox
-from judgelet.infrastructure.common import map_sandbox_cause_to_exit_state
+from judgelet.infrastructure.common import (
+    create_compilation_error,
+    map_sandbox_cause_to_exit_state,
+)
+from judgelet.infrastructure.languages.headers import PrecompiledHeaders
+from judgelet.infrastructure.toolchain import (
+    compute_compile_cache_key,
+    get_toolchain_version,
+)
 
 _COMPILE_MEMORY_LIMIT_MB: Final = 512
+_COMPILER: Final = "g++"
+_COMPILE_FLAGS: Final = ("-std=c++17", "-O2")
+_EXECUTABLE: Final = "solution"
 
 
 class Cpp17Compiler(LanguageBackend):
-    """Python language backend."""
+    """C++17 language backend."""
 
     file_ext = "cpp"
+    compile_artifacts: ClassVar[Sequence[str]] = (_EXECUTABLE,)
 
-    def __init__(self) -> None:
+    def __init__(self, headers: PrecompiledHeaders | None = None) -> None:
         self._target: str = ""
+        self._headers = headers
+
+    @override
+    async def get_compile_cache_key(
+        self, workspace: Workspace, target_file: str,
+    ) -> str | None:
+        # sources are hashed and compiler is asked for its version
+        # in a thread, so big workspaces do not block the event loop
+        return await asyncio.to_thread(
+            _compute_cache_key, workspace, target_file,
+        )
+
+    @override
+    def describe_toolchain(self) -> str:
+        flags = " ".join(_COMPILE_FLAGS)
+        return f"{_COMPILER} {flags}\n{get_toolchain_version(_COMPILER)}"
 
     @override
     async def prepare(
-        self, fs: FileSystem, target_file: str, sandbox: Sandbox,
+        self, workspace: Workspace, target_file: str, sandbox: Sandbox,
     ) -> RunResult:
+        self._target = f"./{_EXECUTABLE}"
         return RunResult.blank_ok()
 
     @override
     async def compile(
         self,
-        fs: FileSystem,
+        workspace: Workspace,
         target_file: str,
         compile_timeout_s: float,
         sandbox: Sandbox,
     ) -> RunResult:
+        include_flags = self._headers.include_flags if self._headers else ()
+        flags = " ".join((*_COMPILE_FLAGS, *include_flags))
         result = await sandbox.run(
-            f"g++ -std=c++17 -O2 -o solution {target_file}",
-            proc_input="",
+            f"{_COMPILER} {flags} -o {_EXECUTABLE} {target_file}",
+            proc_input=MemoryBlob(b""),
             timeout_s=compile_timeout_s,
             memory_limit_mb=_COMPILE_MEMORY_LIMIT_MB,
         )
-        self._target = "./solution"
         if result.return_code != 0:
-            report = (
-                f"stdout >>>>>\n{result.stdout}\n\n"
-                f"stderr >>>>>\n{result.stderr}"
-            )
-            return RunResult(
-                stdout=report,
-                stderr=report,
-                return_code=result.return_code,
-                state=ExitState.ERROR,
-            )
+            return create_compilation_error(result)
         return RunResult.blank_ok()
 
     @override
     async def run(
         self,
-        stdin: str,
+        stdin: Blob,
         timeout_s: float,
         mem_limit_mb: float,
         sandbox: Sandbox,
+        wall_timeout_s: float | None = None,
     ) -> RunResult:
         sandbox_result = await sandbox.run(
             self._target,
             proc_input=stdin,
             timeout_s=timeout_s,
             memory_limit_mb=mem_limit_mb,
+            wall_timeout_s=wall_timeout_s,
         )
         exit_state = map_sandbox_cause_to_exit_state(sandbox_result.cause)
         return RunResult(
-            sandbox_result.stdout or "",
-            sandbox_result.stderr or "",
+            sandbox_result.stdout or b"",
+            sandbox_result.stderr or b"",
             sandbox_result.return_code,
             exit_state,
+            sandbox_result.usage,
         )
+
+
+def create_cpp17_headers(
+    root: str, headers: Sequence[str],
+) -> PrecompiledHeaders:
+    """Create headers precompiled with the flags solutions are compiled."""
+    return PrecompiledHeaders(root, _COMPILER, _COMPILE_FLAGS, headers)
+
+
+def _compute_cache_key(workspace: Workspace, target_file: str) -> str:
+    return compute_compile_cache_key(
+        workspace,
+        _COMPILER,
+        *_COMPILE_FLAGS,
+        target_file,
+        get_toolchain_version(_COMPILER),
+    )
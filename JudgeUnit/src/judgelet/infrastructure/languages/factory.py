@@ -1,19 +1,74 @@
-from typing import Any, cast, override
+import asyncio
+import functools
+from collections.abc import Callable, Mapping
+from typing import Final, override
 
 from judgelet.application.interfaces import LanguageBackendFactory
 from judgelet.domain.execution import LanguageBackend
 from judgelet.domain.files import Solution
-from judgelet.infrastructure.languages.lang_list import LANGUAGES
+from judgelet.infrastructure.languages.cpp import Cpp17Compiler
+from judgelet.infrastructure.languages.headers import PrecompiledHeaders
+from judgelet.infrastructure.languages.python import (
+    DEFAULT_INTERPRETER,
+    PythonCompiler,
+)
+
+_CPP17: Final = "cpp17"
+_PYTHON: Final = "python"
 
 
 class DefaultLanguageBackendFactory(LanguageBackendFactory):
-    """Default implementation for language backend factory."""
+    """
+    Default implementation for language backend factory.
+
+    Python is offered under every name of ``python_interpreters``,
+    so a judgelet could offer several versions of it. With
+    ``python_zygote`` its tests are forked from a warm interpreter.
+    """
+
+    def __init__(
+        self,
+        cpp_headers: PrecompiledHeaders | None = None,
+        python_interpreters: Mapping[str, str] | None = None,
+        *,
+        python_zygote: bool = False,
+    ) -> None:
+        self.cpp_headers = cpp_headers
+        if python_interpreters is None:
+            python_interpreters = {_PYTHON: DEFAULT_INTERPRETER}
+        self._backends: dict[str, Callable[[], LanguageBackend]] = {
+            _CPP17: functools.partial(Cpp17Compiler, cpp_headers),
+        }
+        self._languages = {_CPP17: Cpp17Compiler.file_ext}
+        for name, interpreter in python_interpreters.items():
+            self._backends[name] = functools.partial(
+                PythonCompiler, interpreter, use_zygote=python_zygote,
+            )
+            self._languages[name] = PythonCompiler.file_ext
+
+    @property
+    @override
+    def languages(self) -> Mapping[str, str]:
+        return self._languages
+
+    @override
+    async def prepare_toolchains(self) -> None:
+        # versions of toolchains are asked for once, so describing
+        # them for keys of cached results does not block the loop
+        await asyncio.to_thread(self._describe_toolchains)
+        if self.cpp_headers is None:
+            return
+        await self.cpp_headers.build()
+        await self.cpp_headers.warm_up()
 
     @override
     def create_backend(
         self, name: str, solution: Solution,
     ) -> LanguageBackend | None:
-        if name not in LANGUAGES:
+        if name not in self._backends:
             return None
-        backend_cls: Any = LANGUAGES[name]
-        return cast(LanguageBackend, backend_cls())
+        return self._backends[name]()
+
+    def _describe_toolchains(self) -> None:
+        for create_backend in self._backends.values():
+            create_backend().describe_toolchain()
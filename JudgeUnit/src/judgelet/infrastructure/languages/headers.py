@@ -0,0 +1,151 @@
+"""Headers precompiled once, so they are not parsed for every solution."""
+
+import asyncio
+import hashlib
+import shutil
+import subprocess
+import tempfile
+import uuid
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Final
+
+from structlog import get_logger
+
+from judgelet.infrastructure.toolchain import get_toolchain_version
+
+_TMP_PREFIX: Final = ".tmp_"
+_WARM_UP_MAIN: Final = "int main() { return 0; }\n"
+_KEY_LENGTH: Final = 16
+
+
+class PrecompiledHeaders:
+    """
+    Headers precompiled for one compiler and flag set.
+
+    GCC looks for ``<header>.gch`` in every include directory before
+    the header itself, so adding the directory with ``-I`` is enough
+    for solutions to pick them up. Next to every ``.gch`` lies a header
+    that includes the original one, it is used if the ``.gch`` does not
+    match the solution, e.g. if the header is not included first.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        compiler: str,
+        flags: Sequence[str],
+        headers: Sequence[str],
+    ) -> None:
+        self.compiler = compiler
+        self.flags = tuple(flags)
+        self.headers = tuple(headers)
+        self.directory = Path(
+            root, _get_flag_set_key(compiler, self.flags, self.headers),
+        ).absolute()
+        self.log = get_logger().bind(compiler=compiler, flags=self.flags)
+
+    @property
+    def is_built(self) -> bool:
+        """Whether headers are built and could be used."""
+        return bool(self.headers) and self.directory.is_dir()
+
+    @property
+    def include_flags(self) -> tuple[str, ...]:
+        """Flags that make compiler use the headers, if they are built."""
+        if not self.is_built:
+            return ()
+        return ("-I", str(self.directory))
+
+    async def build(self) -> None:
+        """
+        Build headers, unless they are built by a previous run.
+
+        Failure is only logged, solutions are compiled without them.
+        """
+        if self.is_built or not self.headers:
+            return
+        self.log.info("Precompiling headers", headers=self.headers)
+        try:
+            await asyncio.to_thread(self._build)
+        except subprocess.CalledProcessError as exc:
+            self.log.warning(
+                "Could not precompile headers", error=exc.stderr,
+            )
+        except OSError as exc:
+            self.log.warning("Could not precompile headers", error=str(exc))
+
+    async def warm_up(self) -> None:
+        """
+        Compile a trivial program using the headers.
+
+        This puts the compiler, headers and libraries to the page cache,
+        so the first solution after a start is not compiled slower.
+        """
+        self.log.info("Warming up compiler")
+        includes = "".join(
+            f"#include <{header}>\n" for header in self.headers
+        )
+        source = f"{includes}{_WARM_UP_MAIN}"
+        try:
+            await asyncio.to_thread(self._compile, source)
+        except (OSError, subprocess.CalledProcessError) as exc:
+            self.log.warning("Could not warm up compiler", error=str(exc))
+
+    def _build(self) -> None:
+        build_id = uuid.uuid4().hex
+        unfinished = self.directory.with_name(f"{_TMP_PREFIX}{build_id}")
+        try:
+            for header in self.headers:
+                self._build_header(unfinished, header)
+        except BaseException:
+            shutil.rmtree(unfinished, ignore_errors=True)
+            raise
+        try:
+            unfinished.rename(self.directory)
+        except OSError:
+            # same headers were built concurrently
+            shutil.rmtree(unfinished, ignore_errors=True)
+
+    def _build_header(self, directory: Path, header: str) -> None:
+        fallback = directory / header
+        fallback.parent.mkdir(parents=True, exist_ok=True)
+        fallback.write_text(f"#include_next <{header}>\n")
+        subprocess.run(
+            [
+                self.compiler,
+                *self.flags,
+                "-x", "c++-header",
+                str(fallback),
+                "-o", f"{fallback}.gch",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    def _compile(self, source: str) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            subprocess.run(
+                [
+                    self.compiler,
+                    *self.flags,
+                    *self.include_flags,
+                    "-x", "c++", "-",
+                    "-o", str(Path(directory, "warm_up")),
+                ],
+                input=source,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+
+
+def _get_flag_set_key(
+    compiler: str, flags: Sequence[str], headers: Sequence[str],
+) -> str:
+    digest = hashlib.sha256()
+    for part in (compiler, *flags, *headers, get_toolchain_version(compiler)):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:_KEY_LENGTH]
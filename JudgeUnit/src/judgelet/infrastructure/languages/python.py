@@ -1,55 +1,113 @@
-from typing import override
+from pathlib import PurePath
+from typing import Final, override
 
 from judgelet.domain.execution import LanguageBackend
-from judgelet.domain.files import FileSystem
+from judgelet.domain.files import Blob, MemoryBlob, Workspace
 from judgelet.domain.results import RunResult
 from judgelet.domain.sandbox import Sandbox
-from judgelet.infrastructure.common import map_sandbox_cause_to_exit_state
+from judgelet.infrastructure.common import (
+    create_compilation_error,
+    map_sandbox_cause_to_exit_state,
+)
+from judgelet.infrastructure.toolchain import get_toolchain_version
+
+DEFAULT_INTERPRETER: Final = "python"
+_COMPILE_MEMORY_LIMIT_MB: Final = 256
+# -I is not used, because it also removes the directory of the solution
+# from sys.path, so multi-file solutions could not import their modules
+_INTERPRETER_FLAGS: Final = "-E -s -S"
 
 
 class PythonCompiler(LanguageBackend):
-    """Python language backend."""
+    """
+    Python language backend.
+
+    Sources are byte-compiled once, syntax errors are reported as CE.
+    Main file is compiled next to itself, because a script given by
+    its source is always recompiled, and the rest are compiled to
+    ``__pycache__``, where imports look for them. Tests are run from
+    bytecode, without the site module and environment variables.
+
+    With ``use_zygote`` tests are forked from a warm interpreter
+    the sandbox keeps, if it has one, instead of starting one per test.
+    """
 
     file_ext = "py"
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        interpreter: str = DEFAULT_INTERPRETER,
+        *,
+        use_zygote: bool = False,
+    ) -> None:
+        self.interpreter = interpreter
+        self.use_zygote = use_zygote
         self._target: str = ""
 
+    @override
+    def describe_toolchain(self) -> str:
+        version = get_toolchain_version(self.interpreter)
+        return f"{self.interpreter} {_INTERPRETER_FLAGS}\n{version}"
+
     @override
     async def prepare(
-        self, fs: FileSystem, target_file: str, sandbox: Sandbox,
+        self, workspace: Workspace, target_file: str, sandbox: Sandbox,
     ) -> RunResult:
+        self._target = str(PurePath(target_file).with_suffix(".pyc"))
         return RunResult.blank_ok()
 
     @override
     async def compile(
         self,
-        fs: FileSystem,
+        workspace: Workspace,
         target_file: str,
         compile_timeout_s: float,
         sandbox: Sandbox,
     ) -> RunResult:
-        self._target = target_file
+        for compile_args in ("-q .", f"-q -b {target_file}"):
+            result = await sandbox.run(  # noqa: WPS476
+                f"{self.interpreter} {_INTERPRETER_FLAGS} "
+                f"-m compileall {compile_args}",
+                proc_input=MemoryBlob(b""),
+                timeout_s=compile_timeout_s,
+                memory_limit_mb=_COMPILE_MEMORY_LIMIT_MB,
+            )
+            if result.return_code != 0:
+                return create_compilation_error(result)
         return RunResult.blank_ok()
 
     @override
     async def run(
         self,
-        stdin: str,
+        stdin: Blob,
         timeout_s: float,
         mem_limit_mb: float,
         sandbox: Sandbox,
+        wall_timeout_s: float | None = None,
     ) -> RunResult:
-        sandbox_result = await sandbox.run(
-            f"python {self._target}",
-            proc_input=stdin,
-            timeout_s=timeout_s,
-            memory_limit_mb=mem_limit_mb,
-        )
+        sandbox_result = None
+        if self.use_zygote:
+            sandbox_result = await sandbox.run_script(
+                [self.interpreter, *_INTERPRETER_FLAGS.split(), "-B"],
+                self._target,
+                proc_input=stdin,
+                timeout_s=timeout_s,
+                memory_limit_mb=mem_limit_mb,
+                wall_timeout_s=wall_timeout_s,
+            )
+        if sandbox_result is None:
+            sandbox_result = await sandbox.run(
+                f"{self.interpreter} {_INTERPRETER_FLAGS} -B {self._target}",
+                proc_input=stdin,
+                timeout_s=timeout_s,
+                memory_limit_mb=mem_limit_mb,
+                wall_timeout_s=wall_timeout_s,
+            )
         exit_state = map_sandbox_cause_to_exit_state(sandbox_result.cause)
         return RunResult(
-            sandbox_result.stdout or "",
-            sandbox_result.stderr or "",
+            sandbox_result.stdout or b"",
+            sandbox_result.stderr or b"",
             sandbox_result.return_code,
             exit_state,
+            sandbox_result.usage,
         )
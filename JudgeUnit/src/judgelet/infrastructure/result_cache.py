@@ -0,0 +1,60 @@
+"""Results of checking cached in memory."""
+
+from collections import OrderedDict
+from typing import override
+
+from structlog import get_logger
+
+from judgelet.application.interfaces import ResultCache
+from judgelet.domain.test_suite import SuiteResult
+
+
+class LruResultCache(ResultCache):
+    """
+    Keeps up to ``capacity`` results, least recently used are evicted.
+
+    Zero capacity disables the cache, but lookups are still counted.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.log = get_logger()
+        self._entries: OrderedDict[str, SuiteResult] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    @override
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    @override
+    def misses(self) -> int:
+        return self._misses
+
+    @override
+    def get(self, key: str) -> SuiteResult | None:
+        cached = self._entries.get(key)
+        if cached is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        self.log.info(
+            "Result cache hit", hits=self._hits, misses=self._misses,
+        )
+        return cached
+
+    @override
+    def put(self, key: str, result: SuiteResult) -> None:
+        if not self.capacity:
+            return
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    @override
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
@@ -0,0 +1,244 @@
+"""Long-lived llaunch server, that launches tests without a cold start."""
+
+import asyncio
+import base64
+import contextlib
+import json
+import os
+import signal
+from collections.abc import Collection, Mapping, Sequence
+from typing import Any, Final
+
+from attrs import frozen
+from structlog import get_logger
+
+from judgelet.domain.results import ResourceUsage
+from judgelet.infrastructure import shell_executor
+
+_REPLY_GRACE_S: Final = 5
+_MAX_REPLY_SIZE: Final = 1024 * 1024 * 1024
+_REPLY_OVERHEAD: Final = 1024 * 1024
+
+
+class SandboxAgentError(Exception):
+    """Raised when agent has died or replied with garbage."""
+
+
+@frozen
+class LaunchLimits:
+    """Limits of a single launch, negative means no limit."""
+
+    time_limit_s: float
+    memory_limit_mb: float
+    wall_time_limit_s: float
+    output_limit_mb: float = -1
+
+
+@frozen
+class AgentReply:
+    """Result of a launch performed by the agent."""
+
+    return_code: int
+    stdout: bytes
+    stderr: bytes
+    usage: ResourceUsage
+
+
+class SandboxAgent:
+    """
+    Handle of ``llaunch.py --serve`` running (possibly) inside a sandbox.
+
+    Agent is started on first use and then reused by all launches,
+    one at a time. If a launch is cancelled or the agent misbehaves,
+    the agent is killed together with everything it has started,
+    and a fresh one is started by the next launch.
+    Replies are buffered up to what two outputs of at most
+    ``output_limit_bytes`` take, a larger one is an error.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        cpus: Collection[int] | None = None,
+        output_limit_bytes: int | None = None,
+    ) -> None:
+        self.command = command
+        self.cpus = cpus
+        self.reply_limit = _get_reply_limit(output_limit_bytes)
+        self.log = get_logger().bind(agent=command[-1])
+        self._process: asyncio.subprocess.Process | None = None
+        self._killed: asyncio.subprocess.Process | None = None
+        self._lock = asyncio.Lock()
+
+    async def launch(  # noqa: WPS211 (too many args)
+        self,
+        cmd: str,
+        proc_input: bytes | os.PathLike[str],
+        cwd: str,
+        environment: Mapping[str, str],
+        limits: LaunchLimits,
+    ) -> AgentReply:
+        """
+        Launch command with limits.
+
+        Stdin is either sent to the agent, or it is given a path
+        of the file to redirect stdin from.
+
+        Returns:
+            return code (classified by llaunch), outputs and usage
+
+        Raises:
+            SandboxAgentError: if agent could not perform the launch
+
+        """
+        return await self._launch(
+            {"cmd": cmd}, proc_input, cwd, environment, limits,
+        )
+
+    async def launch_script(  # noqa: WPS211 (too many args)
+        self,
+        interpreter: Sequence[str],
+        script: str,
+        proc_input: bytes | os.PathLike[str],
+        cwd: str,
+        environment: Mapping[str, str],
+        limits: LaunchLimits,
+    ) -> AgentReply:
+        """
+        Run Python script in a child of the zygote of the interpreter.
+
+        Zygote is started by the agent on first use of the interpreter.
+        Stdin is passed the same way as by :meth:`launch`.
+
+        Raises:
+            SandboxAgentError: if agent could not perform the launch,
+                e.g. if the interpreter could not start the zygote
+
+        """
+        return await self._launch(
+            {"script": script, "interpreter": list(interpreter)},
+            proc_input,
+            cwd,
+            environment,
+            limits,
+        )
+
+    async def stop(self) -> None:
+        """Kill the agent and everything it has started."""
+        self.kill()
+        await self._reap()
+
+    def kill(self) -> None:
+        """
+        Kill the agent and everything it has started, without waiting.
+
+        Next launch waits for it to exit, then starts a fresh one.
+        """
+        process = self._process
+        self._process = None
+        if process is None:
+            return
+        self.log.info("Stopping sandbox agent", pid=process.pid)
+        with contextlib.suppress(ProcessLookupError, PermissionError):
+            os.killpg(process.pid, signal.SIGKILL)
+        self._killed = process
+
+    async def _launch(  # noqa: WPS211 (too many args)
+        self,
+        target: dict[str, Any],
+        proc_input: bytes | os.PathLike[str],
+        cwd: str,
+        environment: Mapping[str, str],
+        limits: LaunchLimits,
+    ) -> AgentReply:
+        wall_time = limits.wall_time_limit_s
+        reply_timeout = wall_time + _REPLY_GRACE_S if wall_time >= 0 else None
+        request = {
+            **target,
+            "cwd": cwd,
+            "env": dict(environment),
+            "time_limit": limits.time_limit_s,
+            "mem_limit": limits.memory_limit_mb,
+            "wall_time": wall_time,
+            "output_limit": limits.output_limit_mb,
+        }
+        if isinstance(proc_input, os.PathLike):
+            request["stdin_file"] = os.fspath(proc_input)
+        else:
+            request["stdin"] = base64.b64encode(proc_input).decode()
+        async with self._lock:
+            try:
+                raw_reply = await asyncio.wait_for(
+                    self._exchange(json.dumps(request).encode()),
+                    timeout=reply_timeout,
+                )
+            except BaseException:
+                await self.stop()
+                raise
+        return _parse_reply(raw_reply)
+
+    async def _exchange(self, request: bytes) -> bytes:
+        process = await self._ensure_started()
+        if process.stdin is None or process.stdout is None:
+            raise SandboxAgentError("Agent pipes are not open")
+        process.stdin.writelines([request, b"\n"])
+        await process.stdin.drain()
+        try:
+            reply = await process.stdout.readline()
+        except ValueError as exc:
+            raise SandboxAgentError("Agent reply is too large") from exc
+        if not reply:
+            raise SandboxAgentError("Agent has exited")
+        return reply
+
+    async def _ensure_started(self) -> asyncio.subprocess.Process:
+        if self._process is not None and self._process.returncode is None:
+            return self._process
+        await self._reap()
+        self._process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            start_new_session=True,
+            preexec_fn=shell_executor.get_preexec_fn(self.cpus, None),
+            limit=self.reply_limit,
+        )
+        self.log.info("Started sandbox agent", pid=self._process.pid)
+        return self._process
+
+    async def _reap(self) -> None:
+        process = self._killed
+        self._killed = None
+        if process is not None:
+            await process.wait()
+
+
+def _get_reply_limit(output_limit_bytes: int | None) -> int:
+    if output_limit_bytes is None:
+        return _MAX_REPLY_SIZE
+    encoded_size = (output_limit_bytes + 2) // 3 * 4
+    return 2 * encoded_size + _REPLY_OVERHEAD
+
+
+def _parse_reply(raw_reply: bytes) -> AgentReply:
+    try:
+        return _build_reply(json.loads(raw_reply))
+    except (KeyError, TypeError, ValueError) as exc:
+        raise SandboxAgentError("Malformed agent reply") from exc
+
+
+def _build_reply(reply: dict[str, Any]) -> AgentReply:
+    error = reply.get("error")
+    if error is not None:
+        raise SandboxAgentError(error)
+    usage = reply["usage"]
+    return AgentReply(
+        return_code=int(reply["return_code"]),
+        stdout=base64.b64decode(reply["stdout"]),
+        stderr=base64.b64decode(reply["stderr"]),
+        usage=ResourceUsage(
+            cpu_time_s=float(usage["cpu_time_s"]),
+            wall_time_s=float(usage["wall_time_s"]),
+            peak_memory_mb=float(usage["peak_memory_mb"]),
+        ),
+    )
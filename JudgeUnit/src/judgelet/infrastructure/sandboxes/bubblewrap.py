@@ -1,142 +1,133 @@
+import functools
 import os
-import shutil
 import sys
-import time
-from collections.abc import Mapping
-from pathlib import Path
-from typing import override
-
-from structlog import get_logger
+from collections.abc import Mapping, Sequence
+from typing import Final, override
 
 from judgelet.application.interfaces import SandboxFactory
-from judgelet.domain.files import FileSystem
-from judgelet.domain.sandbox import Sandbox, SandboxExitCause, SandboxResult
-from judgelet.infrastructure import shell_executor
+from judgelet.domain.files import Workspace
+from judgelet.domain.sandbox import Sandbox
+from judgelet.domain.slots import ExecutionSlot
+from judgelet.infrastructure.sandboxes.agent import SandboxAgent
+from judgelet.infrastructure.sandboxes.launching import (
+    AgentPool,
+    LlaunchSandbox,
+)
+from judgelet.infrastructure.sandboxes.llaunch import (
+    get_llaunch_path,
+    get_llaunch_serve_command,
+)
 
+_READ_ONLY_PATHS: Final = ("/usr", "/lib", "/bin/sh")
 
-class BubblewrapSandbox(Sandbox):
-    """Simple sandbox that uses llaunch to control resources."""
 
-    def __init__(
+class BubblewrapSandbox(LlaunchSandbox):
+    """
+    Sandbox that runs processes in bubblewrap under llaunch.
+
+    If an agent is given, commands are launched by it in a warm
+    bubblewrap instance, otherwise each command gets its own one.
+    """
+
+    agent_sees_host = False
+
+    def __init__(  # noqa: WPS211 (too many args)
         self,
-        fs: FileSystem,
-        sandbox_dir: str,
+        workspace: Workspace,
         encoding: str | None = None,
         environment: Mapping[str, str] | None = None,
+        slot: ExecutionSlot | None = None,
+        agent: SandboxAgent | None = None,
+        output_limit_bytes: int | None = None,
+        read_only_dirs: Sequence[str] = (),
     ) -> None:
-        super().__init__(fs, sandbox_dir, encoding, environment)
-        self.log = get_logger().bind(dir=sandbox_dir)
+        super().__init__(
+            workspace, encoding, environment, slot, agent, output_limit_bytes,
+        )
+        self.read_only_dirs = read_only_dirs
 
     @override
-    async def run(
-        self,
-        cmd: str,
-        proc_input: str,
-        timeout_s: float,
-        memory_limit_mb: float,
-    ) -> SandboxResult:
-        clean_command = cmd.replace('"', r'\"')
-        self.log.info("Copied llaunch")
-        shutil.copy("llaunch.py", Path(self.sandbox_dir, "llaunch.py"))
-        self.log.info(
-            "Launching %s, M<=%s, T<=%s",
-            clean_command, memory_limit_mb, timeout_s,
-        )
-        final_cmd = _get_command(
-            sys.platform, timeout_s, memory_limit_mb, clean_command,
-            self.sandbox_dir,
-        )
-        self.log.info("Final cmd: %s", final_cmd)
-        start = time.time()
-        result = await shell_executor.execute_in_shell(
-            final_cmd,
-            proc_input=proc_input,
-            cwd=self.sandbox_dir,
-            io_encoding=self.encoding,
-            env=self.environment,
-        )
-        elapsed = time.time() - start
-        if result.return_code == shell_executor.MEMORY_LIMIT_EXIT_CODE:
-            self.log.info("Memory limit exceeded")
-            return SandboxResult(
-                return_code=result.return_code,
-                cause=SandboxExitCause.MEMORY_LIMIT_EXCEEDED,
-            )
-        if result.return_code == shell_executor.TIMEOUT_EXIT_CODE:
-            self.log.info(
-                "Time limit exceeded",
-                gross_error=elapsed - timeout_s,
-            )
-            return SandboxResult(
-                return_code=result.return_code,
-                cause=SandboxExitCause.TIME_LIMIT_EXCEEDED,
-            )
-        self.log.info(
-            "Launched and exited with return code %s", result.return_code,
-        )
-        return SandboxResult(
-            stdout=result.stdout,
-            stderr=result.stderr,
-            return_code=result.return_code,
-            cause=SandboxExitCause.PROCESS_EXITED,
+    def _wrap_command(self, llaunch_command: str) -> str:
+        if sys.platform == "win32":
+            return llaunch_command
+        sandbox_dir = os.path.abspath(self.sandbox_dir)
+        options = " ".join(
+            _get_isolation_options(sandbox_dir, self.read_only_dirs),
         )
+        return f"bwrap {options} -- {llaunch_command}"
 
-    @override
-    def close(self) -> None:
-        """Destroy the sandbox, but preserve temp files."""
 
-    @override
-    def destroy(self) -> None:
-        """Destroy the sandbox and delete all temp files."""
-        self.close()
-
-
-def _get_command(
-    platform: str,
-    time_limit: float,
-    mem_limit: float,
-    target: str,
-    sandbox_dir: str,
-) -> str:
-    py_cmd = _get_py_command(platform, time_limit, mem_limit, target)
-    if platform == "win32":
-        return py_cmd
-    sandbox_dir = os.path.abspath(sandbox_dir)
-    return (
-        f"bwrap "
-        f"--ro-bind /usr /usr "
-        f"--ro-bind /lib /lib "
-        f"--ro-bind /app/llaunch.py llaunch.py "
-        f"--ro-bind /bin/sh /bin/sh "
-        f"--bind {sandbox_dir} {sandbox_dir} "
-        f"--proc /proc "
-        f"--dev /dev "
-        f"--unshare-pid "
-        f"--new-session "
-        f"-- {py_cmd}"
-    )
-
-
-def _get_py_command(
-    platform: str,
-    time_limit: float,
-    mem_limit: float,
-    target: str,
-) -> str:
-    if platform == "win32":
-        return f"py -m llaunch {time_limit} {mem_limit} {target}"
-    return f'python3 -m llaunch {time_limit} {mem_limit} "{target}"'
+def _get_isolation_options(
+    writable_dir: str, read_only_dirs: Sequence[str],
+) -> list[str]:
+    read_only_binds: list[str] = []
+    for path in (*_READ_ONLY_PATHS, get_llaunch_path()):
+        read_only_binds.extend(("--ro-bind", path, path))
+    for directory in read_only_dirs:
+        absolute = os.path.abspath(directory)
+        read_only_binds.extend(("--ro-bind-try", absolute, absolute))
+    return [
+        *read_only_binds,
+        "--bind", writable_dir, writable_dir,
+        "--proc", "/proc",
+        "--dev", "/dev",
+        "--unshare-pid",
+        "--die-with-parent",
+        "--new-session",
+    ]
+
+
+def _get_agent_command(
+    workdir: str, read_only_dirs: Sequence[str],
+) -> list[str]:
+    return [
+        "bwrap",
+        *_get_isolation_options(workdir, read_only_dirs),
+        "--",
+        *get_llaunch_serve_command(),
+    ]
 
 
 class BubblewrapSandboxFactory(SandboxFactory):
-    """Simple sandbox factory."""
+    """
+    Bubblewrap sandbox factory.
+
+    Keeps a warm bubblewrap instance with an agent per execution slot.
+    The slot workdir is bound into it, so tests of a solution placed
+    there run without restarting the instance. It is killed with its
+    PID namespace once the solution is checked.
+    Besides system paths, only ``read_only_dirs`` of the host are
+    visible, e.g. precompiled headers.
+    """
+
+    def __init__(
+        self,
+        output_limit_bytes: int | None = None,
+        read_only_dirs: Sequence[str] = (),
+    ) -> None:
+        self.output_limit_bytes = output_limit_bytes
+        self.read_only_dirs = tuple(read_only_dirs)
+        self.agents = AgentPool(
+            functools.partial(
+                _get_agent_command, read_only_dirs=self.read_only_dirs,
+            ),
+            output_limit_bytes,
+        )
 
     @override
     def __call__(
         self,
-        fs: FileSystem,
-        sandbox_dir: str,
+        workspace: Workspace,
         encoding: str | None = None,
         environment: Mapping[str, str] | None = None,
+        slot: ExecutionSlot | None = None,
     ) -> Sandbox:
-        return BubblewrapSandbox(fs, sandbox_dir, encoding, environment)
+        return BubblewrapSandbox(
+            workspace,
+            encoding,
+            environment,
+            slot,
+            self.agents.get(slot),
+            self.output_limit_bytes,
+            self.read_only_dirs,
+        )
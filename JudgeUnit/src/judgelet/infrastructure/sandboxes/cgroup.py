@@ -0,0 +1,186 @@
+import asyncio
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Final, override
+
+from structlog import get_logger
+
+from judgelet.application.interfaces import SandboxFactory
+from judgelet.domain.files import Blob, Workspace
+from judgelet.domain.results import ResourceUsage
+from judgelet.domain.sandbox import Sandbox, SandboxExitCause, SandboxResult
+from judgelet.domain.slots import ExecutionSlot
+from judgelet.infrastructure import shell_executor
+from judgelet.infrastructure.cgroups import (
+    CgroupTree,
+    destroy_group,
+    kill_on_cpu_limit,
+    read_usage,
+)
+from judgelet.infrastructure.sandboxes.simple import SimpleSandbox
+
+_PIDS_LIMIT: Final = 64
+_MB: Final = 1024 * 1024
+
+
+class CgroupSandbox(Sandbox):
+    """
+    Runs each command in its own transient cgroup with hard limits.
+
+    Group is killed as soon as it exceeds CPU time limit, so a process
+    does not hold its slot until the wall time limit.
+    """
+
+    def __init__(  # noqa: WPS211 (too many args)
+        self,
+        tree: CgroupTree,
+        workspace: Workspace,
+        encoding: str | None = None,
+        environment: Mapping[str, str] | None = None,
+        slot: ExecutionSlot | None = None,
+        output_limit_bytes: int | None = None,
+    ) -> None:
+        super().__init__(
+            workspace, encoding, environment, slot, output_limit_bytes,
+        )
+        self.tree = tree
+        self.log = get_logger().bind(dir=self.sandbox_dir)
+
+    @override
+    async def run(
+        self,
+        cmd: str,
+        proc_input: Blob,
+        timeout_s: float,
+        memory_limit_mb: float,
+        wall_timeout_s: float | None = None,
+    ) -> SandboxResult:
+        group = self.tree.create_group(memory_limit_mb, _PIDS_LIMIT)
+        self.log.info(
+            "Launching %s in %s, M<=%s, T<=%s, W<=%s",
+            cmd, group.name, memory_limit_mb, timeout_s, wall_timeout_s,
+        )
+        try:
+            return await self._run_in_group(
+                group, cmd, proc_input, timeout_s, wall_timeout_s,
+            )
+        finally:
+            await destroy_group(group)
+
+    @override
+    def close(self) -> None:
+        """Destroy the sandbox, but preserve temp files."""
+
+    @override
+    def destroy(self) -> None:
+        """Destroy the sandbox and delete all temp files."""
+        self.close()
+
+    async def _run_in_group(  # noqa: WPS211 (too many args)
+        self,
+        group: Path,
+        cmd: str,
+        proc_input: Blob,
+        timeout_s: float,
+        wall_timeout_s: float | None,
+    ) -> SandboxResult:
+        start = time.monotonic()
+        watchdog = asyncio.create_task(kill_on_cpu_limit(group, timeout_s))
+        try:
+            result = await asyncio.wait_for(
+                shell_executor.execute_in_shell(
+                    cmd,
+                    proc_input=proc_input.path or proc_input.read(),
+                    cwd=self.sandbox_dir,
+                    env=self.environment,
+                    cpus=self.cpus,
+                    cgroup=str(group),
+                    output_limit=self.output_limit_bytes,
+                ),
+                timeout=wall_timeout_s or timeout_s,
+            )
+        except TimeoutError:
+            self.log.info("Wall time limit exceeded")
+            return _time_limit_result()
+        finally:
+            watchdog.cancel()
+            await asyncio.gather(watchdog, return_exceptions=True)
+        group_usage = read_usage(group)
+        usage = ResourceUsage(
+            cpu_time_s=group_usage.cpu_time_s,
+            wall_time_s=time.monotonic() - start,
+            peak_memory_mb=group_usage.peak_memory_bytes / _MB,
+        )
+        self.log.info(
+            "Launched and exited with return code %s", result.return_code,
+            usage=usage,
+        )
+        if group_usage.oom_killed:
+            return SandboxResult(
+                return_code=shell_executor.MEMORY_LIMIT_EXIT_CODE,
+                cause=SandboxExitCause.MEMORY_LIMIT_EXCEEDED,
+                usage=usage,
+            )
+        if usage.cpu_time_s > timeout_s:
+            return _time_limit_result(usage)
+        if result.return_code == shell_executor.OUTPUT_LIMIT_EXIT_CODE:
+            return SandboxResult(
+                return_code=result.return_code,
+                cause=SandboxExitCause.OUTPUT_LIMIT_EXCEEDED,
+                usage=usage,
+            )
+        return SandboxResult(
+            stdout=result.stdout,
+            stderr=result.stderr,
+            return_code=result.return_code,
+            cause=SandboxExitCause.PROCESS_EXITED,
+            usage=usage,
+        )
+
+
+def _time_limit_result(usage: ResourceUsage | None = None) -> SandboxResult:
+    return SandboxResult(
+        return_code=shell_executor.TIMEOUT_EXIT_CODE,
+        cause=SandboxExitCause.TIME_LIMIT_EXCEEDED,
+        usage=usage,
+    )
+
+
+class CgroupSandboxFactory(SandboxFactory):
+    """
+    Cgroup sandbox factory.
+
+    If cgroups are not delegated to judgelet, falls back to simple sandbox.
+    """
+
+    def __init__(self, output_limit_bytes: int | None = None) -> None:
+        self.output_limit_bytes = output_limit_bytes
+        self.tree = CgroupTree.discover()
+        if self.tree is None:
+            get_logger().warning("Falling back to simple sandbox")
+
+    @override
+    def __call__(
+        self,
+        workspace: Workspace,
+        encoding: str | None = None,
+        environment: Mapping[str, str] | None = None,
+        slot: ExecutionSlot | None = None,
+    ) -> Sandbox:
+        if self.tree is None:
+            return SimpleSandbox(
+                workspace,
+                encoding,
+                environment,
+                slot,
+                output_limit_bytes=self.output_limit_bytes,
+            )
+        return CgroupSandbox(
+            self.tree,
+            workspace,
+            encoding,
+            environment,
+            slot,
+            self.output_limit_bytes,
+        )
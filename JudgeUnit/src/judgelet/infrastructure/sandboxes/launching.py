@@ -0,0 +1,302 @@
+"""Base for sandboxes that control resources with llaunch."""
+
+import functools
+import os
+import sys
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from pathlib import Path
+from typing import ClassVar, Final, override
+
+from structlog import get_logger
+
+from judgelet.domain.files import Blob, Workspace
+from judgelet.domain.results import ResourceUsage
+from judgelet.domain.sandbox import Sandbox, SandboxExitCause, SandboxResult
+from judgelet.domain.slots import ExecutionSlot
+from judgelet.infrastructure import shell_executor
+from judgelet.infrastructure.sandboxes.agent import (
+    AgentReply,
+    LaunchLimits,
+    SandboxAgent,
+    SandboxAgentError,
+)
+from judgelet.infrastructure.sandboxes.llaunch import (
+    get_llaunch_command,
+    pop_usage_report,
+)
+
+_MB: Final = 1024 * 1024
+
+
+class LlaunchSandbox(Sandbox):
+    """
+    Sandbox that runs processes under llaunch.
+
+    If an agent is given, commands are launched by that persistent
+    llaunch, otherwise (or if the agent fails) each command starts
+    its own one.
+    Subclasses may wrap one-shot commands, e.g. to isolate them.
+    If their agent can not see files of the host, stdin is sent
+    to it instead of the path of the file it is kept in.
+    """
+
+    agent_sees_host: ClassVar[bool] = True
+
+    def __init__(  # noqa: WPS211 (too many args)
+        self,
+        workspace: Workspace,
+        encoding: str | None = None,
+        environment: Mapping[str, str] | None = None,
+        slot: ExecutionSlot | None = None,
+        agent: SandboxAgent | None = None,
+        output_limit_bytes: int | None = None,
+    ) -> None:
+        super().__init__(
+            workspace, encoding, environment, slot, output_limit_bytes,
+        )
+        self.agent = agent
+        self.log = get_logger().bind(dir=self.sandbox_dir)
+
+    @override
+    async def run(
+        self,
+        cmd: str,
+        proc_input: Blob,
+        timeout_s: float,
+        memory_limit_mb: float,
+        wall_timeout_s: float | None = None,
+    ) -> SandboxResult:
+        self.log.info(
+            "Launching %s, M<=%s, T<=%s, W<=%s, agent=%s",
+            cmd, memory_limit_mb, timeout_s, wall_timeout_s,
+            self.agent is not None,
+        )
+        if self.agent is None:
+            return await self._run_once(
+                cmd, proc_input, timeout_s, memory_limit_mb, wall_timeout_s,
+            )
+        try:
+            return await self._run_with_agent(
+                functools.partial(self.agent.launch, cmd),
+                proc_input,
+                _create_limits(
+                    timeout_s,
+                    memory_limit_mb,
+                    wall_timeout_s,
+                    self._get_output_limit_mb(),
+                ),
+            )
+        except SandboxAgentError as exc:
+            self.log.warning("Agent could not launch command", error=str(exc))
+        return await self._run_once(
+            cmd, proc_input, timeout_s, memory_limit_mb, wall_timeout_s,
+        )
+
+    @override
+    async def run_script(  # noqa: WPS211 (too many args)
+        self,
+        interpreter: Sequence[str],
+        script: str,
+        proc_input: Blob,
+        timeout_s: float,
+        memory_limit_mb: float,
+        wall_timeout_s: float | None = None,
+    ) -> SandboxResult | None:
+        if self.agent is None:
+            return None
+        self.log.info(
+            "Launching %s by zygote, M<=%s, T<=%s, W<=%s",
+            script, memory_limit_mb, timeout_s, wall_timeout_s,
+        )
+        try:
+            return await self._run_with_agent(
+                functools.partial(
+                    self.agent.launch_script, interpreter, script,
+                ),
+                proc_input,
+                _create_limits(
+                    timeout_s,
+                    memory_limit_mb,
+                    wall_timeout_s,
+                    self._get_output_limit_mb(),
+                ),
+            )
+        except SandboxAgentError as exc:
+            self.log.warning("Zygote could not run script", error=str(exc))
+            return None
+
+    @override
+    def close(self) -> None:
+        """
+        Destroy the sandbox, but preserve temp files.
+
+        Agent is killed with everything the solution has left running,
+        so the next solution on the slot starts with a fresh one.
+        """
+        if self.agent is not None:
+            self.agent.kill()
+
+    @override
+    def destroy(self) -> None:
+        """Destroy the sandbox and delete all temp files."""
+        self.close()
+
+    def _wrap_command(self, llaunch_command: str) -> str:
+        return llaunch_command
+
+    def _get_output_limit_mb(self) -> float | None:
+        if self.output_limit_bytes is None:
+            return None
+        return self.output_limit_bytes / _MB
+
+    async def _run_with_agent(
+        self,
+        launch: Callable[
+            [bytes | Path, str, Mapping[str, str], LaunchLimits],
+            Awaitable[AgentReply],
+        ],
+        proc_input: Blob,
+        limits: LaunchLimits,
+    ) -> SandboxResult:
+        agent_stdin: bytes | Path
+        if self.agent_sees_host and proc_input.path is not None:
+            agent_stdin = proc_input.path.absolute()
+        else:
+            agent_stdin = proc_input.read()
+        try:
+            reply = await launch(
+                agent_stdin,
+                os.path.abspath(self.sandbox_dir),
+                self.environment or {},
+                limits,
+            )
+        except TimeoutError:
+            self.log.warning("Agent did not reply in time")
+            return SandboxResult(
+                return_code=shell_executor.TIMEOUT_EXIT_CODE,
+                cause=SandboxExitCause.TIME_LIMIT_EXCEEDED,
+            )
+        return self._to_result(
+            shell_executor.ShellResult(
+                reply.stdout, reply.stderr, reply.return_code,
+            ),
+            reply.usage,
+        )
+
+    async def _run_once(  # noqa: WPS211 (too many args)
+        self,
+        cmd: str,
+        proc_input: Blob,
+        timeout_s: float,
+        memory_limit_mb: float,
+        wall_timeout_s: float | None,
+    ) -> SandboxResult:
+        final_cmd = self._wrap_command(
+            get_llaunch_command(
+                sys.platform,
+                timeout_s,
+                memory_limit_mb,
+                cmd.replace('"', r'\"'),
+                wall_timeout_s,
+                self._get_output_limit_mb(),
+            ),
+        )
+        self.log.info("Final cmd: %s", final_cmd)
+        result = await shell_executor.execute_in_shell(
+            final_cmd,
+            proc_input=proc_input.path or proc_input.read(),
+            cwd=self.sandbox_dir,
+            env=self.environment,
+            cpus=self.cpus,
+            output_limit=self.output_limit_bytes,
+        )
+        return self._to_result(result, pop_usage_report(self.sandbox_dir))
+
+    def _to_result(
+        self,
+        result: shell_executor.ShellResult,
+        usage: ResourceUsage | None,
+    ) -> SandboxResult:
+        if result.return_code == shell_executor.MEMORY_LIMIT_EXIT_CODE:
+            self.log.info("Memory limit exceeded")
+            return SandboxResult(
+                return_code=result.return_code,
+                cause=SandboxExitCause.MEMORY_LIMIT_EXCEEDED,
+                usage=usage,
+            )
+        if result.return_code == shell_executor.TIMEOUT_EXIT_CODE:
+            self.log.info("Time limit exceeded", usage=usage)
+            return SandboxResult(
+                return_code=result.return_code,
+                cause=SandboxExitCause.TIME_LIMIT_EXCEEDED,
+                usage=usage,
+            )
+        if result.return_code == shell_executor.OUTPUT_LIMIT_EXIT_CODE:
+            self.log.info("Output limit exceeded")
+            return SandboxResult(
+                return_code=result.return_code,
+                cause=SandboxExitCause.OUTPUT_LIMIT_EXCEEDED,
+                usage=usage,
+            )
+        self.log.info(
+            "Launched and exited with return code %s", result.return_code,
+            usage=usage,
+        )
+        return SandboxResult(
+            stdout=result.stdout,
+            stderr=result.stderr,
+            return_code=result.return_code,
+            cause=SandboxExitCause.PROCESS_EXITED,
+            usage=usage,
+        )
+
+
+def _create_limits(
+    timeout_s: float,
+    memory_limit_mb: float,
+    wall_timeout_s: float | None,
+    output_limit_mb: float | None,
+) -> LaunchLimits:
+    return LaunchLimits(
+        timeout_s,
+        memory_limit_mb,
+        wall_timeout_s or timeout_s,
+        -1 if output_limit_mb is None else output_limit_mb,
+    )
+
+
+class AgentPool:
+    """
+    Warm agents, one per execution slot.
+
+    Agent of a slot only ever sees the workdir of that slot.
+    Agents are posix only, on other platforms none are given out.
+    """
+
+    def __init__(
+        self,
+        get_command: Callable[[str], Sequence[str]],
+        output_limit_bytes: int | None = None,
+    ) -> None:
+        self.get_command = get_command
+        self.output_limit_bytes = output_limit_bytes
+        self.agents: dict[int, SandboxAgent] = {}
+
+    def get(self, slot: ExecutionSlot | None) -> SandboxAgent | None:
+        """Get agent of the slot, if slot is given."""
+        if slot is None or sys.platform == "win32":
+            return None
+        if slot.index not in self.agents:
+            workdir = os.path.abspath(slot.workdir)
+            Path(workdir).mkdir(parents=True, exist_ok=True)
+            self.agents[slot.index] = SandboxAgent(
+                self.get_command(workdir),
+                slot.cpus,
+                self.output_limit_bytes,
+            )
+        return self.agents[slot.index]
+
+    async def stop(self) -> None:
+        """Stop all agents, they are restarted on demand."""
+        for agent in self.agents.values():
+            await agent.stop()  # noqa: WPS476
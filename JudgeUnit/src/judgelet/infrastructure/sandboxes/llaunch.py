@@ -0,0 +1,71 @@
+"""Interaction with llaunch, the limited launcher."""
+
+import contextlib
+import json
+import os
+from pathlib import Path
+from typing import Final
+
+from judgelet.domain.results import ResourceUsage
+
+REPORT_FILE: Final = ".llaunch_report.json"
+LLAUNCH_FILE: Final = "llaunch.py"
+
+
+def get_llaunch_path() -> str:
+    """
+    Get absolute path of llaunch installed with judgelet.
+
+    llaunch is run from there, it is never copied into workspaces.
+    """
+    return os.path.abspath(LLAUNCH_FILE)
+
+
+def get_llaunch_serve_command() -> list[str]:
+    """Get command that starts persistent llaunch."""
+    return ["python3", get_llaunch_path(), "--serve"]
+
+
+def get_llaunch_command(  # noqa: WPS211 (too many args)
+    platform: str,
+    time_limit: float,
+    mem_limit: float,
+    target: str,
+    wall_time_limit: float | None = None,
+    output_limit_mb: float | None = None,
+) -> str:
+    """Get command that runs target under llaunch."""
+    limits = f"--report {REPORT_FILE} {time_limit} {mem_limit}"
+    if wall_time_limit is not None:
+        limits = f"--wall-time {wall_time_limit} {limits}"
+    if output_limit_mb is not None:
+        limits = f"--output-limit {output_limit_mb} {limits}"
+    llaunch_path = get_llaunch_path()
+    if platform == "win32":
+        return f'py "{llaunch_path}" {limits} {target}'
+    return f'python3 "{llaunch_path}" {limits} "{target}"'
+
+
+def pop_usage_report(sandbox_dir: str) -> ResourceUsage | None:
+    """
+    Read and remove the report llaunch has left in sandbox dir.
+
+    Returns:
+        used resources or None if llaunch did not leave a valid report
+
+    """
+    report_path = Path(sandbox_dir, REPORT_FILE)
+    try:
+        report = json.loads(report_path.read_text())
+    except (OSError, ValueError):
+        return None
+    with contextlib.suppress(OSError):
+        report_path.unlink()
+    try:
+        return ResourceUsage(
+            cpu_time_s=float(report["cpu_time_s"]),
+            wall_time_s=float(report["wall_time_s"]),
+            peak_memory_mb=float(report["peak_memory_mb"]),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -1,112 +1,52 @@
-import shutil
-import sys
-import time
 from collections.abc import Mapping
-from pathlib import Path
 from typing import override
 
-from structlog import get_logger
-
 from judgelet.application.interfaces import SandboxFactory
-from judgelet.domain.files import FileSystem
-from judgelet.domain.sandbox import Sandbox, SandboxExitCause, SandboxResult
-from judgelet.infrastructure import shell_executor
-
-
-class SimpleSandbox(Sandbox):
+from judgelet.domain.files import Workspace
+from judgelet.domain.sandbox import Sandbox
+from judgelet.domain.slots import ExecutionSlot
+from judgelet.infrastructure.sandboxes.launching import (
+    AgentPool,
+    LlaunchSandbox,
+)
+from judgelet.infrastructure.sandboxes.llaunch import (
+    get_llaunch_serve_command,
+)
+
+
+class SimpleSandbox(LlaunchSandbox):
     """Simple sandbox that uses llaunch to control resources."""
 
-    def __init__(
-        self,
-        fs: FileSystem,
-        sandbox_dir: str,
-        encoding: str | None = None,
-        environment: Mapping[str, str] | None = None,
-    ) -> None:
-        super().__init__(fs, sandbox_dir, encoding, environment)
-        self.log = get_logger().bind(dir=sandbox_dir)
-
-    @override
-    async def run(
-            self,
-            cmd: str,
-            proc_input: str,
-            timeout_s: float,
-            memory_limit_mb: float,
-    ) -> SandboxResult:
-        clean_command = cmd.replace('"', r'\"')
-        self.log.info("Copied llaunch")
-        shutil.copy("llaunch.py", Path(self.sandbox_dir, "llaunch.py"))
-        self.log.info(
-            "Launching %s, M<=%s, T<=%s",
-            clean_command, memory_limit_mb, timeout_s,
-        )
-        start = time.time()
-        result = await shell_executor.execute_in_shell(
-            _get_command(
-                sys.platform, timeout_s, memory_limit_mb, clean_command,
-            ),
-            proc_input=proc_input,
-            cwd=self.sandbox_dir,
-            io_encoding=self.encoding,
-            env=self.environment,
-        )
-        elapsed = time.time() - start
-        if result.return_code == shell_executor.MEMORY_LIMIT_EXIT_CODE:
-            self.log.info("Memory limit exceeded")
-            return SandboxResult(
-                return_code=result.return_code,
-                cause=SandboxExitCause.MEMORY_LIMIT_EXCEEDED,
-            )
-        if result.return_code == shell_executor.TIMEOUT_EXIT_CODE:
-            self.log.info(
-                "Time limit exceeded",
-                gross_error=elapsed - timeout_s,
-            )
-            return SandboxResult(
-                return_code=result.return_code,
-                cause=SandboxExitCause.TIME_LIMIT_EXCEEDED,
-            )
-        self.log.info(
-            "Launched and exited with return code %s", result.return_code,
-        )
-        return SandboxResult(
-            stdout=result.stdout,
-            stderr=result.stderr,
-            return_code=result.return_code,
-            cause=SandboxExitCause.PROCESS_EXITED,
-        )
-
-    @override
-    def close(self) -> None:
-        """Destroy the sandbox, but preserve temp files."""
 
-    @override
-    def destroy(self) -> None:
-        """Destroy the sandbox and delete all temp files."""
-        self.close()
+def _get_agent_command(workdir: str) -> list[str]:
+    return get_llaunch_serve_command()
 
 
-def _get_command(
-    platform: str,
-    time_limit: float,
-    mem_limit: float,
-    target: str,
-) -> str:
-    if platform == "win32":
-        return f"py -m llaunch {time_limit} {mem_limit} {target}"
-    return f'python3 -m llaunch {time_limit} {mem_limit} "{target}"'
+class SimpleSandboxFactory(SandboxFactory):
+    """
+    Simple sandbox factory.
 
+    Keeps a persistent llaunch per execution slot,
+    so tests do not start a new interpreter each.
+    """
 
-class SimpleSandboxFactory(SandboxFactory):
-    """Simple sandbox factory."""
+    def __init__(self, output_limit_bytes: int | None = None) -> None:
+        self.output_limit_bytes = output_limit_bytes
+        self.agents = AgentPool(_get_agent_command, output_limit_bytes)
 
     @override
     def __call__(
             self,
-            fs: FileSystem,
-            sandbox_dir: str,
+            workspace: Workspace,
             encoding: str | None = None,
             environment: Mapping[str, str] | None = None,
+            slot: ExecutionSlot | None = None,
     ) -> Sandbox:
-        return SimpleSandbox(fs, sandbox_dir, encoding, environment)
+        return SimpleSandbox(
+            workspace,
+            encoding,
+            environment,
+            slot,
+            self.agents.get(slot),
+            self.output_limit_bytes,
+        )
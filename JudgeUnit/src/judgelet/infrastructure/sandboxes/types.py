@@ -1,3 +1,4 @@
+from collections.abc import Callable, Mapping, Sequence
 from types import MappingProxyType
 from typing import Final
 
@@ -6,17 +7,31 @@ from judgelet.config import SandboxType
 from judgelet.infrastructure.sandboxes.bubblewrap import (
     BubblewrapSandboxFactory,
 )
+from judgelet.infrastructure.sandboxes.cgroup import CgroupSandboxFactory
 from judgelet.infrastructure.sandboxes.simple import SimpleSandboxFactory
 
-_SANDBOXES: Final = MappingProxyType({
+_SANDBOXES: Final[
+    Mapping[SandboxType, Callable[[int | None], SandboxFactory]]
+] = MappingProxyType({
     SandboxType.SIMPLE: SimpleSandboxFactory,
-    SandboxType.BUBBLEWRAP: BubblewrapSandboxFactory,
+    SandboxType.CGROUP: CgroupSandboxFactory,
 })
 
 
-def get_sandbox_factory(sandbox_type: SandboxType) -> SandboxFactory:
-    """Retrieve a sandbox factory that corresponds to desired sandbox type."""
+def get_sandbox_factory(
+    sandbox_type: SandboxType,
+    output_limit_bytes: int | None = None,
+    read_only_dirs: Sequence[str] = (),
+) -> SandboxFactory:
+    """
+    Retrieve a sandbox factory that corresponds to desired sandbox type.
+
+    Sandboxes that hide the host filesystem still expose
+    ``read_only_dirs`` to processes.
+    """
+    if sandbox_type == SandboxType.BUBBLEWRAP:
+        return BubblewrapSandboxFactory(output_limit_bytes, read_only_dirs)
     try:
-        return _SANDBOXES[sandbox_type]()
+        return _SANDBOXES[sandbox_type](output_limit_bytes)
     except KeyError as exc:
         raise ValueError(f"Unregistered sandbox type {sandbox_type}") from exc
@@ -0,0 +1,187 @@
+import asyncio
+import os
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from contextlib import (
+    AbstractContextManager,
+    asynccontextmanager,
+    contextmanager,
+)
+from pathlib import Path
+from typing import override
+
+import psutil
+from structlog import get_logger
+
+from judgelet.application.interfaces import SlotQueueIsFull, SlotScheduler
+from judgelet.config import Config
+from judgelet.domain.slots import ExecutionSlot
+
+
+class FifoSlotScheduler(SlotScheduler):  # noqa: WPS214
+    """Hands out slots in order of arrival, with a bounded waiting queue."""
+
+    def __init__(
+        self,
+        slots: Sequence[ExecutionSlot],
+        max_queue_size: int,
+    ) -> None:
+        self._slots = tuple(slots)
+        self._free: deque[ExecutionSlot] = deque(self._slots)
+        self._waiters: deque[asyncio.Future[ExecutionSlot]] = deque()
+        self._max_queue_size = max_queue_size
+        self._room_waiters: list[asyncio.Future[None]] = []
+        self.log = get_logger()
+
+    @override
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[ExecutionSlot]:
+        slot = await self._take()
+        try:
+            yield slot
+        finally:
+            self._release(slot)
+
+    @override
+    def try_acquire(self) -> AbstractContextManager[ExecutionSlot] | None:
+        if not self._free or self._waiters:
+            return None
+        return _lease(self._free.popleft(), self._release)
+
+    @override
+    async def wait_for_room(self) -> None:
+        while self.is_saturated:
+            room: asyncio.Future[None] = (
+                asyncio.get_running_loop().create_future()
+            )
+            self._room_waiters.append(room)
+            await room
+
+    @override
+    @property
+    def total_slots(self) -> int:
+        return len(self._slots)
+
+    @override
+    @property
+    def free_slots(self) -> int:
+        return len(self._free)
+
+    @override
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    @override
+    @property
+    def is_saturated(self) -> bool:
+        is_queue_full = len(self._waiters) >= self._max_queue_size
+        return not self._free and is_queue_full
+
+    async def _take(self) -> ExecutionSlot:
+        if self._free and not self._waiters:
+            return self._free.popleft()
+        if len(self._waiters) >= self._max_queue_size:
+            raise SlotQueueIsFull
+        waiter: asyncio.Future[ExecutionSlot] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._waiters.append(waiter)
+        self.log.info("Waiting for a slot", queue_depth=self.queue_depth)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            self._forget(waiter)
+            raise
+
+    def _forget(self, waiter: asyncio.Future[ExecutionSlot]) -> None:
+        if waiter.done() and not waiter.cancelled():
+            self._release(waiter.result())
+        elif waiter in self._waiters:
+            self._waiters.remove(waiter)
+            _wake_all(self._room_waiters)
+
+    def _release(self, slot: ExecutionSlot) -> None:
+        # either the queue gets shorter or a slot becomes free
+        _wake_all(self._room_waiters)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(slot)
+                return
+        self._free.append(slot)
+
+
+def _wake_all(futures: list[asyncio.Future[None]]) -> None:
+    for future in futures:
+        if not future.done():
+            future.set_result(None)
+    futures.clear()
+
+
+@contextmanager
+def _lease(
+    slot: ExecutionSlot,
+    release: Callable[[ExecutionSlot], None],
+) -> Iterator[ExecutionSlot]:
+    try:
+        yield slot
+    finally:
+        release(slot)
+
+
+def create_slot_scheduler(config: Config) -> FifoSlotScheduler:
+    """Create scheduler with slots described by config."""
+    slot_count = 1 if config.enable_lock else (
+        config.slots or default_slot_count()
+    )
+    max_queue_size = config.max_queue_size
+    if max_queue_size is None:
+        max_queue_size = slot_count
+    cpu_sets = _allocate_cpu_sets(
+        _available_cpus() if config.pin_cpus else [],
+        slot_count,
+    )
+    return FifoSlotScheduler(
+        [
+            ExecutionSlot(
+                index=index,
+                cpus=cpus,
+                workdir=str(Path(config.workdir, f"slot_{index}")),
+            )
+            for index, cpus in enumerate(cpu_sets)
+        ],
+        max_queue_size,
+    )
+
+
+def default_slot_count() -> int:
+    """Physical cores minus one, which is left to the judgelet itself."""
+    cores = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+    return max(cores - 1, 1)
+
+
+def _available_cpus() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return []
+
+
+def _allocate_cpu_sets(
+    cpus: Sequence[int],
+    slot_count: int,
+) -> list[frozenset[int]]:
+    """
+    Split CPUs into equal chunks, one per slot.
+
+    One chunk is reserved for the judgelet process. If there are more
+    slots than CPUs, chunks are reused in round-robin manner.
+    """
+    if not cpus:
+        return [frozenset() for _ in range(slot_count)]
+    chunk = max(len(cpus) // (slot_count + 1), 1)
+    chunks = [
+        frozenset(cpus[start:start + chunk])
+        for start in range(0, len(cpus) - chunk + 1, chunk)
+    ]
+    return [chunks[index % len(chunks)] for index in range(slot_count)]
@@ -1,122 +1,209 @@
 """Abstract from dealing with subprocesses."""
 
 import asyncio
+import contextlib
 import os
-import subprocess
+import signal
 import sys
+from collections.abc import Callable, Collection
+from pathlib import Path
 from typing import Any, Final
 
 from attrs import frozen
 
-from judgelet.infrastructure.encoding import try_to_decode
+if sys.platform != "win32":  # noqa: WPS226 (mypy needs the literal)
+    # imported here, because importing in a forked child of
+    # a multi-threaded process may deadlock on the import lock
+    import resource
 
 
 @frozen
 class ShellResult:
-    """Result of a single process run."""
+    """Result of a single process run, outputs are raw bytes."""
 
-    stdout: str
-    stderr: str
+    stdout: bytes
+    stderr: bytes
     return_code: int
 
 
 MEMORY_LIMIT_EXIT_CODE: Final = 170
 TIMEOUT_EXIT_CODE: Final = 171
-DEFAULT_ENCODING: Final = "utf-8"
+OUTPUT_LIMIT_EXIT_CODE: Final = 172
 
+_PIPE_CHUNK_SIZE: Final = 65536
+_SHELL_SIGNAL_BASE: Final = 128
 
-async def execute_in_shell(
+
+async def execute_in_shell(  # noqa: WPS211 (too many args)
         command: str,
         *,
-        proc_input: str = "",
+        proc_input: bytes | Path = b"",
         cwd: str | None = None,
         env: Any | None = None,
-        io_encoding: str | None = None,
+        cpus: Collection[int] | None = None,
+        cgroup: str | None = None,
+        output_limit: int | None = None,
 ) -> ShellResult:
     """
     Execute command in shell as an asyncio subprocess.
 
+    Stdin is fed while stdout and stderr are drained, so a process
+    producing a lot of output never blocks on a full pipe.
+    If either of them grows beyond ``output_limit`` bytes, the process
+    is killed right away and its output is dropped. Files written by
+    the process are capped by the same limit (RLIMIT_FSIZE).
+    The process is started in its own session, so if the awaiting
+    task is cancelled, the whole process group is killed.
+
     Args:
         command: target command
-        proc_input: stdin for process
+        proc_input: stdin for process, or file to redirect it from
         cwd: working directory for process
         env: environment dict
-        io_encoding: stdin, stdout, stderr encoding
+        cpus: CPUs to pin the process to, if supported by platform
+        cgroup: cgroup v2 directory the process should be moved into
+            before it starts
+        output_limit: how many bytes of stdout and of stderr to accept
 
     Returns:
-        return code, decoded stdout and stderr
+        return code, stdout and stderr as they are;
+        ``OUTPUT_LIMIT_EXIT_CODE`` and no output if output limit is hit
 
     """
-    io_encoding = io_encoding or DEFAULT_ENCODING
-    if True:  # noqa: WPS314 TODO: fix async shell
-        return _execute_in_sync_shell(
+    with contextlib.ExitStack() as stdin_stack:
+        proc = await asyncio.create_subprocess_shell(
             command,
-            proc_input=proc_input, cwd=cwd, env=env, io_encoding=io_encoding,
+            stdin=_open_stdin(proc_input, stdin_stack),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            env=os.environ | (env or {}),
+            start_new_session=sys.platform != "win32",
+            preexec_fn=get_preexec_fn(cpus, cgroup, output_limit),
         )
-    return await _execute_in_async_shell(  # type: ignore[unreachable]
-        command,
-        proc_input=proc_input, cwd=cwd, env=env, io_encoding=io_encoding,
-    )
-
-
-async def _execute_in_async_shell(
-    command: str,
-    *,
-    proc_input: str = "",
-    cwd: str | None = None,
-    env: Any | None = None,
-    io_encoding: str = DEFAULT_ENCODING,
-) -> ShellResult:
-    proc = await asyncio.create_subprocess_shell(
-        command,
-        stdin=asyncio.subprocess.PIPE,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        cwd=cwd,
-        env=env,
-    )
-    if not proc.stdin:
-        raise ValueError("Proc stdin is None")
-    proc.stdin.write(proc_input.encode(io_encoding))
-    proc.stdin.write_eof()
-    proc.stdin.close()
-    return_code = await proc.wait()
-    if not proc.stdout or not proc.stderr:
-        raise ValueError("Proc stdout/stderr is None")
-    stdout = try_to_decode(await proc.stdout.read(), preferred=io_encoding)
-    stderr = try_to_decode(await proc.stderr.read(), preferred=io_encoding)
     try:  # noqa: WPS229 (too long try)
-        proc.terminate()
-        proc.kill()
-    except ProcessLookupError:
-        pass  # noqa: WPS420 (ignore)
+        stdout, stderr, _ = await asyncio.gather(
+            _drain(proc, proc.stdout, output_limit),
+            _drain(proc, proc.stderr, output_limit),
+            _feed(proc.stdin, proc_input),
+        )
+        return_code = await proc.wait()
+    except BaseException:
+        _kill_process_group(proc)
+        await proc.wait()
+        raise
+    _kill_process_group(proc)  # reap anything left behind in the group
+    if stdout is None or stderr is None:
+        return ShellResult(b"", b"", OUTPUT_LIMIT_EXIT_CODE)
+    if output_limit is not None and _is_file_size_exceeded(return_code):
+        return ShellResult(b"", b"", OUTPUT_LIMIT_EXIT_CODE)
     return ShellResult(stdout, stderr, return_code)
 
 
-def _execute_in_sync_shell(
-    command: str,
-    *,
-    proc_input: str = "",
-    cwd: str | None = None,
-    env: Any | None = None,
-    io_encoding: str | None = None,
-) -> ShellResult:
-    io_encoding = io_encoding or DEFAULT_ENCODING
-    proc = subprocess.Popen(
-        command,
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        cwd=cwd,
-        env=os.environ | (env or {}),
-        shell=sys.platform != "win32",
-    )
-    stdout, stderr = proc.communicate(proc_input.encode(io_encoding))
-    stdout_str = try_to_decode(stdout, preferred=io_encoding)
-    stderr_str = try_to_decode(stderr, preferred=io_encoding)
+def _open_stdin(
+    proc_input: bytes | Path,
+    stack: contextlib.ExitStack,
+) -> Any:
+    if isinstance(proc_input, Path):
+        # child gets its own descriptor, ours is closed once it is spawned
+        return stack.enter_context(open(proc_input, "rb"))  # noqa: WPS515
+    return asyncio.subprocess.PIPE
+
+
+async def _feed(
+    stream: asyncio.StreamWriter | None,
+    payload: bytes | Path,
+) -> None:
+    if isinstance(payload, Path):
+        return
+    if stream is None:
+        raise ValueError("Proc stdin is None")
     try:  # noqa: WPS229 (too long try)
-        proc.terminate()
-        proc.kill()
-    except ProcessLookupError:
-        pass  # noqa: WPS420 (ignore)
-    return ShellResult(stdout_str, stderr_str, proc.returncode)
+        stream.write(payload)
+        await stream.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass  # noqa: WPS420 (process does not care about its stdin)
+    finally:
+        stream.close()
+        with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+            await stream.wait_closed()
+
+
+async def _drain(
+    proc: asyncio.subprocess.Process,
+    stream: asyncio.StreamReader | None,
+    limit: int | None,
+) -> bytes | None:
+    """
+    Read stream till the end.
+
+    If more than limit is written, kills the process and returns None.
+    Stream is still read to the end, as process can not be awaited
+    while its pipes are open.
+    """
+    if stream is None:
+        raise ValueError("Proc stdout/stderr is None")
+    chunks: list[bytes] = []
+    size = 0
+    is_exceeded = False
+    while chunk := await stream.read(_PIPE_CHUNK_SIZE):
+        size += len(chunk)
+        if is_exceeded:
+            continue
+        if limit is not None and size > limit:
+            is_exceeded = True
+            chunks.clear()
+            _kill_process_group(proc)
+        else:
+            chunks.append(chunk)
+    return None if is_exceeded else b"".join(chunks)
+
+
+def get_preexec_fn(
+    cpus: Collection[int] | None,
+    cgroup: str | None,
+    file_size_limit: int | None = None,
+) -> Callable[[], None] | None:
+    """
+    Get function to run in a forked child before exec.
+
+    It moves the child into cgroup, pins it to CPUs and limits size
+    of files it writes, if requested.
+    """
+    pin = cpus and hasattr(os, "sched_setaffinity")
+    if not pin and cgroup is None and file_size_limit is None:
+        return None
+
+    def preexec() -> None:  # noqa: WPS430 (runs in forked child)
+        if cgroup is not None:
+            with open(os.path.join(cgroup, "cgroup.procs"), "w") as procs:
+                procs.write("0")
+        if pin:
+            os.sched_setaffinity(0, cpus)  # type: ignore[arg-type]
+        if file_size_limit is not None:
+            _set_file_size_limit(file_size_limit)
+
+    return preexec
+
+
+def _set_file_size_limit(limit: int) -> None:
+    resource.setrlimit(resource.RLIMIT_FSIZE, (limit, limit))
+
+
+def _is_file_size_exceeded(return_code: int) -> bool:
+    if sys.platform == "win32":
+        return False
+    # shell reports a child killed by a signal as 128 + signal number
+    return return_code in {
+        -signal.SIGXFSZ, _SHELL_SIGNAL_BASE + signal.SIGXFSZ,
+    }
+
+
+def _kill_process_group(proc: asyncio.subprocess.Process) -> None:
+    try:
+        if sys.platform == "win32":
+            proc.kill()
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass  # noqa: WPS420 (already dead)
@@ -0,0 +1,71 @@
+"""Test data spooled to the local disk."""
+
+import contextlib
+import itertools
+import mmap
+import shutil
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Final, override
+
+from judgelet.application.interfaces import BlobSpool
+from judgelet.domain.files import Blob, MemoryBlob
+
+_MEMORY_THRESHOLD: Final = 65536
+
+
+class FileBlob(Blob):
+    """Blob backed by a file, it is viewed through mmap."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    @override
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @override
+    def read(self) -> bytes:
+        return self._path.read_bytes()
+
+    @override
+    @contextlib.contextmanager
+    def view(self) -> Iterator[memoryview]:
+        with open(self._path, "rb") as blob_file:
+            if not self._path.stat().st_size:
+                yield memoryview(b"")
+                return
+            with (
+                mmap.mmap(
+                    blob_file.fileno(), 0, access=mmap.ACCESS_READ,
+                ) as mapped,
+                memoryview(mapped) as mapped_view,
+            ):
+                yield mapped_view
+
+
+class DiskBlobSpool(BlobSpool):
+    """
+    Spool of a single suite, every blob is a file in its own directory.
+
+    Small blobs are not worth a file, so they stay in memory.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root, uuid.uuid4().hex)
+        self._counter = itertools.count()
+
+    @override
+    def put(self, contents: bytes) -> Blob:
+        if len(contents) < _MEMORY_THRESHOLD:
+            return MemoryBlob(contents)
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"{next(self._counter)}.bin"
+        path.write_bytes(contents)
+        return FileBlob(path)
+
+    @override
+    def close(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
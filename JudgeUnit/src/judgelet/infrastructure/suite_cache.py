@@ -0,0 +1,114 @@
+"""Suites cached in memory, their test data stays in spools."""
+
+import asyncio
+import contextlib
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from typing import final, override
+
+from structlog import get_logger
+
+from judgelet.application.interfaces import BlobSpool, SuiteCache
+from judgelet.domain.test_suite import TestSuite
+from judgelet.infrastructure.spool import DiskBlobSpool
+
+
+@final
+class _Entry:
+    """Cached suite, its spool is closed once evicted and unused."""
+
+    def __init__(self, suite: TestSuite, spool: BlobSpool) -> None:
+        self.suite = suite
+        self.spool = spool
+        self.users = 0
+        self.is_evicted = False
+
+    def lease(self) -> contextlib.AbstractContextManager[TestSuite]:
+        self.users += 1
+        return self._hold()
+
+    def evict(self) -> None:
+        self.is_evicted = True
+        self._close_if_unused()
+
+    @contextlib.contextmanager
+    def _hold(self) -> Iterator[TestSuite]:
+        try:
+            yield self.suite
+        finally:
+            self.users -= 1
+            self._close_if_unused()
+
+    def _close_if_unused(self) -> None:
+        if self.is_evicted and not self.users:
+            self.spool.close()
+
+
+class LruSuiteCache(SuiteCache):
+    """
+    Keeps up to ``capacity`` suites, least recently used are evicted.
+
+    Evicted suites still being checked keep their spooled data
+    until the last check finishes. Zero capacity disables the cache.
+    Hashes are not verified: it is up to the caller to send
+    the same suite with the same hash.
+    """
+
+    def __init__(self, spool_dir: str, capacity: int) -> None:
+        self.spool_dir = spool_dir
+        self.capacity = capacity
+        self.log = get_logger()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    @override
+    def get(
+        self, suite_hash: str,
+    ) -> contextlib.AbstractContextManager[TestSuite] | None:
+        entry = self._entries.get(suite_hash)
+        if entry is None:
+            return None
+        self._entries.move_to_end(suite_hash)
+        return entry.lease()
+
+    @override
+    async def put(
+        self,
+        suite_hash: str,
+        load: Callable[[BlobSpool], TestSuite],
+    ) -> contextlib.AbstractContextManager[TestSuite]:
+        cached = self.get(suite_hash)
+        if cached is not None:
+            return cached
+        spool = DiskBlobSpool(self.spool_dir)
+        suite = await _load_in_thread(load, spool)
+        cached = self.get(suite_hash)
+        if cached is not None:
+            # the same suite was loaded by a concurrent request
+            spool.close()
+            return cached
+        entry = _Entry(suite, spool)
+        lease = entry.lease()
+        self._entries[suite_hash] = entry
+        self._evict()
+        return lease
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.capacity:
+            suite_hash, entry = self._entries.popitem(last=False)
+            entry.evict()
+            self.log.info("Evicted suite", suite_hash=suite_hash)
+
+
+async def _load_in_thread(
+    load: Callable[[BlobSpool], TestSuite], spool: BlobSpool,
+) -> TestSuite:
+    loading = asyncio.ensure_future(asyncio.to_thread(load, spool))
+    try:
+        return await asyncio.shield(loading)
+    except asyncio.CancelledError:
+        # spool can be removed only once the thread stops writing to it
+        loading.add_done_callback(lambda _: spool.close())
+        raise
+    except BaseException:
+        spool.close()
+        raise
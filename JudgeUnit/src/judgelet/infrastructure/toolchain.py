@@ -0,0 +1,55 @@
+"""Identify sources and toolchains compilation depends on."""
+
+import functools
+import hashlib
+import subprocess
+from pathlib import Path
+from typing import Final
+
+from judgelet.domain.files import Workspace
+
+_HASH_CHUNK_SIZE: Final = 65536
+
+
+def compute_compile_cache_key(workspace: Workspace, *toolchain: str) -> str:
+    """
+    Hash sources in the workspace together with toolchain description.
+
+    Every file in the workspace is considered a source, because
+    additional files of a suite may be included by the solution.
+    """
+    digest = hashlib.sha256()
+    for part in toolchain:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    root = workspace.path
+    for path in sorted(root.rglob("*")):
+        if path.is_file():
+            digest.update(path.relative_to(root).as_posix().encode())
+            digest.update(b"\0")
+            digest.update(hash_file(path).encode())
+    return digest.hexdigest()
+
+
+@functools.cache
+def get_toolchain_version(compiler: str) -> str:
+    """Get version banner of a compiler, computed once per process."""
+    try:
+        version = subprocess.run(
+            [compiler, "--version"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return ""
+    return version.stdout
+
+
+def hash_file(path: Path) -> str:
+    """Get sha256 of file contents."""
+    digest = hashlib.sha256()
+    with path.open("rb") as file_handle:
+        while chunk := file_handle.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -1,5 +1,6 @@
 from .conftest import (
     StrSolutionPoster,
+    ZipSolutionPoster,
     create_group,
     create_suite,
     create_test,
@@ -52,3 +53,59 @@ def test_imports(post_str_solution: StrSolutionPoster):
     assert is_ok, result
     assert result.verdict == "OK", result
     assert result.score == 100, result
+
+
+def test_modules(post_zip_solution: ZipSolutionPoster):
+    """Test that python solution could import its own modules."""
+    test_suite = create_suite(
+        create_group(
+            "A",
+            create_test(
+                create_validator("stdout", expected="Hello, World!"),
+                stdin="",
+            ),
+        ),
+    )
+    is_ok, result, _ = post_zip_solution(
+        {
+            "main.py":
+                """
+                import greeting
+                greeting.say()
+                """,
+            "greeting.py":
+                """
+                def say():
+                    print("Hello, World!")
+                """,
+        },
+        "main.py",
+        "python",
+        test_suite,
+    )
+    assert is_ok, result
+    assert result.verdict == "OK", result
+    assert result.score == 100, result
+
+
+def test_syntax_error(post_str_solution: StrSolutionPoster):
+    """Test that syntax error is reported as compilation error."""
+    test_suite = create_suite(
+        create_group(
+            "A",
+            create_test(
+                create_validator("stdout", expected="Hello, World!"),
+                stdin="",
+            ),
+        ),
+    )
+    is_ok, result, _ = post_str_solution(
+        """
+        print("Hello, World!"
+        """,
+        "python",
+        test_suite,
+    )
+    assert is_ok, result
+    assert result.verdict == "CE", result
+    assert "SyntaxError" in result.compilation_error, result
@@ -0,0 +1,24 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from judgelet.infrastructure.cgroups import kill_on_cpu_limit
+
+
+def _write_cpu_usage(group: Path, usage_s: float) -> None:
+    usage_usec = int(usage_s * 1000000)
+    (group / "cpu.stat").write_text(f"usage_usec {usage_usec}\n")
+
+
+@pytest.mark.asyncio
+async def test_group_is_killed_beyond_cpu_limit(dir_test_data_container):
+    """Test that group is killed once it has used up CPU time."""
+    group = Path(dir_test_data_container)
+    _write_cpu_usage(group, 0.1)
+    watchdog = asyncio.create_task(kill_on_cpu_limit(group, 0.2))
+    await asyncio.sleep(0.05)
+    assert not (group / "cgroup.kill").exists()
+    _write_cpu_usage(group, 0.3)
+    await asyncio.wait_for(watchdog, timeout=5)
+    assert (group / "cgroup.kill").read_text() == "1"
@@ -0,0 +1,111 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from judgelet.domain.files import File
+from judgelet.infrastructure.compile_cache import DiskCompileCache
+from judgelet.infrastructure.filesystem import RealWorkspace
+from judgelet.infrastructure.languages.cpp import Cpp17Compiler
+from judgelet.infrastructure.toolchain import compute_compile_cache_key
+
+
+def _create_cache(root: str, quota_mb: float) -> DiskCompileCache:
+    return DiskCompileCache(str(Path(root, "cache")), quota_mb)
+
+
+def _create_workspace(root: str, name: str) -> RealWorkspace:
+    path = Path(root, name)
+    path.mkdir()
+    return RealWorkspace(path)
+
+
+@pytest.mark.asyncio
+async def test_store_and_restore(dir_test_data_container):
+    """Test that a stored artifact is placed into another workspace."""
+    cache = _create_cache(dir_test_data_container, 1)
+    source = _create_workspace(dir_test_data_container, "source")
+    target = _create_workspace(dir_test_data_container, "target")
+    source.save_file(File("binary", "compiled"))
+    assert not await cache.restore("key", target, ["binary"])
+    await cache.store("key", source, ["binary"])
+    assert await cache.restore("key", target, ["binary"])
+    assert target.get_file("binary") == File("binary", "compiled")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_restored_artifact_is_a_copy(dir_test_data_container):
+    """Test that an artifact modified after restoring stays intact in cache."""
+    cache = _create_cache(dir_test_data_container, 1)
+    source = _create_workspace(dir_test_data_container, "source")
+    source.save_file(File("binary", "compiled"))
+    await cache.store("key", source, ["binary"])
+    first = _create_workspace(dir_test_data_container, "first")
+    await cache.restore("key", first, ["binary"])
+    with Path(first.path, "binary").open("a") as binary:
+        binary.write("tampered")
+    second = _create_workspace(dir_test_data_container, "second")
+    assert await cache.restore("key", second, ["binary"])
+    assert second.get_file("binary") == File("binary", "compiled")
+
+
+@pytest.mark.asyncio
+async def test_corrupted_entry_is_dropped(dir_test_data_container):
+    """Test that an entry not matching its checksums is not reused."""
+    cache = _create_cache(dir_test_data_container, 1)
+    source = _create_workspace(dir_test_data_container, "source")
+    source.save_file(File("binary", "compiled"))
+    await cache.store("key", source, ["binary"])
+    with Path(cache.root, "key", "binary").open("a") as binary:
+        binary.write("corrupted")
+    target = _create_workspace(dir_test_data_container, "target")
+    assert not await cache.restore("key", target, ["binary"])
+    assert not Path(cache.root, "key").exists()
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_is_evicted(dir_test_data_container):
+    """Test that the quota is kept by evicting old entries."""
+    cache = _create_cache(dir_test_data_container, 0.001)
+    source = _create_workspace(dir_test_data_container, "source")
+    target = _create_workspace(dir_test_data_container, "target")
+    source.save_file(File("binary", "x" * 400))
+    await cache.store("old", source, ["binary"])
+    os.utime(Path(cache.root, "old"), (0, 0))
+    await cache.store("new", source, ["binary"])
+    await cache.store("newest", source, ["binary"])
+    assert not await cache.restore("old", target, ["binary"])
+    assert await cache.restore("newest", target, ["binary"])
+
+
+@pytest.mark.asyncio
+async def test_zero_quota_disables_cache(dir_test_data_container):
+    """Test that nothing is cached with zero quota."""
+    cache = _create_cache(dir_test_data_container, 0)
+    source = _create_workspace(dir_test_data_container, "source")
+    source.save_file(File("binary", "compiled"))
+    await cache.store("key", source, ["binary"])
+    assert not await cache.restore("key", source, ["binary"])
+
+
+def test_key_depends_on_sources(dir_test_data_container):
+    """Test that the key changes with sources and toolchain."""
+    workspace = _create_workspace(dir_test_data_container, "source")
+    workspace.save_file(File("main.cpp", "int main() {}"))
+    key = compute_compile_cache_key(workspace, "g++", "-O2")
+    assert key == compute_compile_cache_key(workspace, "g++", "-O2")
+    assert key != compute_compile_cache_key(workspace, "g++", "-O0")
+    workspace.save_file(File("main.cpp", "int main() { return 0; }"))
+    assert key != compute_compile_cache_key(workspace, "g++", "-O2")
+
+
+@pytest.mark.asyncio
+async def test_backend_key_depends_on_target(dir_test_data_container: str):
+    """Test that backend computes the key of its compilation command."""
+    workspace = _create_workspace(dir_test_data_container, "source")
+    workspace.save_file(File("main.cpp", "int main() {}"))
+    backend = Cpp17Compiler()
+    key = await backend.get_compile_cache_key(workspace, "main.cpp")
+    assert key == await backend.get_compile_cache_key(workspace, "main.cpp")
+    assert key != await backend.get_compile_cache_key(workspace, "other.cpp")
@@ -31,7 +31,7 @@ def test_str_container(
     real_fs = RealFileSystem(dir_test_data_container)
 
     solution = StringSolution(uid="1", filename=filename, content=src)
-    solution_path = real_fs.place_solution(solution)
+    solution_path = real_fs.open_workspace(solution).path
 
     assert set(os.listdir(solution_path)) == {filename}
     assert Path(solution_path, filename).read_text() == src
@@ -60,7 +60,7 @@ def test_zip_container(
     real_fs = RealFileSystem(dir_test_data_container)
 
     solution = ZipSolution(uid="1", bin_data=zip_data, main_file=main_file)
-    solution_path = real_fs.place_solution(solution)
+    solution_path = real_fs.open_workspace(solution).path
 
     assert set(os.listdir(solution_path)) == archive_data.keys()
 
@@ -72,3 +72,44 @@ def test_zip_container(
     # This is kind of an unrelated assert, but I don't know where to put it.
     # Should move away, but for now, let it stay here
     assert solution.main_file == File(main_file, archive_data[main_file])
+
+
+def test_workspaces_are_isolated(dir_test_data_container: str):
+    """Test that concurrently open workspaces do not share files."""
+    real_fs = RealFileSystem(dir_test_data_container)
+    first = real_fs.open_workspace(StringSolution("1", "main.py", "first"))
+    second = real_fs.open_workspace(StringSolution("2", "main.py", "second"))
+
+    first.save_file(File("out", "from first"))
+    first.close()
+
+    assert first.get_file("main.py") is None
+    assert second.get_file("out") is None
+    assert second.get_file("main.py") == File("main.py", "second")
+
+
+def test_cloned_workspace_is_independent(dir_test_data_container: str):
+    """Test that a clone has all files, but changes do not leak back."""
+    real_fs = RealFileSystem(dir_test_data_container)
+    solution = StringSolution(uid="1", filename="main.py", content="code")
+    workspace = real_fs.open_workspace(solution)
+    clone = real_fs.clone_workspace(workspace)
+
+    assert clone.path != workspace.path
+    assert clone.get_file("main.py") == File("main.py", "code")
+    clone.save_file(File("input.txt", "data"))
+    assert workspace.get_file("input.txt") is None
+
+
+def test_clone_copies_only_given_files(dir_test_data_container: str):
+    """Test that a clone can be limited to listed files."""
+    real_fs = RealFileSystem(dir_test_data_container)
+    solution = StringSolution(uid="1", filename="main.py", content="code")
+    workspace = real_fs.open_workspace(solution)
+    Path(workspace.path, "build").mkdir()
+    workspace.save_file(File("build/main.pyc", "bytecode"))
+    paths = workspace.list_files()
+    workspace.save_file(File("input.txt", "data"))
+    clone = real_fs.clone_workspace(workspace, paths=paths)
+
+    assert sorted(clone.list_files()) == ["build/main.pyc", "main.py"]
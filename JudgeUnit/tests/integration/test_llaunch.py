@@ -0,0 +1,135 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from judgelet.infrastructure.sandboxes.llaunch import (
+    REPORT_FILE,
+    pop_usage_report,
+)
+from judgelet.infrastructure.shell_executor import (
+    MEMORY_LIMIT_EXIT_CODE,
+    TIMEOUT_EXIT_CODE,
+    execute_in_shell,
+)
+
+_PYTHON = sys.executable
+_LLAUNCH = Path(__file__).parents[2] / "llaunch.py"
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="rusage is posix only",
+)
+
+
+async def _launch(
+    directory: str,
+    limits: str,
+    code: str,
+) -> int:
+    result = await execute_in_shell(
+        f"{_PYTHON} {_LLAUNCH} --report {REPORT_FILE} {limits} "
+        f"'{_PYTHON} -c \"{code}\"'",
+        cwd=directory,
+    )
+    return result.return_code
+
+
+@pytest.mark.asyncio
+async def test_usage_is_reported(dir_test_data_container):
+    """Test that llaunch reports resources used by the target."""
+    return_code = await _launch(
+        dir_test_data_container,
+        "5 256",
+        "data = bytearray(64 * 1024 * 1024); sum(range(10 ** 6))",
+    )
+    usage = pop_usage_report(dir_test_data_container)
+    assert return_code == 0
+    assert usage is not None
+    assert usage.peak_memory_mb >= 64
+    assert 0 < usage.cpu_time_s <= usage.wall_time_s + 1
+    assert not Path(dir_test_data_container, REPORT_FILE).exists()
+
+
+@pytest.mark.asyncio
+async def test_cpu_time_limit(dir_test_data_container):
+    """Test that a busy loop gets TL."""
+    return_code = await _launch(
+        dir_test_data_container, "0.5 256", "while True: pass",
+    )
+    assert return_code == TIMEOUT_EXIT_CODE
+    usage = pop_usage_report(dir_test_data_container)
+    assert usage is not None
+    assert usage.wall_time_s < 3
+
+
+@pytest.mark.asyncio
+async def test_wall_time_limit(dir_test_data_container):
+    """Test that a sleeping process is killed by the wall clock."""
+    return_code = await _launch(
+        dir_test_data_container,
+        "--wall-time 0.5 5 256",
+        "import time; time.sleep(10)",
+    )
+    assert return_code == TIMEOUT_EXIT_CODE
+    usage = pop_usage_report(dir_test_data_container)
+    assert usage is not None
+    assert usage.cpu_time_s < 0.5
+    assert usage.wall_time_s < 3
+
+
+@pytest.mark.asyncio
+async def test_memory_limit(dir_test_data_container):
+    """Test that peak RSS over the limit gets ML."""
+    return_code = await _launch(
+        dir_test_data_container,
+        "5 64",
+        "data = bytearray(128 * 1024 * 1024)",
+    )
+    assert return_code == MEMORY_LIMIT_EXIT_CODE
+
+
+@pytest.mark.skipif(
+    not Path("/proc").is_dir(), reason="memory is watched through procfs",
+)
+@pytest.mark.asyncio
+async def test_memory_limit_is_enforced_while_running(
+    dir_test_data_container,
+):
+    """Test that target is killed once it exceeds memory limit."""
+    return_code = await _launch(
+        dir_test_data_container,
+        "--wall-time 5 5 64",
+        "import time; data = bytearray(128 * 1024 * 1024); time.sleep(5)",
+    )
+    usage = pop_usage_report(dir_test_data_container)
+    assert return_code == MEMORY_LIMIT_EXIT_CODE
+    assert usage is not None
+    assert usage.wall_time_s < 2
+    assert usage.peak_memory_mb > 64
+
+
+@pytest.mark.skipif(
+    not Path("/proc").is_dir(), reason="memory is watched through procfs",
+)
+@pytest.mark.asyncio
+async def test_memory_of_child_forked_by_thread_is_watched(
+    dir_test_data_container,
+):
+    """Test that children forked by any thread count towards the limit."""
+    return_code = await _launch(
+        dir_test_data_container,
+        "--wall-time 5 5 64",
+        "import os, threading, time; "
+        "threading.Thread(target=lambda: os.fork() == 0 and ("
+        "bytearray(128 * 1024 * 1024), time.sleep(5), os._exit(0)"
+        ") or time.sleep(5)).start(); time.sleep(5)",
+    )
+    usage = pop_usage_report(dir_test_data_container)
+    assert return_code == MEMORY_LIMIT_EXIT_CODE
+    assert usage is not None
+    assert usage.wall_time_s < 2
+
+
+def test_missing_report(dir_test_data_container):
+    """Test that no report means no usage."""
+    assert pop_usage_report(dir_test_data_container) is None
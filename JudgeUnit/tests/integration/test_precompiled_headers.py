@@ -0,0 +1,49 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from judgelet.infrastructure.languages.headers import PrecompiledHeaders
+
+_COMPILER = shutil.which("g++")
+
+pytestmark = pytest.mark.skipif(_COMPILER is None, reason="g++ is required")
+
+_FLAGS = ("-std=c++17", "-O2")
+
+
+@pytest.mark.asyncio
+async def test_headers_are_used_by_compiler(dir_test_data_container):
+    """Test that compiler picks built headers up by include flags."""
+    headers = PrecompiledHeaders(
+        dir_test_data_container, "g++", _FLAGS, ["cstdio"],
+    )
+    assert headers.include_flags == ()
+    await headers.build()
+    assert headers.is_built
+    source = Path(dir_test_data_container, "main.cpp")
+    source.write_text("#include <cstdio>\nint main() { return 0; }\n")
+    compilation = subprocess.run(
+        [
+            str(_COMPILER), *_FLAGS, *headers.include_flags, "-H",
+            str(source), "-o", str(source.with_suffix("")),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert compilation.stderr.startswith(f"! {headers.directory}")
+    await headers.warm_up()
+
+
+@pytest.mark.asyncio
+async def test_failed_build_is_not_used(dir_test_data_container):
+    """Test that headers failed to build are skipped without leftovers."""
+    headers = PrecompiledHeaders(
+        dir_test_data_container, "g++", _FLAGS, ["no_such_header"],
+    )
+    await headers.build()
+    assert not headers.is_built
+    assert headers.include_flags == ()
+    assert not list(Path(dir_test_data_container).iterdir())
@@ -0,0 +1,223 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+from judgelet.infrastructure.sandboxes.agent import (
+    LaunchLimits,
+    SandboxAgent,
+    SandboxAgentError,
+)
+from judgelet.infrastructure.shell_executor import (
+    OUTPUT_LIMIT_EXIT_CODE,
+    TIMEOUT_EXIT_CODE,
+)
+
+_LLAUNCH = Path(__file__).parents[2] / "llaunch.py"
+_INTERPRETER = (sys.executable, "-E", "-s", "-S", "-B")
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="agent is posix only",
+)
+
+
+def _create_agent(output_limit_bytes: int | None = None) -> SandboxAgent:
+    return SandboxAgent(
+        [sys.executable, str(_LLAUNCH), "--serve"],
+        output_limit_bytes=output_limit_bytes,
+    )
+
+
+@pytest.mark.asyncio
+async def test_agent_is_reused(dir_test_data_container):
+    """Test that consecutive launches are served by the same agent."""
+    agent = _create_agent()
+    try:
+        first = await agent.launch(
+            "cat",
+            b"hello",
+            dir_test_data_container,
+            {},
+            LaunchLimits(5, 256, 5),
+        )
+        pid = agent._process.pid  # noqa: SLF001
+        second = await agent.launch(
+            'echo "$GREETING" >&2',
+            b"",
+            dir_test_data_container,
+            {"GREETING": "hi"},
+            LaunchLimits(5, 256, 5),
+        )
+        assert agent._process.pid == pid  # noqa: SLF001
+    finally:
+        await agent.stop()
+    assert (first.return_code, first.stdout) == (0, b"hello")
+    assert (second.return_code, second.stderr) == (0, b"hi\n")
+    assert first.usage.wall_time_s < 5
+
+
+@pytest.mark.asyncio
+async def test_agent_enforces_wall_time(dir_test_data_container):
+    """Test that a sleeping target gets TL from the agent."""
+    agent = _create_agent()
+    try:
+        reply = await agent.launch(
+            "sleep 10",
+            b"",
+            dir_test_data_container,
+            {},
+            LaunchLimits(5, 256, 0.3),
+        )
+    finally:
+        await agent.stop()
+    assert reply.return_code == TIMEOUT_EXIT_CODE
+
+
+@pytest.mark.asyncio
+async def test_cancelled_launch_restarts_agent(dir_test_data_container):
+    """Test that agent is replaced after a launch is cancelled."""
+    agent = _create_agent()
+    launch = asyncio.create_task(
+        agent.launch(
+            "sleep 10",
+            b"",
+            dir_test_data_container,
+            {},
+            LaunchLimits(5, 256, 10),
+        ),
+    )
+    await asyncio.sleep(0.5)
+    launch.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await launch
+    assert agent._process is None  # noqa: SLF001
+    try:
+        reply = await agent.launch(
+            "echo ok",
+            b"",
+            dir_test_data_container,
+            {},
+            LaunchLimits(5, 256, 5),
+        )
+    finally:
+        await agent.stop()
+    assert reply.stdout == b"ok\n"
+
+
+@pytest.mark.asyncio
+async def test_agent_enforces_output_limit(dir_test_data_container):
+    """Test that a flooding target is killed with output limit exceeded."""
+    agent = _create_agent(output_limit_bytes=1024 * 1024)
+    try:
+        reply = await agent.launch(
+            "yes",
+            b"",
+            dir_test_data_container,
+            {},
+            LaunchLimits(5, 256, 5, 1),
+        )
+    finally:
+        await agent.stop()
+    assert reply.return_code == OUTPUT_LIMIT_EXIT_CODE
+    assert len(reply.stdout) <= 1024 * 1024
+
+
+@pytest.mark.asyncio
+async def test_oversized_reply_is_rejected(dir_test_data_container):
+    """Test that output beyond the limit of the agent fails the launch."""
+    agent = _create_agent(output_limit_bytes=1024)
+    try:
+        with pytest.raises(SandboxAgentError):
+            await agent.launch(
+                "head -c 4000000 /dev/zero",
+                b"",
+                dir_test_data_container,
+                {},
+                LaunchLimits(5, 256, 5),
+            )
+        reply = await agent.launch(
+            "echo ok",
+            b"",
+            dir_test_data_container,
+            {},
+            LaunchLimits(5, 256, 5),
+        )
+    finally:
+        await agent.stop()
+    assert reply.stdout == b"ok\n"
+
+
+@pytest.mark.asyncio
+async def test_zygote_forks_scripts(dir_test_data_container):
+    """Test that scripts are run in fresh children of one zygote."""
+    Path(dir_test_data_container, "main.py").write_text(
+        "import os, sys\n"
+        "print(int(input()) * 2, os.getppid())\n"
+        "sys.exit(os.environ['CODE'])\n",
+    )
+    agent = _create_agent()
+    try:
+        replies = [
+            await agent.launch_script(  # noqa: WPS476
+                _INTERPRETER,
+                "main.py",
+                number.encode(),
+                dir_test_data_container,
+                {"CODE": "3"},
+                LaunchLimits(5, 256, 5),
+            )
+            for number in ("1", "2")
+        ]
+    finally:
+        await agent.stop()
+    outputs = [reply.stdout.split() for reply in replies]
+    assert [output[0] for output in outputs] == [b"2", b"4"]
+    assert outputs[0][1] == outputs[1][1]
+    assert [reply.stderr for reply in replies] == [b"3\n", b"3\n"]
+    assert [reply.return_code for reply in replies] == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_zygote_enforces_limits(dir_test_data_container):
+    """Test that limits are applied to forked children."""
+    Path(dir_test_data_container, "loop.py").write_text("while True: pass\n")
+    agent = _create_agent()
+    try:
+        reply = await agent.launch_script(
+            _INTERPRETER,
+            "loop.py",
+            b"",
+            dir_test_data_container,
+            {},
+            LaunchLimits(0.3, 256, 5),
+        )
+    finally:
+        await agent.stop()
+    assert reply.return_code == TIMEOUT_EXIT_CODE
+
+
+@pytest.mark.asyncio
+async def test_missing_interpreter_is_reported(dir_test_data_container):
+    """Test that zygote which could not start fails the launch."""
+    agent = _create_agent()
+    try:
+        with pytest.raises(SandboxAgentError):
+            await agent.launch_script(
+                ["no_such_python"],
+                "main.py",
+                b"",
+                dir_test_data_container,
+                {},
+                LaunchLimits(5, 256, 5),
+            )
+        reply = await agent.launch(
+            "echo ok",
+            b"",
+            dir_test_data_container,
+            {},
+            LaunchLimits(5, 256, 5),
+        )
+    finally:
+        await agent.stop()
+    assert reply.stdout == b"ok\n"
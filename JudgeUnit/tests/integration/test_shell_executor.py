@@ -0,0 +1,102 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from judgelet.infrastructure.shell_executor import (
+    OUTPUT_LIMIT_EXIT_CODE,
+    execute_in_shell,
+)
+
+_PYTHON = sys.executable
+
+
+@pytest.mark.asyncio
+async def test_stdin_is_delivered():
+    """Test that stdin reaches the process and stdout is collected."""
+    result = await execute_in_shell(
+        f'{_PYTHON} -c "print(int(input()) ** 2)"',
+        proc_input=b"3",
+    )
+    assert result.return_code == 0
+    assert result.stdout.strip() == b"9"
+
+
+@pytest.mark.asyncio
+async def test_large_io_does_not_deadlock():
+    """Test that big stdin and stdout do not block on full pipes."""
+    payload = b"x" * (4 * 1024 * 1024)
+    result = await asyncio.wait_for(
+        execute_in_shell(
+            f"{_PYTHON} -c "
+            '"import sys; data = sys.stdin.read(); '
+            'sys.stdout.write(data); sys.stderr.write(data)"',
+            proc_input=payload,
+        ),
+        timeout=30,
+    )
+    assert result.return_code == 0
+    assert len(result.stdout) == len(payload)
+    assert len(result.stderr) == len(payload)
+
+
+@pytest.mark.asyncio
+async def test_process_that_ignores_stdin():
+    """Test that a process exiting without reading stdin is fine."""
+    result = await execute_in_shell(
+        f'{_PYTHON} -c "pass"',
+        proc_input=b"x" * (1024 * 1024),
+    )
+    assert result.return_code == 0
+
+
+@pytest.mark.asyncio
+async def test_runs_do_not_block_each_other():
+    """Test that several runs proceed concurrently."""
+    start = time.monotonic()
+    results = await asyncio.gather(*(
+        execute_in_shell(f'{_PYTHON} -c "import time; time.sleep(1)"')
+        for _ in range(4)
+    ))
+    assert all(result.return_code == 0 for result in results)
+    assert time.monotonic() - start < 3
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="posix groups only")
+@pytest.mark.asyncio
+async def test_cancellation_kills_process_group(dir_test_data_container):
+    """Test that cancelling a run kills the child and its descendants."""
+    marker = Path(dir_test_data_container, "marker")
+    task = asyncio.create_task(execute_in_shell(
+        f'{_PYTHON} -c "import time; time.sleep(2)" & '
+        f"wait; touch {marker}",
+    ))
+    await asyncio.sleep(0.5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(2.5)
+    assert not marker.exists()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="posix limits only")
+@pytest.mark.parametrize(
+    "cmd",
+    [
+        "yes",
+        "yes >&2",
+        "head -c 2000000 /dev/zero > out.txt",
+    ],
+)
+@pytest.mark.asyncio
+async def test_output_limit(dir_test_data_container, cmd):
+    """Test that endless output and large files are cut off."""
+    result = await asyncio.wait_for(
+        execute_in_shell(
+            cmd, cwd=dir_test_data_container, output_limit=1024 * 1024,
+        ),
+        timeout=30,
+    )
+    assert result.return_code == OUTPUT_LIMIT_EXIT_CODE
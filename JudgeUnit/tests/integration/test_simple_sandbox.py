@@ -0,0 +1,106 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from judgelet.domain.files import MemoryBlob
+from judgelet.domain.sandbox import SandboxExitCause
+from judgelet.domain.slots import ExecutionSlot
+from judgelet.infrastructure.filesystem import RealWorkspace
+from judgelet.infrastructure.sandboxes.agent import SandboxAgent
+from judgelet.infrastructure.sandboxes.llaunch import LLAUNCH_FILE
+from judgelet.infrastructure.sandboxes.simple import (
+    SimpleSandbox,
+    SimpleSandboxFactory,
+)
+from judgelet.infrastructure.spool import FileBlob
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="agent is posix only",
+)
+
+
+@pytest.mark.parametrize("has_slot", [True, False])
+@pytest.mark.asyncio
+async def test_runs_without_copying_llaunch(dir_test_data_container, has_slot):
+    """Test that tests run both via agent and one-shot llaunch."""
+    slot = ExecutionSlot(0, frozenset(), dir_test_data_container)
+    workspace_dir = Path(dir_test_data_container, "s_1")
+    workspace_dir.mkdir()
+    stdin_path = Path(dir_test_data_container, "stdin.bin")
+    stdin_path.write_bytes(b"from file ")
+    factory = SimpleSandboxFactory()
+    sandbox = factory(
+        RealWorkspace(workspace_dir),
+        environment={"NAME": "world"},
+        slot=slot if has_slot else None,
+    )
+    try:
+        first = await sandbox.run(
+            "cat; printenv NAME", MemoryBlob(b"hello "), 5, 256,
+        )
+        second = await sandbox.run("sleep 10", MemoryBlob(b""), 5, 256, 0.3)
+        third = await sandbox.run("cat", FileBlob(stdin_path), 5, 256)
+    finally:
+        await factory.agents.stop()
+    assert (sandbox.agent is not None) == has_slot
+    assert first.stdout == b"hello world\n"
+    assert first.usage is not None
+    assert second.cause == SandboxExitCause.TIME_LIMIT_EXCEEDED
+    assert third.stdout == b"from file "
+    assert not Path(workspace_dir, LLAUNCH_FILE).exists()
+
+
+@pytest.mark.parametrize("has_slot", [True, False])
+@pytest.mark.asyncio
+async def test_output_limit(dir_test_data_container, has_slot):
+    """Test that flooding stdout ends with output limit exceeded."""
+    slot = ExecutionSlot(0, frozenset(), dir_test_data_container)
+    workspace_dir = Path(dir_test_data_container, "s_1")
+    workspace_dir.mkdir()
+    factory = SimpleSandboxFactory(output_limit_bytes=1024 * 1024)
+    sandbox = factory(
+        RealWorkspace(workspace_dir), slot=slot if has_slot else None,
+    )
+    try:
+        flood = await sandbox.run("yes", MemoryBlob(b""), 5, 256)
+        small = await sandbox.run("echo ok", MemoryBlob(b""), 5, 256)
+    finally:
+        await factory.agents.stop()
+    assert flood.cause == SandboxExitCause.OUTPUT_LIMIT_EXCEEDED
+    assert small.stdout == b"ok\n"
+
+
+@pytest.mark.asyncio
+async def test_falls_back_when_agent_fails(dir_test_data_container):
+    """Test that a broken agent does not fail the launch."""
+    workspace_dir = Path(dir_test_data_container, "s_1")
+    workspace_dir.mkdir()
+    agent = SandboxAgent(["sh", "-c", "read request; echo garbage"])
+    sandbox = SimpleSandbox(RealWorkspace(workspace_dir), agent=agent)
+    try:
+        result = await sandbox.run("echo ok", MemoryBlob(b""), 5, 256)
+    finally:
+        await agent.stop()
+    assert result.cause == SandboxExitCause.PROCESS_EXITED
+    assert result.stdout == b"ok\n"
+
+
+@pytest.mark.asyncio
+async def test_closing_sandbox_kills_agent(dir_test_data_container):
+    """Test that the next solution on the slot gets a fresh agent."""
+    slot = ExecutionSlot(0, frozenset(), dir_test_data_container)
+    factory = SimpleSandboxFactory()
+    pids = []
+    try:
+        for solution_id in ("s_1", "s_2"):
+            workspace_dir = Path(dir_test_data_container, solution_id)
+            workspace_dir.mkdir()
+            sandbox = factory(RealWorkspace(workspace_dir), slot=slot)
+            result = await sandbox.run("echo ok", MemoryBlob(b""), 5, 256)
+            pids.append(sandbox.agent._process.pid)  # noqa: SLF001
+            sandbox.close()
+    finally:
+        await factory.agents.stop()
+    assert result.stdout == b"ok\n"
+    assert pids[0] != pids[1]
@@ -0,0 +1,67 @@
+import pytest
+
+from judgelet.application.validators import SPOOL_CONTEXT_KEY, StdoutValidator
+from judgelet.domain.files import MemoryBlob
+from judgelet.domain.results import ExitState, RunResult
+from judgelet.infrastructure.spool import DiskBlobSpool, FileBlob
+from tests.unit.factory import create_test
+
+_LARGE_ANSWER = "0123456789" * 1024 * 1024
+
+
+def _create_validator(spool: DiskBlobSpool, expected: str) -> StdoutValidator:
+    return StdoutValidator(
+        StdoutValidator.args_cls.model_validate(
+            {"expected": expected},
+            context={SPOOL_CONTEXT_KEY: spool},
+        ),
+    )
+
+
+def test_only_large_data_is_spooled(dir_test_data_container):
+    """Test that large blobs go to files, which are removed on close."""
+    spool = DiskBlobSpool(dir_test_data_container)
+    small = spool.put(b"small")
+    large = spool.put(_LARGE_ANSWER.encode())
+    assert isinstance(small, MemoryBlob)
+    assert isinstance(large, FileBlob)
+    assert large.read() == _LARGE_ANSWER.encode()
+    spool.close()
+    assert not spool.root.exists()
+
+
+@pytest.mark.parametrize(
+    ("stdout", "should_pass"),
+    [
+        (f"{_LARGE_ANSWER}\n", True),
+        (_LARGE_ANSWER[:-1], False),
+        (f"{_LARGE_ANSWER[:-1]}x", False),
+    ],
+)
+def test_spooled_answer_is_compared(
+    dir_test_data_container,
+    stdout: str,
+    should_pass: bool,
+):
+    """Test that output is compared with an answer kept in a file."""
+    spool = DiskBlobSpool(dir_test_data_container)
+    validator = _create_validator(spool, _LARGE_ANSWER)
+    assert isinstance(validator.args.expected, FileBlob)
+    verdict = validator.validate(
+        RunResult(stdout.encode(), b"", 0, ExitState.FINISHED),
+        create_test(),
+        {},
+    )
+    spool.close()
+    assert verdict.is_successful == should_pass
+
+
+def test_empty_file_blob(dir_test_data_container):
+    """Test that an empty file can be viewed, though it can't be mapped."""
+    spool = DiskBlobSpool(dir_test_data_container)
+    spool.root.mkdir(parents=True)
+    path = spool.root / "empty.bin"
+    path.touch()
+    with FileBlob(path).view() as empty_view:
+        assert not empty_view
+    spool.close()
@@ -0,0 +1,129 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from litestar.exceptions import ClientException
+
+from judgelet.application.interfaces import BlobSpool
+from judgelet.controllers.schemas.loading import open_suite
+from judgelet.controllers.schemas.request import RunRequest
+from judgelet.domain.test_suite import TestSuite
+from judgelet.infrastructure.spool import DiskBlobSpool
+from judgelet.infrastructure.suite_cache import LruSuiteCache
+from tests.unit.factory import create_suite
+
+_LARGE_DATA = b"0" * 1024 * 1024
+
+
+class _SpoolingLoader:
+    """Loads an empty suite, but spools some data for it."""
+
+    def __init__(self) -> None:
+        self.spools: list[BlobSpool] = []
+
+    def __call__(self, spool: BlobSpool) -> TestSuite:
+        spool.put(_LARGE_DATA)
+        self.spools.append(spool)
+        return create_suite()
+
+    def is_spooled(self, index: int) -> bool:
+        spool = self.spools[index]
+        assert isinstance(spool, DiskBlobSpool)
+        return spool.root.exists()
+
+
+@pytest.mark.asyncio
+async def test_cached_suite_is_reused(dir_test_data_container):
+    """Test that suite is loaded once and then found by its hash."""
+    cache = LruSuiteCache(dir_test_data_container, 2)
+    loader = _SpoolingLoader()
+    assert cache.get("hash") is None
+    with await cache.put("hash", loader) as loaded:
+        pass
+    cached = cache.get("hash")
+    assert cached is not None
+    with cached as suite:
+        assert suite is loaded
+    with await cache.put("hash", loader) as suite:
+        assert suite is loaded
+    assert len(loader.spools) == 1
+    assert loader.is_spooled(0)
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_is_evicted(dir_test_data_container):
+    """Test that suites beyond capacity are evicted with their data."""
+    cache = LruSuiteCache(dir_test_data_container, 2)
+    loader = _SpoolingLoader()
+    for suite_hash in ("first", "second"):
+        with await cache.put(suite_hash, loader):
+            pass
+    with cache.get("first"):  # type: ignore[union-attr]
+        pass
+    with await cache.put("third", loader):
+        pass
+    assert cache.get("second") is None
+    assert not loader.is_spooled(1)
+    assert loader.is_spooled(0)
+    assert loader.is_spooled(2)
+
+
+@pytest.mark.asyncio
+async def test_evicted_suite_keeps_data_while_used(dir_test_data_container):
+    """Test that data of a suite is removed after its last use."""
+    cache = LruSuiteCache(dir_test_data_container, 0)
+    loader = _SpoolingLoader()
+    with await cache.put("hash", loader):
+        assert cache.get("hash") is None
+        assert loader.is_spooled(0)
+    assert not loader.is_spooled(0)
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_not_cached(dir_test_data_container):
+    """Test that data spooled by a failed load is removed."""
+    cache = LruSuiteCache(dir_test_data_container, 1)
+    spools: list[DiskBlobSpool] = []
+
+    def load(spool: BlobSpool) -> TestSuite:
+        assert isinstance(spool, DiskBlobSpool)
+        spools.append(spool)
+        spool.put(_LARGE_DATA)
+        raise ValueError("bad suite")
+
+    with pytest.raises(ValueError, match="bad suite"):
+        await cache.put("hash", load)
+    assert cache.get("hash") is None
+    assert not spools[0].root.exists()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_suite(dir_test_data_container):
+    """Test that a suite loaded twice at once is cached only once."""
+    cache = LruSuiteCache(dir_test_data_container, 2)
+    loader = _SpoolingLoader()
+    first, second = await asyncio.gather(
+        cache.put("hash", loader), cache.put("hash", loader),
+    )
+    with first as first_suite, second as second_suite:
+        assert first_suite is second_suite
+    assert len(loader.spools) == 2
+    assert [loader.is_spooled(0), loader.is_spooled(1)].count(True) == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_hash_is_conflict(dir_test_data_container):
+    """Test that request with only an unknown hash is answered 409."""
+    request = RunRequest.model_validate({
+        "id": "1",
+        "code": {"type": "str", "code": ""},
+        "compiler": "python",
+        "suite_hash": "hash",
+    })
+    with pytest.raises(ClientException) as exc_info:
+        await open_suite(
+            request,
+            LruSuiteCache(dir_test_data_container, 1),
+            DiskBlobSpool(dir_test_data_container),
+        )
+    assert exc_info.value.status_code == HTTPStatus.CONFLICT
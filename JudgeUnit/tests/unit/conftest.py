@@ -1,6 +1,8 @@
 import pytest
 
+from judgelet.application.interfaces import SlotScheduler
 from judgelet.config import Config
+from judgelet.infrastructure.scheduler import create_slot_scheduler
 
 
 @pytest.fixture
@@ -9,3 +11,8 @@ def test_config() -> Config:
         debug_mode=True,
         enable_lock=False,
     )
+
+
+@pytest.fixture
+def slot_scheduler(test_config: Config) -> SlotScheduler:
+    return create_slot_scheduler(test_config)
@@ -3,6 +3,7 @@ from typing import Any
 
 from judgelet.application.scoring_poilicies import GradualScoringPolicy
 from judgelet.domain.checking import PrecompileChecker, Validator
+from judgelet.domain.files import MemoryBlob
 from judgelet.domain.results import ExitState, RunResult
 from judgelet.domain.test_case import TestCase
 from judgelet.domain.test_group import ScoringPolicy, TestGroup
@@ -14,6 +15,7 @@ def create_suite(
     precompile_checks: list[PrecompileChecker[Any]] | None = None,
     group_deps: dict[str, Sequence[str]] | None = None,
     additional_files: dict[str, str] | None = None,
+    cache_results: bool = True,
 ) -> TestSuite:
     return TestSuite(
         test_groups=group_factories,
@@ -22,6 +24,7 @@ def create_suite(
         test_group_dependencies=group_deps or {},
         additional_files=additional_files or {},
         envs={},
+        cache_results=cache_results,
     )
 
 
@@ -45,19 +48,22 @@ def create_test(
     output_files: list[str] | None = None,
 ) -> TestCase:
     return TestCase(
-        stdin="",
+        stdin=MemoryBlob(b""),
         time_limit_s=1,
         memory_limit_mb=256,
-        input_files=input_files or {},
+        input_files={
+            filename: MemoryBlob(contents.encode())
+            for filename, contents in (input_files or {}).items()
+        },
         output_files=output_files or [],
         validators=validators,
     )
 
 
-def create_ok_result(stdout: str) -> RunResult:
+def create_ok_result(stdout: bytes) -> RunResult:
     return RunResult(
         stdout=stdout,
-        stderr="",
+        stderr=b"",
         return_code=0,
         state=ExitState.FINISHED,
     )
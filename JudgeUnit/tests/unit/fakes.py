@@ -1,16 +1,30 @@
-from collections.abc import Mapping, Sequence
+from collections.abc import Collection, Mapping, Sequence
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, ClassVar
 
 from judgelet.application.interfaces import (
     LanguageBackendFactory,
     SandboxFactory,
 )
+from judgelet.domain.caching import CompileCache
 from judgelet.domain.checking import NoArgs, Validator
 from judgelet.domain.execution import LanguageBackend, SolutionRunner
-from judgelet.domain.files import File, FileSystem, Solution
-from judgelet.domain.results import ExitState, RunResult, Verdict
+from judgelet.domain.files import (
+    Blob,
+    File,
+    FileSystem,
+    Solution,
+    Workspace,
+)
+from judgelet.domain.results import (
+    ExitState,
+    ResourceUsage,
+    RunResult,
+    Verdict,
+)
 from judgelet.domain.sandbox import Sandbox, SandboxExitCause, SandboxResult
+from judgelet.domain.slots import ExecutionSlot
 from judgelet.domain.test_case import TestCase
 
 
@@ -21,7 +35,7 @@ class _FakeCompilerBase(LanguageBackend):
 
     async def prepare(
         self,
-        fs: FileSystem,
+        workspace: Workspace,
         target_file: str,
         sandbox: Sandbox,
     ) -> RunResult:
@@ -29,7 +43,7 @@ class _FakeCompilerBase(LanguageBackend):
 
     async def compile(
         self,
-        fs: FileSystem,
+        workspace: Workspace,
         target_file: str,
         compile_timeout_s: float,
         sandbox: Sandbox,
@@ -38,10 +52,11 @@ class _FakeCompilerBase(LanguageBackend):
 
     async def run(
         self,
-        stdin: str,
+        stdin: Blob,
         timeout_s: float,
         mem_limit_mb: float,
         sandbox: Sandbox,
+        wall_timeout_s: float | None = None,
     ) -> RunResult:
         return self.fake_run_result
 
@@ -52,8 +67,8 @@ class FakeOkCompiler(_FakeCompilerBase):
 
 class FakePrepareErrorCompiler(_FakeCompilerBase):
     fake_prepare_result = RunResult(
-        stdout="preparation error",
-        stderr="preparation error",
+        stdout=b"preparation error",
+        stderr=b"preparation error",
         return_code=1,
         state=ExitState.ERROR,
     )
@@ -61,8 +76,8 @@ class FakePrepareErrorCompiler(_FakeCompilerBase):
 
 class FakeCompileErrorCompiler(_FakeCompilerBase):
     fake_compile_result = RunResult(
-        stdout="compilation error",
-        stderr="compilation error",
+        stdout=b"compilation error",
+        stderr=b"compilation error",
         return_code=1,
         state=ExitState.ERROR,
     )
@@ -70,8 +85,8 @@ class FakeCompileErrorCompiler(_FakeCompilerBase):
 
 class FakeRuntimeErrorCompiler(_FakeCompilerBase):
     fake_run_result = RunResult(
-        stdout="runtime error",
-        stderr="runtime error",
+        stdout=b"runtime error",
+        stderr=b"runtime error",
         return_code=1,
         state=ExitState.ERROR,
     )
@@ -79,8 +94,8 @@ class FakeRuntimeErrorCompiler(_FakeCompilerBase):
 
 class FakeCompileTimeLimitCompiler(_FakeCompilerBase):
     fake_compile_result = RunResult(
-        stdout="",
-        stderr="",
+        stdout=b"",
+        stderr=b"",
         return_code=1,
         state=ExitState.TIME_LIMIT,
     )
@@ -88,8 +103,8 @@ class FakeCompileTimeLimitCompiler(_FakeCompilerBase):
 
 class FakeCompileMemoryLimitCompiler(_FakeCompilerBase):
     fake_compile_result = RunResult(
-        stdout="",
-        stderr="",
+        stdout=b"",
+        stderr=b"",
         return_code=1,
         state=ExitState.MEM_LIMIT,
     )
@@ -97,8 +112,8 @@ class FakeCompileMemoryLimitCompiler(_FakeCompilerBase):
 
 class FakeRunTimeLimitCompiler(_FakeCompilerBase):
     fake_run_result = RunResult(
-        stdout="",
-        stderr="",
+        stdout=b"",
+        stderr=b"",
         return_code=1,
         state=ExitState.TIME_LIMIT,
     )
@@ -106,13 +121,52 @@ class FakeRunTimeLimitCompiler(_FakeCompilerBase):
 
 class FakeRunMemoryLimitCompiler(_FakeCompilerBase):
     fake_run_result = RunResult(
-        stdout="",
-        stderr="",
+        stdout=b"",
+        stderr=b"",
         return_code=1,
         state=ExitState.MEM_LIMIT,
     )
 
 
+class FakeCompileOutputLimitCompiler(_FakeCompilerBase):
+    fake_compile_result = RunResult(
+        stdout=b"",
+        stderr=b"",
+        return_code=1,
+        state=ExitState.OUTPUT_LIMIT,
+    )
+
+
+class FakeRunOutputLimitCompiler(_FakeCompilerBase):
+    fake_run_result = RunResult(
+        stdout=b"",
+        stderr=b"",
+        return_code=1,
+        state=ExitState.OUTPUT_LIMIT,
+    )
+
+
+class FakeVerboseRuntimeErrorCompiler(_FakeCompilerBase):
+    fake_run_result = RunResult(
+        stdout=b"x" * 100000,
+        stderr=b"",
+        return_code=1,
+        state=ExitState.ERROR,
+    )
+
+
+class FakeMeasuredCompiler(_FakeCompilerBase):
+    fake_run_result = RunResult(
+        stdout=b"",
+        stderr=b"",
+        return_code=0,
+        state=ExitState.FINISHED,
+        usage=ResourceUsage(
+            cpu_time_s=0.5, wall_time_s=0.6, peak_memory_mb=12,
+        ),
+    )
+
+
 class _FakeValidatorBase(Validator[NoArgs]):
     args_cls = NoArgs
     fake_verdict: ClassVar[Verdict]
@@ -124,7 +178,7 @@ class _FakeValidatorBase(Validator[NoArgs]):
         self,
         result: RunResult,
         test_case: "TestCase",
-        output_files: Mapping[str, str],
+        output_files: Mapping[str, bytes],
     ) -> Verdict:
         return self.fake_verdict
 
@@ -141,7 +195,7 @@ class FakePresentErrorValidator(_FakeValidatorBase):
     fake_verdict = Verdict.PE()
 
 
-class FakeFileSystem(FileSystem):
+class FakeWorkspace(Workspace):
     def __init__(self, files: dict[str, str] | None = None):
         self.files = {}
         if files:
@@ -150,52 +204,87 @@ class FakeFileSystem(FileSystem):
                 for filename, contents in files.items()
             }
 
-    def place_solution(self, solution: Solution) -> Path:
-        for file in solution.files:
-            self.files[file.name] = file
+    @property
+    def path(self) -> Path:
         return Path()
 
-    def cleanup(self, solution: Solution) -> None:
-        self.files.clear()
-
     def get_file(self, path: str) -> File | None:
         return self.files.get(path)
 
     def save_file(self, file: File) -> None:
         self.files[file.name] = file
 
+    def read_bytes(self, path: str) -> bytes | None:
+        file = self.files.get(path)
+        return file.contents.encode() if file else None
+
+    def place_blob(self, path: str, blob: Blob) -> None:
+        self.files[path] = File(path, blob.read().decode())
+
     def delete_file(self, filename: str) -> None:
         self.files.pop(filename, None)
 
+    def list_files(self) -> list[str]:
+        return list(self.files)
+
+    def close(self) -> None:
+        self.files.clear()
+
+
+class FakeFileSystem(FileSystem):
+    def open_workspace(
+        self, solution: Solution, workdir: str | None = None,
+    ) -> Workspace:
+        workspace = FakeWorkspace()
+        for file in solution.files:
+            workspace.save_file(file)
+        return workspace
+
+    def clone_workspace(
+        self,
+        workspace: Workspace,
+        workdir: str | None = None,
+        paths: Collection[str] | None = None,
+    ) -> Workspace:
+        clone = FakeWorkspace()
+        clone.files = {
+            path: file
+            for path, file in workspace.files.items()
+            if paths is None or path in paths
+        }
+        return clone
+
 
 class FakeSandbox(Sandbox):
-    def __init__(self, fs: FileSystem):
-        super().__init__(fs, "")
+    def __init__(self, workspace: Workspace):
+        super().__init__(workspace)
+        self.is_closed = False
 
     async def run(
         self,
         cmd: str,
-        proc_input: str,
+        proc_input: Blob,
         timeout_s: float,
         memory_limit_mb: float,
+        wall_timeout_s: float | None = None,
     ) -> SandboxResult:
         return SandboxResult(
             return_code=0,
             cause=SandboxExitCause.PROCESS_EXITED,
-            stderr="",
-            stdout="",
+            stderr=b"",
+            stdout=b"",
         )
 
     def close(self):
-        ...
+        self.is_closed = True
 
     def destroy(self):
         ...
 
 
 class FakeEmptySolution(Solution):
-    def __init__(self):
-        super().__init__("")
+    def __init__(self, uid: str = ""):
+        super().__init__(uid)
 
     @property
     def files(self) -> Sequence[File]:
@@ -207,16 +296,18 @@ class FakeEmptySolution(Solution):
 
 
 def create_fake_empty_runner():
-    fs = FakeFileSystem()
+    workspace = FakeWorkspace()
     return SolutionRunner(
         FakeOkCompiler(),
         FakeEmptySolution(),
-        fs,
-        FakeSandbox(fs),
+        workspace,
+        FakeSandbox(workspace),
     )
 
 
 class FakeCompilerFactory(LanguageBackendFactory):
+    languages: Mapping[str, str] = MappingProxyType({"fake": "txt"})
+
     def __init__(
         self,
         compiler_cls: Any,
@@ -234,14 +325,72 @@ class FakeCompilerFactory(LanguageBackendFactory):
 
 
 class FakeSandboxFactory(SandboxFactory):
+    def __init__(self) -> None:
+        self.sandboxes: list[FakeSandbox] = []
+
     def __call__(
         self,
-        fs: FileSystem,
-        sandbox_dir: str,
+        workspace: Workspace,
         encoding: str | None = None,
         environment: Mapping[str, str] | None = None,
+        slot: ExecutionSlot | None = None,
     ) -> Sandbox:
-        return FakeSandbox(fs)
+        sandbox = FakeSandbox(workspace)
+        self.sandboxes.append(sandbox)
+        return sandbox
+
+
+class FakeCompileCache(CompileCache):
+    hits = 0
+    misses = 0
+
+    def __init__(self) -> None:
+        self.entries: dict[str, dict[str, File]] = {}
+
+    async def restore(
+        self,
+        key: str,
+        workspace: Workspace,
+        artifacts: Sequence[str],
+    ) -> bool:
+        if key not in self.entries:
+            return False
+        for file in self.entries[key].values():
+            workspace.save_file(file)
+        return True
+
+    async def store(
+        self,
+        key: str,
+        workspace: Workspace,
+        artifacts: Sequence[str],
+    ) -> None:
+        self.entries[key] = {
+            name: workspace.get_file(name) for name in artifacts
+        }
+
+
+class FakeCachedCompiler(_FakeCompilerBase):
+    """Compiles a file named artifact and counts compilations."""
+
+    compile_artifacts = ("artifact",)
+    compilations = 0
+
+    async def get_compile_cache_key(
+        self, workspace: Workspace, target_file: str,
+    ) -> str | None:
+        return "key"
+
+    async def compile(
+        self,
+        workspace: Workspace,
+        target_file: str,
+        compile_timeout_s: float,
+        sandbox: Sandbox,
+    ) -> RunResult:
+        type(self).compilations += 1
+        workspace.save_file(File("artifact", "compiled"))
+        return RunResult.blank_ok()
 
 
 class FakeCompilerWorksOnlyIfFilePresent(_FakeCompilerBase):
@@ -256,12 +405,12 @@ class FakeCompilerWorksOnlyIfFilePresent(_FakeCompilerBase):
 
     async def compile(
         self,
-        fs: FileSystem,
+        workspace: Workspace,
         target_file: str,
         compile_timeout_s: float,
         sandbox: Sandbox,
     ) -> RunResult:
-        return _ensure_files_placed(self.expected_files, fs)
+        return _ensure_files_placed(self.expected_files, workspace)
 
 
 class FakeCompilerWorksOnlyIfFilePresentInRuntime(_FakeCompilerBase):
@@ -276,24 +425,25 @@ class FakeCompilerWorksOnlyIfFilePresentInRuntime(_FakeCompilerBase):
 
     async def run(
         self,
-        stdin: str,
+        stdin: Blob,
         timeout_s: float,
         mem_limit_mb: float,
         sandbox: Sandbox,
+        wall_timeout_s: float | None = None,
     ) -> RunResult:
-        return _ensure_files_placed(self.expected_files, sandbox.fs)
+        return _ensure_files_placed(self.expected_files, sandbox.workspace)
 
 
 def _ensure_files_placed(
     expected_files: dict[str, str],
-    fs: FileSystem,
+    workspace: Workspace,
 ):
     for filename, contents in expected_files.items():
-        fs_file = fs.get_file(filename)
+        fs_file = workspace.get_file(filename)
         if not fs_file or fs_file.contents != contents:
             return RunResult(
-                stdout=f"file {filename} assertion failed",
-                stderr=f"file {filename} assertion failed",
+                stdout=f"file {filename} assertion failed".encode(),
+                stderr=f"file {filename} assertion failed".encode(),
                 return_code=1,
                 state=ExitState.ERROR,
             )
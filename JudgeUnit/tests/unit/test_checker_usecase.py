@@ -1,18 +1,36 @@
+import asyncio
+
 import pytest
 
-from judgelet.application.interactors import CheckSolutionInteractor
-from judgelet.config import Config
+from judgelet.application.activity import SolutionActivity
+from judgelet.application.interactors import (
+    BatchOutcome,
+    CheckBatchInteractor,
+    CheckSolutionInteractor,
+    GetStatusInteractor,
+    Submission,
+)
+from judgelet.application.interfaces import SlotScheduler
+from judgelet.domain.execution import LanguageBackend
 from judgelet.domain.results import Verdict
+from judgelet.domain.slots import ExecutionSlot
 from judgelet.domain.test_case import TestCase
+from judgelet.domain.test_suite import SuiteResult
+from judgelet.infrastructure.result_cache import LruResultCache
+from judgelet.infrastructure.scheduler import FifoSlotScheduler
 from tests.unit.factory import create_group, create_suite, create_test
 from tests.unit.fakes import (
+    FakeCompileCache,
     FakeCompilerFactory,
     FakeCompilerWorksOnlyIfFilePresent,
     FakeCompilerWorksOnlyIfFilePresentInRuntime,
+    FakeCompileTimeLimitCompiler,
     FakeEmptySolution,
     FakeFileSystem,
     FakeOkCompiler,
     FakeOkValidator,
+    FakeRunMemoryLimitCompiler,
+    FakeRunTimeLimitCompiler,
     FakeSandboxFactory,
     FakeWrongAnswerValidator,
 )
@@ -40,14 +58,17 @@ from tests.unit.fakes import (
 async def test_interactor_returns(
     tests: list[TestCase],
     expected_result: tuple[str, int],
-    test_config: Config,
+    slot_scheduler: SlotScheduler,
 ):
     """Test that interactor executes happy path well."""
     interactor = CheckSolutionInteractor(
         backend_factory=FakeCompilerFactory(FakeOkCompiler),
         fs=FakeFileSystem(),
         sandbox_factory=FakeSandboxFactory(),
-        config=test_config,
+        scheduler=slot_scheduler,
+        compile_cache=FakeCompileCache(),
+        result_cache=LruResultCache(0),
+        activity=SolutionActivity(),
     )
     result = await interactor(
         backend_name="doesn't matter now",
@@ -61,6 +82,28 @@ async def test_interactor_returns(
     assert result.verdict == expected_verdict
 
 
+@pytest.mark.asyncio
+async def test_sandbox_is_closed_after_solution(slot_scheduler: SlotScheduler):
+    """Test that nothing left running in a sandbox outlives the solution."""
+    sandbox_factory = FakeSandboxFactory()
+    interactor = CheckSolutionInteractor(
+        backend_factory=FakeCompilerFactory(FakeOkCompiler),
+        fs=FakeFileSystem(),
+        sandbox_factory=sandbox_factory,
+        scheduler=slot_scheduler,
+        compile_cache=FakeCompileCache(),
+        result_cache=LruResultCache(0),
+        activity=SolutionActivity(),
+    )
+    await interactor(
+        backend_name="doesn't matter now",
+        solution=FakeEmptySolution(),
+        test_suite=create_suite(create_group("A", create_test())),
+    )
+    assert sandbox_factory.sandboxes
+    assert all(sandbox.is_closed for sandbox in sandbox_factory.sandboxes)
+
+
 @pytest.mark.parametrize(
     "additional_files",
     [
@@ -72,7 +115,7 @@ async def test_interactor_returns(
 @pytest.mark.asyncio
 async def test_additional_files_placed(
     additional_files: dict[str, str],
-    test_config: Config,
+    slot_scheduler: SlotScheduler,
 ):
     """Test that interactor places additional files."""
     interactor = CheckSolutionInteractor(
@@ -82,7 +125,10 @@ async def test_additional_files_placed(
         ),
         fs=FakeFileSystem(),
         sandbox_factory=FakeSandboxFactory(),
-        config=test_config,
+        scheduler=slot_scheduler,
+        compile_cache=FakeCompileCache(),
+        result_cache=LruResultCache(0),
+        activity=SolutionActivity(),
     )
     result = await interactor(
         test_suite=create_suite(additional_files=additional_files),
@@ -103,7 +149,7 @@ async def test_additional_files_placed(
 @pytest.mark.asyncio
 async def test_per_test_files_placed(
     per_test_files: dict[str, str],
-    test_config: Config,
+    slot_scheduler: SlotScheduler,
 ):
     """Test that per-test files are placed."""
     suite = create_suite(
@@ -122,7 +168,10 @@ async def test_per_test_files_placed(
         ),
         fs=FakeFileSystem(),
         sandbox_factory=FakeSandboxFactory(),
-        config=test_config,
+        scheduler=slot_scheduler,
+        compile_cache=FakeCompileCache(),
+        result_cache=LruResultCache(0),
+        activity=SolutionActivity(),
     )
     result = await interactor(
         test_suite=suite,
@@ -130,3 +179,276 @@ async def test_per_test_files_placed(
         solution=FakeEmptySolution(),
     )
     assert result.is_successful
+
+
+@pytest.mark.parametrize(
+    ("suite_hash", "cache_results", "expected_hits"),
+    [
+        ("hash", True, 1),
+        ("hash", False, 0),
+        (None, True, 0),
+    ],
+)
+@pytest.mark.asyncio
+async def test_result_is_cached(
+    suite_hash: str | None,
+    cache_results: bool,
+    expected_hits: int,
+    slot_scheduler: SlotScheduler,
+):
+    """Test that results are reused only for cacheable hashed suites."""
+    result_cache = LruResultCache(8)
+    interactor = CheckSolutionInteractor(
+        backend_factory=FakeCompilerFactory(FakeOkCompiler),
+        fs=FakeFileSystem(),
+        sandbox_factory=FakeSandboxFactory(),
+        scheduler=slot_scheduler,
+        compile_cache=FakeCompileCache(),
+        result_cache=result_cache,
+        activity=SolutionActivity(),
+    )
+    suite = create_suite(
+        create_group("A", create_test(FakeOkValidator())),
+        cache_results=cache_results,
+    )
+    results = [
+        await interactor(
+            backend_name="doesn't matter now",
+            solution=FakeEmptySolution(),
+            test_suite=suite,
+            suite_hash=suite_hash,
+        )
+        for _ in range(2)
+    ]
+    assert results[0] == results[1]
+    assert result_cache.hits == expected_hits
+
+
+@pytest.mark.parametrize(
+    "compiler",
+    [
+        FakeRunTimeLimitCompiler,
+        FakeRunMemoryLimitCompiler,
+        FakeCompileTimeLimitCompiler,
+    ],
+)
+@pytest.mark.asyncio
+async def test_load_dependent_result_is_not_cached(
+    compiler: type[LanguageBackend], slot_scheduler: SlotScheduler,
+):
+    """Test that results with limits hit are checked again."""
+    result_cache = LruResultCache(8)
+    interactor = CheckSolutionInteractor(
+        backend_factory=FakeCompilerFactory(compiler),
+        fs=FakeFileSystem(),
+        sandbox_factory=FakeSandboxFactory(),
+        scheduler=slot_scheduler,
+        compile_cache=FakeCompileCache(),
+        result_cache=result_cache,
+        activity=SolutionActivity(),
+    )
+    solution = FakeEmptySolution()
+    result = await interactor(
+        backend_name="doesn't matter now",
+        solution=solution,
+        test_suite=create_suite(create_group("A", create_test())),
+        suite_hash="hash",
+    )
+    assert not result.is_reproducible
+    assert not interactor.is_cached("doesn't matter now", solution, "hash")
+
+
+@pytest.mark.asyncio
+async def test_cached_solution_needs_no_slot(slot_scheduler: SlotScheduler):
+    """Test that a cached result is found before admission is needed."""
+    result_cache = LruResultCache(8)
+    interactor = CheckSolutionInteractor(
+        backend_factory=FakeCompilerFactory(FakeOkCompiler),
+        fs=FakeFileSystem(),
+        sandbox_factory=FakeSandboxFactory(),
+        scheduler=slot_scheduler,
+        compile_cache=FakeCompileCache(),
+        result_cache=result_cache,
+        activity=SolutionActivity(),
+    )
+    batch_interactor = CheckBatchInteractor(interactor, slot_scheduler)
+    solution = FakeEmptySolution("1")
+    submissions = [Submission("doesn't matter now", solution)]
+    assert not interactor.is_cached("doesn't matter now", solution, "hash")
+    await interactor(
+        backend_name="doesn't matter now",
+        solution=solution,
+        test_suite=create_suite(),
+        suite_hash="hash",
+    )
+    assert interactor.is_cached("doesn't matter now", solution, "hash")
+    assert batch_interactor.is_cached(submissions, "hash")
+    assert not interactor.is_cached("doesn't matter now", solution, None)
+    assert not batch_interactor.is_cached(submissions, "other")
+    assert (result_cache.hits, result_cache.misses) == (0, 1)
+
+
+def test_result_cache_evicts_least_recently_used():
+    """Test that result cache keeps only its capacity of results."""
+    result_cache = LruResultCache(2)
+    results = [
+        SuiteResult(
+            is_successful=True, score=score, protocol={}, verdict=Verdict.OK(),
+        )
+        for score in range(3)
+    ]
+    result_cache.put("first", results[0])
+    result_cache.put("second", results[1])
+    assert result_cache.get("first") == results[0]
+    result_cache.put("third", results[2])
+    assert result_cache.get("second") is None
+    assert result_cache.get("first") == results[0]
+    assert (result_cache.hits, result_cache.misses) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_batch_yields_every_solution(slot_scheduler: SlotScheduler):
+    """Test that batch interactor checks every solution of the batch."""
+    check_solution = CheckSolutionInteractor(
+        backend_factory=FakeCompilerFactory(FakeOkCompiler),
+        fs=FakeFileSystem(),
+        sandbox_factory=FakeSandboxFactory(),
+        scheduler=slot_scheduler,
+        compile_cache=FakeCompileCache(),
+        result_cache=LruResultCache(0),
+        activity=SolutionActivity(),
+    )
+    interactor = CheckBatchInteractor(check_solution, slot_scheduler)
+    submissions = [
+        Submission("doesn't matter now", FakeEmptySolution(str(index)))
+        for index in range(slot_scheduler.total_slots * 2 + 1)
+    ]
+    outcomes = [
+        outcome
+        async for outcome in interactor(
+            submissions,
+            create_suite(create_group("A", create_test(FakeOkValidator()))),
+        )
+    ]
+    assert sorted(outcome.solution_id for outcome in outcomes) == sorted(
+        submission.solution.uid for submission in submissions
+    )
+    assert all(
+        outcome.result is not None and outcome.result.is_successful
+        for outcome in outcomes
+    )
+
+
+class _FailingCompilerFactory(FakeCompilerFactory):
+    def create_backend(self, name, solution):
+        if name == "broken":
+            raise RuntimeError("backend is broken")
+        return super().create_backend(name, solution)
+
+
+@pytest.mark.asyncio
+async def test_batch_survives_failed_solution(slot_scheduler: SlotScheduler):
+    """Test that a failure of one solution does not abort the batch."""
+    check_solution = CheckSolutionInteractor(
+        backend_factory=_FailingCompilerFactory(FakeOkCompiler),
+        fs=FakeFileSystem(),
+        sandbox_factory=FakeSandboxFactory(),
+        scheduler=slot_scheduler,
+        compile_cache=FakeCompileCache(),
+        result_cache=LruResultCache(0),
+        activity=SolutionActivity(),
+    )
+    interactor = CheckBatchInteractor(check_solution, slot_scheduler)
+    submissions = [
+        Submission("broken", FakeEmptySolution("1")),
+        Submission("doesn't matter now", FakeEmptySolution("2")),
+    ]
+    outcomes = {
+        outcome.solution_id: outcome
+        async for outcome in interactor(submissions, create_suite())
+    }
+    assert outcomes["1"].error == "internal error"
+    assert outcomes["2"].result is not None
+    assert outcomes["2"].result.is_successful
+
+
+@pytest.mark.asyncio
+async def test_batch_waits_for_room_in_queue():
+    """Test that batch solutions are not dropped while the queue is full."""
+    scheduler = FifoSlotScheduler(
+        [ExecutionSlot(0, frozenset(), "slot_0")], max_queue_size=1,
+    )
+    check_solution = CheckSolutionInteractor(
+        backend_factory=FakeCompilerFactory(FakeOkCompiler),
+        fs=FakeFileSystem(),
+        sandbox_factory=FakeSandboxFactory(),
+        scheduler=scheduler,
+        compile_cache=FakeCompileCache(),
+        result_cache=LruResultCache(0),
+        activity=SolutionActivity(),
+    )
+    interactor = CheckBatchInteractor(check_solution, scheduler)
+    release = asyncio.Event()
+
+    async def occupy() -> None:
+        async with scheduler.acquire():
+            await release.wait()
+
+    occupants = [asyncio.create_task(occupy()) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert scheduler.is_saturated
+
+    async def collect() -> list[BatchOutcome]:
+        return [
+            outcome
+            async for outcome in interactor(
+                [Submission("doesn't matter now", FakeEmptySolution("1"))],
+                create_suite(
+                    create_group("A", create_test(FakeOkValidator())),
+                ),
+            )
+        ]
+
+    batch = asyncio.create_task(collect())
+    await asyncio.sleep(0.3)
+    assert not batch.done()
+    release.set()
+    outcomes = await asyncio.wait_for(batch, timeout=5)
+    await asyncio.gather(*occupants)
+    assert [outcome.error for outcome in outcomes] == [None]
+    assert outcomes[0].result is not None
+    assert outcomes[0].result.is_successful
+
+
+@pytest.mark.asyncio
+async def test_status_reports_load(slot_scheduler: SlotScheduler):
+    """Test that status reflects checked solutions."""
+    activity = SolutionActivity()
+    result_cache = LruResultCache(8)
+    compile_cache = FakeCompileCache()
+    interactor = CheckSolutionInteractor(
+        backend_factory=FakeCompilerFactory(FakeOkCompiler),
+        fs=FakeFileSystem(),
+        sandbox_factory=FakeSandboxFactory(),
+        scheduler=slot_scheduler,
+        compile_cache=compile_cache,
+        result_cache=result_cache,
+        activity=activity,
+    )
+    get_status = GetStatusInteractor(
+        slot_scheduler, activity, compile_cache, result_cache,
+    )
+    assert get_status().average_duration_s is None
+    await interactor(
+        backend_name="doesn't matter now",
+        solution=FakeEmptySolution("1"),
+        test_suite=create_suite(),
+        suite_hash="hash",
+    )
+    status = get_status()
+    assert status.free_slots == status.total_slots
+    assert status.queue_depth == 0
+    assert not status.running
+    assert status.average_duration_s is not None
+    assert status.result_cache_hit_ratio == 0
+    assert status.compile_cache_hit_ratio is None
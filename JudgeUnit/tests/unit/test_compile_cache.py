@@ -0,0 +1,43 @@
+import pytest
+
+from judgelet.domain.execution import SolutionRunner
+from tests.unit.fakes import (
+    FakeCachedCompiler,
+    FakeCompileCache,
+    FakeEmptySolution,
+    FakeSandbox,
+    FakeWorkspace,
+)
+
+
+def _create_runner(cache: FakeCompileCache | None) -> SolutionRunner:
+    workspace = FakeWorkspace()
+    return SolutionRunner(
+        FakeCachedCompiler(),
+        FakeEmptySolution(),
+        workspace,
+        FakeSandbox(workspace),
+        cache,
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_compilation():
+    """Test that the same code is compiled only once."""
+    FakeCachedCompiler.compilations = 0
+    cache = FakeCompileCache()
+    first_runner = _create_runner(cache)
+    second_runner = _create_runner(cache)
+    assert (await first_runner.compile(5)).is_successful
+    assert (await second_runner.compile(5)).is_successful
+    assert FakeCachedCompiler.compilations == 1
+    assert second_runner.workspace.get_file("artifact") is not None
+
+
+@pytest.mark.asyncio
+async def test_no_cache():
+    """Test that without a cache everything is compiled."""
+    FakeCachedCompiler.compilations = 0
+    await _create_runner(None).compile(5)
+    await _create_runner(None).compile(5)
+    assert FakeCachedCompiler.compilations == 2
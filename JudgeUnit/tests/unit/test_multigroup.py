@@ -103,3 +103,46 @@ async def test_dependent_groups(
     result = await test_suite.run(runner)
     assert result.score == expected_total
     assert result.group_scores == expected_group_scores
+
+
+@pytest.mark.parametrize(
+    ("group_deps", "expected_group_scores"),
+    [
+        ({"A": ["B"]}, {"A": 50, "B": 50}),
+        ({"A": ["C"]}, {"B": 50}),
+        ({"A": ["B"], "B": ["A"]}, {}),
+        ({"A": ["A"]}, {"B": 50}),
+    ],
+)
+@pytest.mark.asyncio
+async def test_dependency_graph(
+    group_deps: dict[str, list[str]],
+    expected_group_scores: dict[str, int],
+):
+    """Test that groups wait for dependencies declared anywhere in suite."""
+    test_suite = create_suite(
+        create_group("A", create_test(FakeOkValidator()), score=50),
+        create_group("B", create_test(FakeOkValidator()), score=50),
+        group_deps=group_deps,
+    )
+    runner = create_fake_empty_runner()
+    result = await test_suite.run(runner)
+    assert result.group_scores == expected_group_scores
+    assert result.is_successful == (len(expected_group_scores) == 2)
+
+
+@pytest.mark.asyncio
+async def test_failed_dependency_skips_transitive_dependents():
+    """Test that a failed group prevents the whole chain behind it."""
+    test_suite = create_suite(
+        create_group("A", create_test(FakeWrongAnswerValidator()), score=0),
+        create_group("B", create_test(FakeOkValidator()), score=50),
+        create_group("C", create_test(FakeOkValidator()), score=50),
+        create_group("D", create_test(FakeOkValidator()), score=50),
+        group_deps={"B": ["A"], "C": ["B"]},
+    )
+    runner = create_fake_empty_runner()
+    result = await test_suite.run(runner)
+    assert list(result.protocol) == ["A", "D"]
+    assert result.score == 50
+    assert not result.is_successful
@@ -0,0 +1,191 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+
+from judgelet.application.replicas import SlotRunnerReplicator
+from judgelet.domain.execution import RunnerReplicator, SolutionRunner
+from judgelet.domain.files import File
+from judgelet.domain.slots import ExecutionSlot
+from judgelet.infrastructure.scheduler import FifoSlotScheduler
+from tests.unit.fakes import (
+    FakeEmptySolution,
+    FakeFileSystem,
+    FakeOkCompiler,
+    FakeSandbox,
+    FakeSandboxFactory,
+    FakeWorkspace,
+)
+
+
+class _FakeReplicator(RunnerReplicator):
+    def __init__(self, free_slots: int) -> None:
+        self.free_slots = free_slots
+        self.contended = False
+        self.captured = None
+
+    def capture(self, runner):
+        self.captured = runner.workspace
+
+    async def try_replicate(self, runner):
+        if self.free_slots == 0:
+            return None
+        self.free_slots -= 1
+        return self._replicate(runner)
+
+    @property
+    def is_contended(self) -> bool:
+        return self.contended
+
+    @contextmanager
+    def _replicate(self, runner):
+        workspace = FakeWorkspace()
+        yield SolutionRunner(
+            runner.backend,
+            runner.solution,
+            workspace,
+            FakeSandbox(workspace),
+        )
+        self.free_slots += 1
+
+
+def _create_runner(replicator: RunnerReplicator | None) -> SolutionRunner:
+    workspace = FakeWorkspace()
+    return SolutionRunner(
+        FakeOkCompiler(),
+        FakeEmptySolution(),
+        workspace,
+        FakeSandbox(workspace),
+        replicator=replicator,
+    )
+
+
+@pytest.mark.asyncio
+async def test_results_keep_order():
+    """Test that results are in order of jobs, not of completion."""
+    runner = _create_runner(_FakeReplicator(free_slots=3))
+
+    def create_job(number: int):
+        async def job(_: SolutionRunner) -> int:
+            await asyncio.sleep((5 - number) * 0.01)
+            return number
+        return job
+
+    outcomes = await runner.run_concurrently(
+        [create_job(number) for number in range(5)],
+    )
+    assert outcomes == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize(
+    ("free_slots", "expected_runners"),
+    [(0, 1), (2, 3), (10, 4)],
+)
+@pytest.mark.asyncio
+async def test_jobs_spread_over_replicas(free_slots, expected_runners):
+    """Test that each free slot gets a replica, but not more than needed."""
+    replicator = _FakeReplicator(free_slots)
+    runner = _create_runner(replicator)
+    used_workspaces = set()
+
+    async def job(job_runner: SolutionRunner) -> None:
+        used_workspaces.add(id(job_runner.workspace))
+        await asyncio.sleep(0.01)
+
+    await runner.run_concurrently([job] * 4)
+    assert len(used_workspaces) == expected_runners
+    assert replicator.free_slots == free_slots
+
+
+@pytest.mark.asyncio
+async def test_replicas_yield_to_waiting_solutions():
+    """Test that replicas stop taking jobs when slots are contended."""
+    replicator = _FakeReplicator(free_slots=1)
+    runner = _create_runner(replicator)
+    runners_used = []
+
+    async def job(job_runner: SolutionRunner) -> None:
+        runners_used.append(job_runner)
+        await asyncio.sleep(0.01)
+        replicator.contended = True
+
+    await runner.run_concurrently([job] * 4)
+    assert runners_used.count(runner) == 3
+
+
+@pytest.mark.asyncio
+async def test_without_replicator():
+    """Test that jobs run one by one without replicator."""
+    runner = _create_runner(None)
+
+    async def job(job_runner: SolutionRunner) -> bool:
+        return job_runner is runner
+
+    assert await runner.run_concurrently([job] * 3) == [True] * 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_runners():
+    """Test that concurrent groups borrow runners from the same pool."""
+    replicator = _FakeReplicator(free_slots=1)
+    runner = _create_runner(replicator)
+    busy_runners = set()
+    max_busy = 0
+
+    async def job(job_runner: SolutionRunner) -> None:
+        nonlocal max_busy
+        assert job_runner not in busy_runners
+        busy_runners.add(job_runner)
+        max_busy = max(max_busy, len(busy_runners))
+        await asyncio.sleep(0.01)
+        busy_runners.discard(job_runner)
+
+    await asyncio.gather(
+        runner.run_concurrently([job] * 3),
+        runner.run_concurrently([job] * 3),
+    )
+    assert max_busy == 2
+    assert replicator.free_slots == 1
+
+
+class _CountingFileSystem(FakeFileSystem):
+    def __init__(self) -> None:
+        self.clones = 0
+
+    def clone_workspace(self, workspace, workdir=None, paths=None):
+        self.clones += 1
+        return super().clone_workspace(workspace, workdir, paths)
+
+
+@pytest.mark.asyncio
+async def test_replica_template_is_cloned_lazily():
+    """Test that capturing copies nothing and replicas skip test files."""
+    scheduler = FifoSlotScheduler(
+        [
+            ExecutionSlot(index, frozenset(), f"slot_{index}")
+            for index in range(3)
+        ],
+        max_queue_size=1,
+    )
+    fs = _CountingFileSystem()
+    sandbox_factory = FakeSandboxFactory()
+    replicator = SlotRunnerReplicator(scheduler, fs, sandbox_factory, {})
+    runner = _create_runner(replicator)
+    runner.workspace.save_file(File("main.py", "code"))
+    replicator.capture(runner)
+    assert fs.clones == 0
+
+    runner.workspace.save_file(File("input.txt", "test in progress"))
+    first = await replicator.try_replicate(runner)
+    second = await replicator.try_replicate(runner)
+    assert first is not None
+    assert second is not None
+    with first as first_replica, second as second_replica:
+        assert first_replica.workspace.list_files() == ["main.py"]
+        assert second_replica.workspace.list_files() == ["main.py"]
+    assert fs.clones == 3
+    assert scheduler.free_slots == 3
+    assert [sandbox.is_closed for sandbox in sandbox_factory.sandboxes] == [
+        True, True,
+    ]
+    replicator.close()
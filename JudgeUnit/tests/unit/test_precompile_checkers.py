@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Final
 
 import pytest
@@ -8,7 +9,18 @@ from judgelet.application.precompile_checkers import (
     NoPatternChecker,
 )
 from judgelet.domain.checking import NoArgs
-from tests.unit.fakes import FakeFileSystem
+from judgelet.domain.execution import SolutionRunner
+from judgelet.domain.files import Workspace
+from judgelet.domain.results import RunResult
+from judgelet.domain.sandbox import Sandbox
+from tests.unit.factory import create_group, create_suite, create_test
+from tests.unit.fakes import (
+    FakeEmptySolution,
+    FakeOkCompiler,
+    FakeOkValidator,
+    FakeSandbox,
+    FakeWorkspace,
+)
 
 _SHOULD_PASS: Final = True
 _SHOULD_FAIL: Final = False
@@ -18,6 +30,7 @@ _SHOULD_FAIL: Final = False
     ("src", "should_pass"),
     [
         ("import x", _SHOULD_FAIL),
+        ("print(1)\nfrom x import y", _SHOULD_FAIL),
         ("print('Hello, World!')", _SHOULD_PASS),
         ("print('import')", _SHOULD_PASS),
     ],
@@ -27,8 +40,8 @@ _SHOULD_FAIL: Final = False
 )
 def test_no_import(src: str, filename: str, should_pass: bool):
     """Test NoImportPC."""
-    fs = FakeFileSystem({filename: src})
-    verdict = NoImportChecker(NoArgs()).check(fs, filename)
+    workspace = FakeWorkspace({filename: src})
+    verdict = NoImportChecker(NoArgs()).check(workspace, filename)
     assert verdict.is_successful == should_pass
 
 
@@ -68,8 +81,8 @@ def test_no_pattern(
     should_pass: bool,
 ):
     """Test NoPatternPC."""
-    fs = FakeFileSystem({filename: src})
-    verdict = NoPatternChecker(checker_params).check(fs, filename)
+    workspace = FakeWorkspace({filename: src})
+    verdict = NoPatternChecker(checker_params).check(workspace, filename)
     assert verdict.is_successful == should_pass
 
 
@@ -109,13 +122,68 @@ def test_has_pattern(
     should_pass: bool,
 ):
     """Test HasPatternPC."""
-    fs = FakeFileSystem({filename: src})
-    verdict = HasPatternChecker(checker_params).check(fs, filename)
+    workspace = FakeWorkspace({filename: src})
+    verdict = HasPatternChecker(checker_params).check(workspace, filename)
     assert verdict.is_successful == should_pass
 
 
 def test_pattern_does_not_match_unknown_extensions():
     """Ensure pattern checkers ignore unknown files even if contents match."""
-    fs = FakeFileSystem({"test.unknown": "import x"})
-    verdict = NoImportChecker(NoArgs()).check(fs, "test.unknown")
+    workspace = FakeWorkspace({"test.unknown": "import x"})
+    verdict = NoImportChecker(NoArgs()).check(workspace, "test.unknown")
     assert verdict.is_successful
+
+
+class _EndlessCompiler(FakeOkCompiler):
+    def __init__(self) -> None:
+        self.is_cancelled = False
+
+    async def compile(
+        self,
+        workspace: Workspace,
+        target_file: str,
+        compile_timeout_s: float,
+        sandbox: Sandbox,
+    ) -> RunResult:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.is_cancelled = True
+            raise
+        return RunResult.blank_ok()
+
+
+@pytest.mark.asyncio
+async def test_failed_check_cancels_compilation():
+    """Test that PCF is given without waiting for compilation."""
+    workspace = FakeWorkspace({"main.py": "import os"})
+    compiler = _EndlessCompiler()
+    runner = SolutionRunner(
+        compiler, FakeEmptySolution(), workspace, FakeSandbox(workspace),
+    )
+    test_suite = create_suite(
+        create_group("A", create_test(FakeOkValidator())),
+        precompile_checks=[NoImportChecker(NoArgs())],
+    )
+    result = await asyncio.wait_for(test_suite.run(runner), timeout=5)
+    assert result.verdict.codename == "PCF"
+    assert not result.protocol
+    assert compiler.is_cancelled
+
+
+@pytest.mark.asyncio
+async def test_passed_check_lets_solution_run():
+    """Test that solution passing checks is compiled and run."""
+    workspace = FakeWorkspace({"main.py": "print(1)"})
+    runner = SolutionRunner(
+        FakeOkCompiler(),
+        FakeEmptySolution(),
+        workspace,
+        FakeSandbox(workspace),
+    )
+    test_suite = create_suite(
+        create_group("A", create_test(FakeOkValidator())),
+        precompile_checks=[NoImportChecker(NoArgs())],
+    )
+    result = await test_suite.run(runner)
+    assert result.is_successful
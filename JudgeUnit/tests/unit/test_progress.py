@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from judgelet.application.interfaces import SlotQueueIsFull
+from judgelet.application.scoring_poilicies import PolarScoringPolicy
+from judgelet.controllers.progress import stream_progress
+from judgelet.domain.results import RunResult, Verdict
+from judgelet.domain.test_group import GroupProtocol
+from judgelet.domain.test_suite import ProgressListener, SuiteResult
+from tests.unit.factory import create_group, create_suite, create_test
+from tests.unit.fakes import (
+    FakeOkValidator,
+    FakeWrongAnswerValidator,
+    create_fake_empty_runner,
+)
+
+
+class _RecordingListener(ProgressListener):
+    def __init__(self) -> None:
+        self.events: list[tuple[str, ...]] = []
+
+    def on_compiled(self, result: RunResult) -> None:
+        self.events.append(("compiled",))
+
+    def on_test_finished(
+        self, group_name: str, test_index: int, verdict: Verdict,
+    ) -> None:
+        self.events.append(("test", group_name, str(test_index)))
+
+    def on_group_finished(
+        self, group_name: str, protocol: GroupProtocol,
+    ) -> None:
+        self.events.append(("group", group_name))
+
+
+@pytest.mark.asyncio
+async def test_progress_is_reported():
+    """Test that listener gets compilation, every run test and group."""
+    test_suite = create_suite(
+        create_group(
+            "A",
+            create_test(FakeOkValidator()),
+            create_test(FakeOkValidator()),
+        ),
+        create_group(
+            "B",
+            create_test(FakeWrongAnswerValidator()),
+            scoring_policy=PolarScoringPolicy(),
+        ),
+        group_deps={"B": ["A"]},
+    )
+    listener = _RecordingListener()
+    await test_suite.run(create_fake_empty_runner(), listener)
+    assert listener.events[0] == ("compiled",)
+    assert sorted(listener.events[1:3]) == [
+        ("test", "A", "0"),
+        ("test", "A", "1"),
+    ]
+    assert listener.events[3:] == [
+        ("group", "A"),
+        ("test", "B", "0"),
+        ("group", "B"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_progress_is_streamed():
+    """Test that progress is streamed as NDJSON and ends with result."""
+
+    async def check(listener: ProgressListener) -> SuiteResult:
+        listener.on_compiled(RunResult.blank_ok())
+        return SuiteResult(
+            is_successful=True, score=100, protocol={}, verdict=Verdict.OK(),
+        )
+
+    lines = [json.loads(chunk) async for chunk in stream_progress(check)]
+    assert lines == [
+        {"event": "compiled", "is_successful": True},
+        {
+            "event": "result",
+            "result": {
+                "score": 100,
+                "verdict": "OK",
+                "group_scores": {},
+                "protocol": {},
+            },
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_busy_judgelet_is_streamed_as_error():
+    """Test that rejected solution ends the stream with an error."""
+
+    async def check(listener: ProgressListener) -> SuiteResult:
+        raise SlotQueueIsFull
+
+    lines = [json.loads(chunk) async for chunk in stream_progress(check)]
+    assert lines == [{"event": "error", "detail": "judgelet is busy"}]
+
+
+@pytest.mark.asyncio
+async def test_failed_check_is_streamed_as_error():
+    """Test that a check failing after some events ends with an error."""
+
+    async def check(listener: ProgressListener) -> SuiteResult:
+        listener.on_compiled(RunResult.blank_ok())
+        raise OSError("spool is gone")
+
+    lines = [json.loads(chunk) async for chunk in stream_progress(check)]
+    assert lines == [
+        {"event": "compiled", "is_successful": True},
+        {"event": "error", "detail": "internal error"},
+    ]
@@ -0,0 +1,75 @@
+import pytest
+
+from judgelet.controllers.schemas.dumping import dump_run_response
+from judgelet.domain.execution import SolutionRunner
+from tests.unit.factory import create_group, create_suite, create_test
+from tests.unit.fakes import (
+    FakeEmptySolution,
+    FakeMeasuredCompiler,
+    FakeOkCompiler,
+    FakeOkValidator,
+    FakeSandbox,
+    FakeWorkspace,
+)
+
+
+def _create_runner(compiler) -> SolutionRunner:
+    workspace = FakeWorkspace()
+    return SolutionRunner(
+        compiler,
+        FakeEmptySolution(),
+        workspace,
+        FakeSandbox(workspace),
+    )
+
+
+@pytest.mark.asyncio
+async def test_usage_is_reported():
+    """Test that used resources reach verdicts, protocol and response."""
+    test_suite = create_suite(
+        create_group("A", create_test(FakeOkValidator())),
+    )
+    result = await test_suite.run(_create_runner(FakeMeasuredCompiler()))
+    protocol = result.protocol["A"]
+    assert protocol.verdicts[0].usage is not None
+    assert protocol.max_cpu_time_s == 0.5
+    assert protocol.max_peak_memory_mb == 12
+    response = dump_run_response(result)
+    group_schema = response.protocol["A"]
+    assert group_schema.max_cpu_time_s == 0.5
+    assert group_schema.verdicts[0].wall_time_s == 0.6
+
+
+@pytest.mark.asyncio
+async def test_no_usage_is_fine():
+    """Test that a backend not measuring anything reports nothing."""
+    test_suite = create_suite(
+        create_group("A", create_test(FakeOkValidator())),
+    )
+    result = await test_suite.run(_create_runner(FakeOkCompiler()))
+    protocol = result.protocol["A"]
+    assert protocol.max_cpu_time_s is None
+    assert protocol.max_peak_memory_mb is None
+
+
+@pytest.mark.parametrize(
+    ("time_limit", "wall_time_limit", "expected"),
+    [
+        (0.5, None, 1.5),
+        (2, None, 4),
+        (2, 3, 3),
+    ],
+)
+def test_wall_time_limit(time_limit, wall_time_limit, expected):
+    """Test that wall time limit is looser than CPU one by default."""
+    case = create_test()
+    case = type(case)(
+        case.stdin,
+        time_limit,
+        case.memory_limit_mb,
+        case.input_files,
+        case.output_files,
+        case.validators,
+        wall_time_limit,
+    )
+    assert case.effective_wall_time_limit_s == expected
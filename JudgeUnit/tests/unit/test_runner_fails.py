@@ -5,24 +5,27 @@ from tests.unit.factory import create_group, create_suite, create_test
 from tests.unit.fakes import (
     FakeCompileErrorCompiler,
     FakeCompileMemoryLimitCompiler,
+    FakeCompileOutputLimitCompiler,
     FakeCompileTimeLimitCompiler,
     FakeEmptySolution,
-    FakeFileSystem,
     FakePrepareErrorCompiler,
     FakeRunMemoryLimitCompiler,
+    FakeRunOutputLimitCompiler,
     FakeRuntimeErrorCompiler,
     FakeRunTimeLimitCompiler,
     FakeSandbox,
+    FakeVerboseRuntimeErrorCompiler,
+    FakeWorkspace,
 )
 
 
 def _create_runner(compiler: LanguageBackend) -> SolutionRunner:
-    fs = FakeFileSystem()
+    workspace = FakeWorkspace()
     return SolutionRunner(
         compiler,
         FakeEmptySolution(),
-        fs,
-        FakeSandbox(fs),
+        workspace,
+        FakeSandbox(workspace),
     )
 
 
@@ -32,6 +35,7 @@ def _create_runner(compiler: LanguageBackend) -> SolutionRunner:
         FakeCompileErrorCompiler(),
         FakeCompileTimeLimitCompiler(),
         FakeCompileMemoryLimitCompiler(),
+        FakeCompileOutputLimitCompiler(),
     ],
 )
 @pytest.mark.asyncio
@@ -68,3 +72,24 @@ async def test_run_memory_limit():
     runner = _create_runner(FakeRunMemoryLimitCompiler())
     result = await test_suite.run(runner)
     assert result.verdict.codename == "ML"
+
+
+@pytest.mark.asyncio
+async def test_run_output_limit():
+    """Test that output limit killer returns OLE."""
+    test_suite = create_suite(create_group("A", create_test()))
+    runner = _create_runner(FakeRunOutputLimitCompiler())
+    result = await test_suite.run(runner)
+    assert result.verdict.codename == "OLE"
+
+
+@pytest.mark.asyncio
+async def test_runtime_fail_output_is_truncated():
+    """Test that RE details keep only the head of a huge output."""
+    test_suite = create_suite(create_group("A", create_test()))
+    runner = _create_runner(FakeVerboseRuntimeErrorCompiler())
+    result = await test_suite.run(runner)
+    details = result.protocol["A"].verdicts[0].details
+    assert result.verdict.codename == "RE"
+    assert len(details) < 2000
+    assert "more bytes" in details
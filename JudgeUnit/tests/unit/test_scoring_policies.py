@@ -83,3 +83,33 @@ async def test_polar_scoring_policy(
     runner = create_fake_empty_runner()
     result = await test_suite.run(runner)
     assert result.score == expected_score
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected_verdicts"),
+    [
+        (GradualScoringPolicy(), ["OK", "WA", "OK", "WA"]),
+        (PolarScoringPolicy(), ["OK", "WA", "SKIPPED", "SKIPPED"]),
+    ],
+)
+@pytest.mark.asyncio
+async def test_fail_fast_skips_rest_of_group(
+    policy: GradualScoringPolicy | PolarScoringPolicy,
+    expected_verdicts: list[str],
+):
+    """Test that polar groups skip tests after the first failure."""
+    test_suite = create_suite(
+        create_group(
+            "A",
+            create_test(FakeOkValidator()),
+            create_test(FakeWrongAnswerValidator()),
+            create_test(FakeOkValidator()),
+            create_test(FakeWrongAnswerValidator()),
+            scoring_policy=policy,
+        ),
+    )
+    runner = create_fake_empty_runner()
+    result = await test_suite.run(runner)
+    verdicts = result.protocol["A"].verdicts
+    assert [verdict.codename for verdict in verdicts] == expected_verdicts
+    assert result.verdict.codename == "WA"
@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+
+from judgelet.application.activity import SolutionActivity
+from judgelet.application.admission import AdmissionController
+from judgelet.application.interfaces import SlotQueueIsFull
+from judgelet.config import Config
+from judgelet.domain.slots import ExecutionSlot
+from judgelet.infrastructure.scheduler import (
+    FifoSlotScheduler,
+    create_slot_scheduler,
+)
+
+
+def _create_scheduler(
+    slot_count: int,
+    max_queue_size: int = 16,
+) -> FifoSlotScheduler:
+    return FifoSlotScheduler(
+        [
+            ExecutionSlot(index, frozenset(), f"slot_{index}")
+            for index in range(slot_count)
+        ],
+        max_queue_size,
+    )
+
+
+@pytest.mark.asyncio
+async def test_slots_are_exclusive():
+    """Test that each holder gets its own slot."""
+    scheduler = _create_scheduler(2)
+    async with scheduler.acquire() as first, scheduler.acquire() as second:
+        assert first != second
+        assert scheduler.free_slots == 0
+    assert scheduler.free_slots == 2
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_in_fifo_order():
+    """Test that queued solutions get a slot in order of arrival."""
+    scheduler = _create_scheduler(1)
+    order: list[int] = []
+
+    async def occupy(number: int) -> None:
+        async with scheduler.acquire():
+            order.append(number)
+            await asyncio.sleep(0)
+
+    async with scheduler.acquire():
+        tasks = [asyncio.create_task(occupy(number)) for number in range(3)]
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth == 3
+    await asyncio.gather(*tasks)
+    assert order == [0, 1, 2]
+    assert scheduler.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects():
+    """Test that a solution is rejected if the queue is full."""
+    scheduler = _create_scheduler(1, max_queue_size=1)
+    async with scheduler.acquire():
+        waiter = asyncio.create_task(_hold(scheduler))
+        await asyncio.sleep(0)
+        with pytest.raises(SlotQueueIsFull):
+            await _hold(scheduler)
+    await waiter
+
+
+@pytest.mark.asyncio
+async def test_saturated_judgelet_does_not_admit():
+    """Test that solutions are admitted until the queue is full."""
+    scheduler = _create_scheduler(2, max_queue_size=1)
+    admission = AdmissionController(scheduler, SolutionActivity())
+    async with scheduler.acquire(), scheduler.acquire():
+        admission.admit()
+        waiter = asyncio.create_task(_hold(scheduler))
+        await asyncio.sleep(0)
+        assert scheduler.is_saturated
+        with pytest.raises(SlotQueueIsFull):
+            admission.admit()
+        assert admission.get_retry_after_s() == 2
+    await waiter
+    admission.admit()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    """Test that a cancelled waiter does not hold a slot."""
+    scheduler = _create_scheduler(1)
+    async with scheduler.acquire():
+        waiter = asyncio.create_task(_hold(scheduler))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth == 0
+    assert scheduler.free_slots == 1
+
+
+def test_try_acquire_takes_only_free_slots():
+    """Test that a slot is lent only when it is free."""
+    scheduler = _create_scheduler(2)
+    first = scheduler.try_acquire()
+    assert first is not None
+    with first:
+        second = scheduler.try_acquire()
+        assert second is not None
+        with second:
+            assert scheduler.try_acquire() is None
+    assert scheduler.free_slots == 2
+
+
+@pytest.mark.asyncio
+async def test_try_acquire_does_not_overtake_waiters():
+    """Test that a free slot goes to a waiting solution first."""
+    scheduler = _create_scheduler(1)
+    async with scheduler.acquire():
+        waiter = asyncio.create_task(_hold(scheduler))
+        await asyncio.sleep(0)
+    assert scheduler.try_acquire() is None
+    await waiter
+
+
+@pytest.mark.parametrize(
+    ("config", "expected_slots"),
+    [
+        (Config(enable_lock=True, slots=4), 1),
+        (Config(enable_lock=False, slots=4), 4),
+    ],
+)
+def test_slot_count_from_config(config: Config, expected_slots: int):
+    """Test that lock mode means a single slot."""
+    scheduler = create_slot_scheduler(config)
+    assert scheduler.total_slots == expected_slots
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_room_ends_when_queue_shrinks():
+    """Test that room is awaited without polling."""
+    scheduler = _create_scheduler(1, max_queue_size=1)
+    async with scheduler.acquire():
+        waiter = asyncio.create_task(_hold(scheduler))
+        await asyncio.sleep(0)
+        room = asyncio.create_task(scheduler.wait_for_room())
+        await asyncio.sleep(0)
+        assert not room.done()
+    await asyncio.wait_for(room, timeout=1)
+    assert not scheduler.is_saturated
+    await waiter
+
+
+@pytest.mark.asyncio
+async def test_queue_size_defaults_to_slot_count():
+    """Test that no more solutions wait than there are slots."""
+    scheduler = create_slot_scheduler(Config(slots=2, pin_cpus=False))
+    holders = [asyncio.create_task(_hold_long(scheduler)) for _ in range(4)]
+    await asyncio.sleep(0)
+    assert scheduler.is_saturated
+    for holder in holders:
+        holder.cancel()
+    await asyncio.gather(*holders, return_exceptions=True)
+
+
+async def _hold(scheduler: FifoSlotScheduler) -> None:
+    async with scheduler.acquire():
+        await asyncio.sleep(0)
+
+
+async def _hold_long(scheduler: FifoSlotScheduler) -> None:
+    async with scheduler.acquire():
+        await asyncio.Event().wait()
@@ -16,26 +16,40 @@ _TEST_CASE = create_test()
     ("result", "validator_params", "should_pass"),
     [
         (
-            create_ok_result("apple"),
+            create_ok_result(b"apple"),
             StdoutValidator.args_cls(
                 expected="apple",
             ),
             _SHOULD_PASS,
         ),
         (
-            create_ok_result("banana"),
+            create_ok_result(b"banana"),
             StdoutValidator.args_cls(
                 expected="apple",
             ),
             _SHOULD_FAIL,
         ),
         (
-            create_ok_result("  \t\napple \n\n"),
+            create_ok_result(b"  \t\napple \n\n"),
             StdoutValidator.args_cls(
                 expected="apple", strip=True,
             ),
             _SHOULD_PASS,
         ),
+        (
+            create_ok_result(b"apple\n"),
+            StdoutValidator.args_cls(
+                expected="apple", strip=False,
+            ),
+            _SHOULD_FAIL,
+        ),
+        (
+            create_ok_result("яблоко\n".encode()),
+            StdoutValidator.args_cls(
+                expected=" яблоко ",
+            ),
+            _SHOULD_PASS,
+        ),
     ],
 )
 def test_stdout_validator(
@@ -95,6 +109,6 @@ def test_file_validator(
 ):
     """Test FileValidator."""
     verdict = FileValidator(validator_params).validate(
-        RunResult.blank_ok(), _TEST_CASE, {file.name: file.contents},
+        RunResult.blank_ok(), _TEST_CASE, {file.name: file.contents.encode()},
     )
     assert verdict.is_successful == should_pass
@@ -71,6 +71,9 @@ class VerdictSchema(BaseModel):
     codename: str
     is_successful: bool
     details: str
+    cpu_time_s: float | None = None
+    wall_time_s: float | None = None
+    peak_memory_mb: float | None = None
 
 
 class GroupProtocolSchema(BaseModel):
@@ -78,3 +81,5 @@ class GroupProtocolSchema(BaseModel):
     verdicts: list[VerdictSchema]
     is_successful: bool
     verdict: VerdictSchema
+    max_cpu_time_s: float | None = None
+    max_peak_memory_mb: float | None = None